@@ -0,0 +1,65 @@
+"""
+Attribute access and memory footprint of model instances.
+
+    python -m benchmarks.attributes
+
+The script does not depend on how the values are stored, so it runs on the older trees as well
+(e.g. on the `__dict__` storage before the slots) to compare with.
+"""
+import os
+import timeit
+import tracemalloc
+
+os.environ.setdefault('ODM_SETTINGS_MODULE', 'benchmarks.settings')
+
+from benchmarks.models import Author  # noqa: E402
+
+INSTANCES = 10000
+NUMBER = 1000000
+
+
+class PlainAuthor:
+    """
+    A regular Python object to compare the attribute access with.
+    """
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+def get_values():
+    return dict(username='Frank', age=30, rating=4.5, is_active=True)
+
+
+def measure_access(obj):
+    read = timeit.timeit('obj.username', globals={'obj': obj}, number=NUMBER)
+    write = timeit.timeit('obj.age = 31', globals={'obj': obj}, number=NUMBER)
+
+    # ns per operation
+    return read * 1e9 / NUMBER, write * 1e9 / NUMBER
+
+
+def measure_memory(factory):
+    tracemalloc.start()
+    start = tracemalloc.take_snapshot()
+    objects = [factory(**get_values()) for _ in range(INSTANCES)]
+    end = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    size = sum(stat.size_diff for stat in end.compare_to(start, 'filename'))
+    del objects
+
+    # bytes per instance
+    return size / INSTANCES
+
+
+def main():
+    print('{:<12} {:>10} {:>10} {:>14}'.format('', 'read, ns', 'write, ns', 'bytes/object'))
+
+    for name, factory in (('MongoModel', Author), ('plain class', PlainAuthor)):
+        read, write = measure_access(factory(**get_values()))
+        memory = measure_memory(factory)
+        print('{:<12} {:>10.1f} {:>10.1f} {:>14.0f}'.format(name, read, write, memory))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+Compiling the conditions of filter/exclude to the MongoDB query.
+
+    python -m benchmarks.compiling
+"""
+import os
+import timeit
+
+from bson import ObjectId
+
+os.environ.setdefault('ODM_SETTINGS_MODULE', 'benchmarks.settings')
+
+from benchmarks.models import Post  # noqa: E402
+from core.fields import BaseRelationField  # noqa: E402
+from core.node import Q, QueryPlan, Param, SimplificationVisitor, QueryCompilerVisitor  # noqa: E402
+from core.operators import Operator  # noqa: E402
+from core.utils import update  # noqa: E402
+
+NUMBER = 100000
+
+
+class BaselineCompilerVisitor(QueryCompilerVisitor):
+    """
+    The compiler before the query plans: each condition is resolved on each query.
+    """
+    def transform_query(self, manager, **kwargs):
+        query = {}
+
+        for field_name, field_value in kwargs.copy().items():
+            operator = None
+
+            if self.delimiter in field_name:
+                field_name, operator = field_name.split(self.delimiter, 1)
+
+            declared_fields = manager.model.get_declared_fields()
+            field_instance = declared_fields.get(field_name)
+            operator = 'base' if not operator else operator
+            operator = 'rel' if isinstance(field_instance, BaseRelationField) else operator
+
+            condition = Operator().process(operator, field_name, field_value)
+            update(query, condition)
+
+        return query
+
+
+def baseline_to_query(queryset, **kwargs):
+    """
+    QuerySet._to_query() before the query plans: the Q tree is built and visited.
+    """
+    query = Q(**kwargs).accept(SimplificationVisitor(), queryset)
+    return query.accept(BaselineCompilerVisitor(queryset), queryset)
+
+
+def get_conditions():
+    return dict(author=ObjectId(), views__gte=10, title__ne='Draft', tags__in=['python'])
+
+
+def main():
+    conditions = get_conditions()
+    keys = tuple(conditions)
+    queryset = Post.objects
+    prepared = Post.objects.prepare(
+        author=Param('author'), views__gte=Param('views'), title__ne='Draft', tags__in=['python']
+    )
+    author = conditions['author']
+
+    cases = (
+        ('baseline', lambda: baseline_to_query(queryset, **conditions)),
+        ('uncached plan', lambda: QueryPlan(Post, keys).bind(conditions.values())),
+        ('cached plan', lambda: queryset._to_query(**conditions)),
+        ('Q tree', lambda: queryset._to_query(Q(**conditions) & Q())),
+        ('filter', lambda: Post.objects.filter(**conditions)),
+        ('exclude', lambda: Post.objects.exclude(**conditions)),
+        ('prepared', lambda: prepared(author=author, views=10)),
+    )
+
+    print('{} queries, 4 conditions'.format(NUMBER))
+
+    for name, func in cases:
+        seconds = min(timeit.repeat(func, number=NUMBER, repeat=3))
+        print('{:<16} {:>8.2f} us/query'.format(name, seconds * 1e6 / NUMBER))
+
+
+if __name__ == '__main__':
+    main()
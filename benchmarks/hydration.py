@@ -0,0 +1,49 @@
+"""
+Materializing the raw documents into model instances.
+
+    python -m benchmarks.hydration
+"""
+import os
+import timeit
+
+from bson import ObjectId, DBRef
+
+os.environ.setdefault('ODM_SETTINGS_MODULE', 'benchmarks.settings')
+
+from benchmarks.models import Post  # noqa: E402
+
+DOCUMENTS = 100000
+
+
+def get_documents(count):
+    return [
+        {
+            '_id': ObjectId(),
+            'title': 'Post #{}'.format(index),
+            'views': index,
+            'tags': ['python', 'mongodb'],
+            'data': {'index': index},
+            'author': DBRef('bench_author', ObjectId()),
+        }
+        for index in range(count)
+    ]
+
+
+def main():
+    documents = get_documents(DOCUMENTS)
+    decoder = Post.get_decoder()
+
+    cases = (
+        ('Model(**document)', lambda: [Post(**dict(document)) for document in documents]),
+        ('decode_many', lambda: decoder.decode_many(documents)),
+    )
+
+    print('{} documents'.format(DOCUMENTS))
+
+    for name, func in cases:
+        seconds = min(timeit.repeat(func, number=1, repeat=3))
+        print('{:<20} {:>8.3f} s {:>8.2f} us/document'.format(name, seconds, seconds * 1e6 / DOCUMENTS))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,24 @@
+from core.base import MongoModel
+from core.constants import CASCADE
+from core.fields import StringField, IntegerField, FloatField, ListField, DictField, BoolField, ForeignKey
+
+
+class Author(MongoModel):
+    class Meta:
+        collection_name = 'bench_author'
+
+    username = StringField(max_length=32)
+    age = IntegerField()
+    rating = FloatField()
+    is_active = BoolField()
+
+
+class Post(MongoModel):
+    class Meta:
+        collection_name = 'bench_post'
+
+    title = StringField()
+    views = IntegerField()
+    tags = ListField(StringField())
+    data = DictField()
+    author = ForeignKey(Author, related_name='posts', on_delete=CASCADE)
@@ -0,0 +1,13 @@
+import os
+
+DATABASES = {
+    'async_odm_benchmarks': {
+        # ODM_BENCHMARKS_BACKEND=memory runs without MongoDB (the default of `python -m benchmarks.suite`)
+        'backend': os.environ.get('ODM_BENCHMARKS_BACKEND', 'mongodb'),
+        'host': 'localhost',
+        'port': 27017,
+        'models': {
+            'benchmarks.models': ['Author', 'Post'],
+        },
+    },
+}
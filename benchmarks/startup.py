@@ -0,0 +1,85 @@
+"""
+Import time of a project with many models.
+
+    python -m benchmarks.startup
+"""
+import os
+import sys
+import tempfile
+import subprocess
+
+MODELS = 500
+
+SETTINGS = '''
+DATABASES = {{
+    'async_odm_startup': {{
+        'host': 'localhost',
+        'port': 27017,
+        'models': {{
+            'startup_models': [{models}],
+        }},
+    }},
+}}
+'''
+
+MODEL = '''
+
+class Model{index}(MongoModel):
+    name = StringField()
+    count = IntegerField()
+    tags = ListField(StringField())
+{relation}'''
+
+RELATION = '''    parent = ForeignKey('Model{index}', related_name='children', null=True)
+'''
+
+IMPORT = '''
+import time
+import collections
+import collections.abc
+
+collections.Mapping = collections.abc.Mapping
+
+# The driver imports are not counted
+import core.base
+
+start = time.perf_counter()
+import startup_models
+print(time.perf_counter() - start)
+'''
+
+
+def write_project(path, count):
+    models = ', '.join("'Model{}'".format(index) for index in range(count))
+
+    with open(os.path.join(path, 'startup_settings.py'), 'w') as f:
+        f.write(SETTINGS.format(models=models))
+
+    with open(os.path.join(path, 'startup_models.py'), 'w') as f:
+        f.write('from core.base import MongoModel\n')
+        f.write('from core.fields import StringField, IntegerField, ListField, ForeignKey\n')
+
+        for index in range(count):
+            # Each model refers to the previous one
+            relation = RELATION.format(index=index - 1) if index else ''
+            f.write(MODEL.format(index=index, relation=relation))
+
+
+def measure_import(path):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, ODM_SETTINGS_MODULE='startup_settings', PYTHONPATH=os.pathsep.join([path, root]))
+    output = subprocess.check_output([sys.executable, '-W', 'ignore', '-c', IMPORT], env=env)
+
+    return float(output)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as path:
+        write_project(path, MODELS)
+        seconds = min(measure_import(path) for _ in range(3))
+
+    print('{} models {:>8.3f} s {:>8.2f} ms/model'.format(MODELS, seconds, seconds * 1e3 / MODELS))
+
+
+if __name__ == '__main__':
+    main()
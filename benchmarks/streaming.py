@@ -0,0 +1,82 @@
+"""
+Memory usage of streaming a large collection with QuerySet.iterator().
+Requires a running MongoDB (see benchmarks/settings.py).
+
+    python -m benchmarks.streaming --documents 1000000 --batch-size 1000
+"""
+import os
+import time
+import asyncio
+import argparse
+import resource
+
+from bson import ObjectId, DBRef
+
+os.environ.setdefault('ODM_SETTINGS_MODULE', 'benchmarks.settings')
+
+from benchmarks.models import Post  # noqa: E402
+
+INSERT_CHUNK = 10000
+
+
+def get_rss():
+    """
+    Current resident set size in MB.
+    """
+    try:
+        with open('/proc/self/statm') as statm:
+            pages = int(statm.read().split()[1])
+        return pages * resource.getpagesize() / 2 ** 20
+    except OSError:
+        # Peak value, when procfs is not available
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2 ** 10
+
+
+async def populate(count):
+    dispatcher = Post.get_dispatcher()
+    existing = await Post.objects.count()
+
+    for start in range(existing, count, INSERT_CHUNK):
+        documents = [
+            {
+                'title': 'Post #{}'.format(index),
+                'views': index,
+                'tags': ['python', 'mongodb'],
+                'data': {'index': index},
+                'author': DBRef('bench_author', ObjectId()),
+            }
+            for index in range(start, min(start + INSERT_CHUNK, count))
+        ]
+        await dispatcher.bulk_create(documents)
+
+
+async def main(documents, batch_size, prefetch):
+    await populate(documents)
+
+    rss_start = get_rss()
+    rss_min = rss_max = rss_start
+    started = time.perf_counter()
+    iterated = 0
+
+    async for post in Post.objects[:documents].iterator(batch_size=batch_size, prefetch=prefetch):
+        iterated += 1
+
+        if not iterated % batch_size:
+            rss = get_rss()
+            rss_min, rss_max = min(rss_min, rss), max(rss_max, rss)
+
+    elapsed = time.perf_counter() - started
+
+    print('documents: {}, batch size: {}, prefetch: {}'.format(iterated, batch_size, prefetch))
+    print('time: {:.2f} s ({:.0f} documents/s)'.format(elapsed, iterated / elapsed))
+    print('RSS, MB: start {:.1f}, min {:.1f}, max {:.1f}'.format(rss_start, rss_min, rss_max))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--documents', type=int, default=1000000)
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--no-prefetch', action='store_true')
+    args = parser.parse_args()
+
+    asyncio.get_event_loop().run_until_complete(main(args.documents, args.batch_size, not args.no_prefetch))
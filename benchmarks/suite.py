@@ -0,0 +1,340 @@
+"""
+The benchmarks of the ODM hot paths at several data sizes, the results are written as JSON
+to compare the releases:
+
+    python -m benchmarks.suite --sizes 100 1000 10000 --output before.json
+    python -m benchmarks.suite --sizes 100 1000 10000 --compare before.json
+
+The in-memory backend is used by default, so the ODM itself is measured.
+To include the round trips, run against a local mongod (see benchmarks/settings.py):
+
+    ODM_BENCHMARKS_BACKEND=mongodb python -m benchmarks.suite
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import platform
+import statistics
+import subprocess
+from datetime import datetime
+
+from bson import ObjectId, DBRef
+
+os.environ.setdefault('ODM_SETTINGS_MODULE', 'benchmarks.settings')
+os.environ.setdefault('ODM_BENCHMARKS_BACKEND', 'memory')
+
+from benchmarks.models import Author, Post  # noqa: E402
+from core.managers import OnDeleteManager  # noqa: E402
+from core.node import Q  # noqa: E402
+
+SIZES = (100, 1000)
+REPEAT = 3
+THRESHOLD = 0.1
+
+# Posts per author of the relation benchmarks
+POSTS_PER_AUTHOR = 10
+
+
+def get_author(index):
+    return Author(username='author_{}'.format(index), age=30, rating=4.5, is_active=True)
+
+
+def get_post(index, author):
+    return Post(
+        title='Post #{}'.format(index),
+        views=index,
+        tags=['python', 'mongodb'],
+        data={'index': index},
+        author=author
+    )
+
+
+def get_documents(size):
+    return [
+        {
+            '_id': ObjectId(),
+            'title': 'Post #{}'.format(index),
+            'views': index,
+            'tags': ['python', 'mongodb'],
+            'data': {'index': index},
+            'author': DBRef(Author.get_collection_name(), ObjectId()),
+        }
+        for index in range(size)
+    ]
+
+
+async def create_posts(size):
+    """
+    Create the posts, every POSTS_PER_AUTHOR posts have the same author.
+    :return: list of Author instances
+    """
+    authors = [get_author(index) for index in range(max(size // POSTS_PER_AUTHOR, 1))]
+    await Author.objects.bulk_create(authors)
+
+    posts = [get_post(index, authors[index % len(authors)]) for index in range(size)]
+    await Post.objects.bulk_create(posts, check_relations=False)
+
+    return authors
+
+
+async def clean():
+    await Post.objects.delete()
+    await Author.objects.delete()
+
+
+async def bench_compile(size):
+    """
+    Compile the conditions of filter/exclude to the MongoDB query (core/node.py).
+    """
+    author = ObjectId()
+    started = time.perf_counter()
+
+    for index in range(size):
+        Post.objects.filter(author=author, views__gte=index, tags__in=['python'])
+        Post.objects.filter(Q(title='Post') | Q(views__lt=index)).exclude(title='Draft')
+
+    return time.perf_counter() - started
+
+
+async def bench_encode(size):
+    """
+    Validate and convert the values of the instances to the documents.
+    """
+    author = get_author(0)
+    await author.save()
+    posts = [get_post(index, author) for index in range(size)]
+    started = time.perf_counter()
+
+    for post in posts:
+        await post.get_internal_values()
+
+    return time.perf_counter() - started
+
+
+async def bench_hydrate(size):
+    """
+    Create the instances from the raw documents, as the QuerySet does.
+    """
+    documents = get_documents(size)
+    decoder = Post.get_decoder()
+    started = time.perf_counter()
+
+    decoder.decode_many(documents)
+
+    return time.perf_counter() - started
+
+
+async def bench_fetch(size):
+    """
+    Read the documents and create the instances.
+    """
+    await create_posts(size)
+    started = time.perf_counter()
+
+    await Post.objects.filter(views__gte=0)
+
+    return time.perf_counter() - started
+
+
+async def bench_save(size):
+    author = get_author(0)
+    await author.save()
+    posts = [get_post(index, author) for index in range(size)]
+    started = time.perf_counter()
+
+    for post in posts:
+        await post.save()
+
+    return time.perf_counter() - started
+
+
+async def bench_bulk_create(size):
+    author = get_author(0)
+    await author.save()
+    posts = [get_post(index, author) for index in range(size)]
+    started = time.perf_counter()
+
+    await Post.objects.bulk_create(posts)
+
+    return time.perf_counter() - started
+
+
+async def bench_relation_proxy(size):
+    """
+    Resolve the forward relation of each post by its own query.
+    """
+    await create_posts(size)
+    posts = await Post.objects
+    started = time.perf_counter()
+
+    for post in posts:
+        await post.author
+
+    return time.perf_counter() - started
+
+
+async def bench_select_related(size):
+    await create_posts(size)
+    started = time.perf_counter()
+
+    await Post.objects.select_related('author')
+
+    return time.perf_counter() - started
+
+
+async def bench_prefetch_related(size):
+    await create_posts(size)
+    started = time.perf_counter()
+
+    await Post.objects.prefetch_related('author')
+
+    return time.perf_counter() - started
+
+
+async def bench_cascade_delete(size):
+    """
+    Delete the authors with their posts (on_delete=CASCADE).
+    """
+    authors = await create_posts(size)
+    started = time.perf_counter()
+
+    # The steps of MongoModel.delete() for the model with the backward relations
+    for author in authors:
+        await OnDeleteManager().handle_backwards([author])
+        await author.delete()
+
+    return time.perf_counter() - started
+
+
+BENCHMARKS = (
+    ('compile', bench_compile),
+    ('encode', bench_encode),
+    ('hydrate', bench_hydrate),
+    ('fetch', bench_fetch),
+    ('save', bench_save),
+    ('bulk_create', bench_bulk_create),
+    ('relation_proxy', bench_relation_proxy),
+    ('select_related', bench_select_related),
+    ('prefetch_related', bench_prefetch_related),
+    ('cascade_delete', bench_cascade_delete),
+)
+
+
+async def run(names, sizes, repeat):
+    """
+    :param names: list - names of the benchmarks
+    :param sizes: list of ints - number of the items of each run
+    :param repeat: int - runs of each benchmark and size, the best one is compared
+    :return: list of dicts
+    """
+    benchmarks = dict(BENCHMARKS)
+    results = []
+
+    for name in names:
+        for size in sizes:
+            timings = []
+
+            for _ in range(repeat):
+                await clean()
+                timings.append(await benchmarks[name](size))
+
+            await clean()
+
+            results.append(dict(
+                name=name,
+                size=size,
+                repeat=repeat,
+                min=min(timings),
+                median=statistics.median(timings),
+                per_item_us=min(timings) * 1e6 / size,
+            ))
+
+            print('{:<18} {:>7} {:>10.4f} s {:>10.2f} us/item'.format(
+                name, size, results[-1]['min'], results[-1]['per_item_us']
+            ), file=sys.stderr)
+
+    return results
+
+
+def get_commit():
+    try:
+        output = subprocess.check_output(['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    return output.decode().strip()
+
+
+def get_report(results):
+    return dict(
+        created=datetime.utcnow().isoformat(),
+        commit=get_commit(),
+        backend=os.environ['ODM_BENCHMARKS_BACKEND'],
+        python=platform.python_version(),
+        platform=platform.platform(),
+        results=results,
+    )
+
+
+def compare(report, baseline, threshold):
+    """
+    Compare the best timings with the baseline report.
+    :param threshold: float - allowed slowdown, 0.1 is 10%
+    :return: list of dicts - the regressions
+    """
+    baseline_results = {(result['name'], result['size']): result for result in baseline['results']}
+    regressions = []
+
+    print('\n{:<18} {:>7} {:>8}'.format('', 'size', 'ratio'), file=sys.stderr)
+
+    for result in report['results']:
+        baseline_result = baseline_results.get((result['name'], result['size']))
+
+        if baseline_result is None:
+            continue
+
+        ratio = result['min'] / baseline_result['min']
+        is_regression = ratio > 1 + threshold
+        print('{:<18} {:>7} {:>8.2f}{}'.format(
+            result['name'], result['size'], ratio, ' regression' if is_regression else ''
+        ), file=sys.stderr)
+
+        if is_regression:
+            regressions.append(dict(name=result['name'], size=result['size'], ratio=ratio))
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES)
+    parser.add_argument('--repeat', type=int, default=REPEAT)
+    parser.add_argument('--only', nargs='+', choices=[name for name, _ in BENCHMARKS])
+    parser.add_argument('--output', help='the JSON report file (stdout by default)')
+    parser.add_argument('--compare', help='the JSON report to compare with, exit code 1 on regressions')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD)
+    args = parser.parse_args()
+
+    names = args.only or [name for name, _ in BENCHMARKS]
+    results = asyncio.get_event_loop().run_until_complete(run(names, args.sizes, args.repeat))
+    report = get_report(results)
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            report['regressions'] = compare(report, json.load(baseline_file), args.threshold)
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(report, output_file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+
+    if report.get('regressions'):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,44 +1,85 @@
-import os
 import re
-import copy
 import asyncio
-import importlib
 from collections import namedtuple
 from bson import DBRef
 
-from core.managers import OnDeleteManager, RelationManager
+from core.managers import OnDeleteManager, RelationManager, RelationChecker
 from .queryset import QuerySet
-from .utils import classproperty
-from .connection import MongoConnection
+from .utils import classproperty, copy_value, update as update_document
+from .connection import MongoConnection, SettingsRegistry
 from .dispatchers import MongoDispatcher
-from .constants import UPDATE, CREATE
-from .fields import Field, BaseRelationField, BaseBackwardRelationField
+from .memory import MemoryConnection, MemoryDispatcher
+from .decoders import ModelDecoder
+from .cache import QueryCache
+from .session import Session
+from .identity import IdentityMap
+from .constants import UPDATE, CREATE, MONGODB, MEMORY
+from .fields import (
+    Field, BaseRelationField, BaseBackwardRelationField, ForwardRelationDescriptor,
+    TrackedContainer, TrackedValueDescriptor
+)
 
 
-ModelManagement = namedtuple('ModelManagement', ['declared_fields', 'dispatcher', 'sorting'])
+ModelManagement = namedtuple('ModelManagement', [
+    'declared_fields', 'dispatcher', 'sorting', 'decoder', 'meta', 'db_name', 'collection_name'
+])
+
+# Marks the value of a field, that is not set
+_MISSING = object()
+
+# The connection and the dispatcher classes of the `backend` of the DATABASES settings
+BACKENDS = {
+    MONGODB: (MongoConnection, MongoDispatcher),
+    MEMORY: (MemoryConnection, MemoryDispatcher),
+}
 
 
 class BaseModel(type):
     """
     Metaclass for all models.
     """
+    # {(database name, collection name): 'module.ModelName'}
+    _collections = {}
+
     def __init__(cls, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
     def __new__(mcs, name, bases, attrs):
         # If it is not MongoModel
         if bases:
+            db_name, collection_name = None, None
+
+            if not mcs._is_abstract(attrs):
+                db_name = mcs._get_db_name(name, attrs)
+                collection_name = mcs._get_collection_name(name, attrs, db_name)
+
             attrs['_management'] = ModelManagement(
                 declared_fields=mcs._get_declared_fields(bases, attrs),
-                dispatcher=mcs._get_dispatcher(name, attrs),
+                # The dispatcher is created on the first use (see get_dispatcher)
+                dispatcher=None,
                 sorting=mcs._get_sorting(attrs),
+                decoder=None,
+                meta=attrs.get('Meta'),
+                db_name=db_name,
+                collection_name=collection_name,
             )
+            attrs['__slots__'] = mcs._get_slots(bases, attrs)
+            mcs._add_display_methods(attrs)
 
         model = super().__new__(mcs, name, bases, attrs)
 
+        if bases and not mcs._is_abstract(attrs):
+            mcs._add_tracked_descriptors(model)
+
+            # The decoder is compiled by the complete model class
+            model._management = model._management._replace(decoder=ModelDecoder(model))
+
         if not mcs._is_abstract(attrs):
             RelationManager().add_model(model)
 
+            if bases:
+                mcs._collections[db_name, collection_name] = mcs._get_model_module(name, attrs)
+
         return model
 
     @classmethod
@@ -50,118 +91,94 @@ class BaseModel(type):
         return '.'.join((attrs.get('__module__'), name))
 
     @classmethod
-    def _get_models_list(mcs, models):
-        """
-        Join each model name to the path.
-        :param models: dict - {'module_path': 'model_name'}
-        :return: list - list of models with full path
-        """
-        models_list = []
-
-        for path, models in models.items():
-            for model in models:
-                models_list.append('.'.join([path, model]))
-
-        return models_list
-
-    @classmethod
-    def _get_db_settings(mcs, name, attrs):
+    def _get_db_name(mcs, name, attrs):
         """
-        Get current model settings from the settings module.
+        Get the name of the database, the model is configured for.
         :param name: str - model name
         :param attrs: list - class attributes
-        :return: tuple - database name, database settings
+        :return: str - database name
         """
         model = mcs._get_model_module(name, attrs)
-        settings_module = os.environ.get('ODM_SETTINGS_MODULE')
+        db_name = SettingsRegistry().get_database_name(model)
 
-        if not settings_module:
-            raise ImportError(
-                'Specify an \'ODM_SETTINGS_MODULE\' variable in the environment.'
+        if db_name is None:
+            raise Exception(
+                'There is no database configuration for the \'{}\' model'.format(model)
             )
 
-        settings = importlib.import_module(settings_module)
-        db_name, db_settings = None, None
-
-        for db_name, db_settings in settings.DATABASES.items():
-            models = db_settings.get('models')
+        return db_name
 
-            if model in mcs._get_models_list(models):
-                break
-
-            db_name, db_settings = None, None
+    @classmethod
+    def _get_backend(mcs, db_name):
+        """
+        :param db_name: str - database name
+        :return: tuple - the connection class, the dispatcher class
+        """
+        backend = SettingsRegistry().get_databases()[db_name].get('backend', MONGODB)
 
-        if not (db_name or db_settings):
-            raise Exception(
-                'There is no database configuration for the \'{}\' model'.format(model)
-            )
+        if backend not in BACKENDS:
+            raise ValueError('Unknown backend `{}` of the `{}` database'.format(backend, db_name))
 
-        return db_name, db_settings
+        return BACKENDS[backend]
 
     @classmethod
-    def _get_connection(mcs, name, attrs):
+    def _get_connection(mcs, db_name):
         """
-        Get the settings and connect to the database.
-        :param name: str - collection name
-        :param attrs: list - class attributes
-        :return: MongoConnection instance
+        Get the connection to the database (the client is connected on the first query).
+        :param db_name: str - database name
+        :return: MongoConnection or MemoryConnection instance
         """
-        db_name, db_settings = mcs._get_db_settings(name, attrs)
-        connection = MongoConnection(
+        db_settings = SettingsRegistry().get_databases()[db_name]
+        connection_class, _ = mcs._get_backend(db_name)
+        connection = connection_class(
             host=db_settings.get('host'),
             port=db_settings.get('port'),
-            database=db_name
+            database=db_name,
+            options=db_settings.get('options')
         )
 
         return connection
 
     @classmethod
-    def _get_collection_name(mcs, name, attrs):
+    def _get_collection_name(mcs, name, attrs, db_name):
         """
         Get the collection name or generate it by the model class name.
-        :param name: str - collection name
+        :param name: str - model name
         :param attrs: list - class attributes
+        :param db_name: str - database name
         :return: str - collection name
         """
         auto_name = '_'.join(re.findall(r'[A-Z][^A-Z]*', name)).lower()
         collection_name = getattr(attrs.get('Meta'), 'collection_name', auto_name)
-        db_name = mcs._get_connection(name, attrs).database
-
-        models = RelationManager().get_models()
 
-        for model_name, model in models.items():
-            init_db_name = model.get_connection().database
-            init_collection_name = model.get_collection_name()
+        # Ensure that collection names do not match within the current database
+        model_name = mcs._collections.get((db_name, collection_name))
+        cur_model = mcs._get_model_module(name, attrs)
 
-            # Ensure that collection names do not match within the current database
-            current = collection_name, db_name
-            initial = init_collection_name, init_db_name
-
-            if current == initial:
-                raise ValueError(
-                    'The collection name `{collection_name}` already used by `{model_name}` model. '
-                    'Please, specify a unique collection_name manually for {cur_model}.'.format(
-                        collection_name=collection_name,
-                        model_name=model_name,
-                        cur_model=mcs._get_model_module(name, attrs)
-                    )
+        if model_name is not None and model_name != cur_model:
+            raise ValueError(
+                'The collection name `{collection_name}` already used by `{model_name}` model. '
+                'Please, specify a unique collection_name manually for {cur_model}.'.format(
+                    collection_name=collection_name,
+                    model_name=model_name,
+                    cur_model=cur_model
                 )
+            )
 
         return collection_name
 
     @classmethod
-    def _get_dispatcher(mcs, name, attrs):
+    def _get_dispatcher(mcs, management):
         """
         Get the dispatcher - the driver that organizes queries to the database.
-        :param attrs: list - class attributes
+        :param management: ModelManagement of the model
         :return: MongoDispatcher instance
         """
-        dispatcher = None
-
-        if not mcs._is_abstract(attrs):
-            connection = mcs._get_connection(name, attrs)
-            collection_name = mcs._get_collection_name(name, attrs)
-            dispatcher = MongoDispatcher(connection, collection_name)
+        _, dispatcher_class = mcs._get_backend(management.db_name)
+        connection = mcs._get_connection(management.db_name)
+        cache = QueryCache.from_settings(getattr(management.meta, 'cache', None))
+        coalesce = getattr(management.meta, 'coalesce', False)
+        dispatcher = dispatcher_class(connection, management.collection_name, cache, coalesce)
 
         return dispatcher
 
@@ -174,6 +191,72 @@ class BaseModel(type):
         """
         return None if mcs._is_abstract(attrs) else getattr(attrs.get('Meta'), 'sorting', ())
 
+    @classmethod
+    def _add_display_methods(mcs, attrs):
+        """
+        Add the `get_FOO_display` method for each field with the `choices` attribute.
+        :param attrs: list - class attributes
+        """
+        for field_name, field_instance in attrs['_management'].declared_fields.items():
+            method_name = 'get_{}_display'.format(field_name)
+
+            if getattr(field_instance, 'choices', None) and method_name not in attrs:
+                attrs[method_name] = mcs._get_display_method(field_name, field_instance)
+
+    @staticmethod
+    def _get_display_method(field_name, field_instance):
+        # Closure is used to bind the field to the method
+        def get_display(self):
+            field_value = getattr(self, field_name, None)
+            display = field_instance.get_choice_value(field_value)
+
+            return display
+
+        get_display.__name__ = 'get_{}_display'.format(field_name)
+        return get_display
+
+    @staticmethod
+    def _add_tracked_descriptors(model):
+        """
+        Wrap the slots of the fields with the tracked values (ListField, DictField).
+        """
+        for field_name, field_instance in model.get_declared_fields().items():
+            tracked_class = getattr(field_instance, 'tracked_class', None)
+            member = model.__dict__.get(field_name)
+
+            if tracked_class is not None and member is not None and not isinstance(member, TrackedValueDescriptor):
+                setattr(model, field_name, TrackedValueDescriptor(member, tracked_class))
+
+    @classmethod
+    def _get_slots(mcs, bases, attrs):
+        """
+        Get the slots to store the values of the declared fields.
+        Slots of the abstract models are declared by their concrete children.
+        :param bases: tuple - base classes
+        :param attrs: list - class attributes
+        :return: tuple - names of the slots
+        """
+        slots = tuple(attrs.get('__slots__', ()))
+
+        if mcs._is_abstract(attrs):
+            return slots
+
+        inherited_slots = set()
+
+        for base in bases:
+            for klass in base.__mro__:
+                inherited_slots.update(klass.__dict__.get('__slots__', ()))
+
+        for field_name, field_instance in attrs['_management'].declared_fields.items():
+            # Relation fields are stored by the RelationDescriptor
+            if isinstance(field_instance, BaseRelationField):
+                continue
+
+            if field_name not in inherited_slots and field_name not in slots:
+                slots += (field_name,)
+
+        return slots
+
     @classmethod
     def _get_declared_fields(mcs, bases, attrs):
         """
@@ -192,9 +275,14 @@ class BaseModel(type):
                         )
                     )
 
+                field_instance.set_field_name(field_name)
                 declared_fields[field_name] = field_instance
                 attrs.pop(field_name)
 
+                # Relation fields are accessed through the descriptor
+                if isinstance(field_instance, BaseRelationField):
+                    attrs[field_name] = ForwardRelationDescriptor(field_name, field_instance)
+
         # Inherit the declared fields of an abstract model
         for base in bases:
             if base is not MongoModel:
@@ -204,112 +292,37 @@ class BaseModel(type):
 
 
 class MongoModel(metaclass=BaseModel):
-    _id = None
-    _management = None
+    # Values of the declared fields are stored in the slots, generated by the metaclass.
+    # __dict__ keeps the undeclared fields and the values of the relation fields.
+    __slots__ = ('_id', '_action', '_snapshot', '_relation_proxies', '__dict__', '__weakref__')
 
-    # Stores the current action (save/update) for field validation
-    _action = None
+    _management = None
 
     def __init__(self, **document):
-        # Fields that were set in the model instance, but not declared.
-        self._undeclared_fields = {}
-        self._modified_fields = []
+        self._id = None
 
-        # Save fields not declared in the model.
-        for field_name, field_value in document.items():
-            declared_fields = self.get_declared_fields()
+        # Stores the current action (save/update) for field validation
+        self._action = None
+
+        # Copy of the document as it was loaded from (or saved to) the database.
+        # The changes for the update are found by comparison with it.
+        self._snapshot = None
 
-            if field_name not in declared_fields and field_name != '_id':
-                self._undeclared_fields[field_name] = field_value
+        # RelationProxy instances of the relation fields (by field name), created on demand
+        self._relation_proxies = None
 
         if '_id' in document:
             document = self.get_external_values(document)
+            self._snapshot = copy_value(document)
 
-        self.__dict__.update(document)
+        self._set_values(document)
 
     def __repr__(self):
         return '{model_name} _id: {document_id}'.format(
             model_name=self.__class__.__name__,
-            document_id=self.__dict__.get('_id')
+            document_id=self._id
         )
 
-    def __setattr__(self, key, value):
-        # Ignore private properties
-        if not key.startswith('_'):
-            declared_fields = self.get_declared_fields()
-
-            if key not in declared_fields:
-                self._undeclared_fields[key] = value
-            self._modified_fields.append(key)
-        super().__setattr__(key, value)
-
-    def __getattr__(self, item):
-        match = re.match('get_(?P<field_name>\w+)_display', item)
-
-        if not match:
-            raise AttributeError(
-                '\'{model_name}\' model has no attribute \'{attribute}\''.format(
-                    model_name=self.__class__.__name__,
-                    attribute=item
-                )
-            )
-
-        field_name = match.group('field_name')
-        declared_fields = self.get_declared_fields()
-
-        if field_name not in declared_fields:
-            raise AttributeError(
-                'Field \'{field_name}\' is not declared'.format(
-                    field_name=field_name
-                )
-            )
-
-        field_instance = declared_fields.get(field_name)
-        choices = getattr(field_instance, 'choices', None)
-
-        if not choices:
-            raise AttributeError(
-                'Field \'{field_name}\' has not attribute \'choices\''.format(
-                    field_name=field_name
-                )
-            )
-
-        # Closure is used to make get_FOO_display callable
-        def _func():
-            field_value = self.__dict__.get(field_name)
-            display = field_instance.get_choice_value(field_value)
-
-            return display
-
-        return _func
-
-    def __getattribute__(self, item):
-        def __getattribute(obj, attribute):
-            return object.__getattribute__(obj, attribute)
-
-        attr = super().__getattribute__(item)
-        declared_fields = __getattribute(self, '_management').declared_fields
-        field_instance = declared_fields.get(item)
-        field_value = None
-
-        if isinstance(field_instance, (BaseRelationField, BaseBackwardRelationField)):
-            # Prevent 'can not reuse awaitable coroutine'
-            field_instance = copy.deepcopy(field_instance)
-
-            # Set the value with relation object id for a field to provide base relation
-            if isinstance(field_instance, BaseRelationField):
-                field_value = __getattribute(self, '__dict__').get(item)
-
-            # Set the _id of the current object as a value
-            # provide backward relationship for relation fields
-            elif isinstance(field_instance, BaseBackwardRelationField):
-                field_value = __getattribute(self, '_id')
-
-            field_instance.set_field_value(field_value)
-            attr = field_instance
-
-        return attr
-
     @classproperty
     def objects(cls):
         return QuerySet(model=cls)
@@ -334,11 +347,33 @@ class MongoModel(metaclass=BaseModel):
 
     @classmethod
     def get_dispatcher(cls):
+        management = cls._management
+
+        if management is not None and management.dispatcher is None and management.collection_name:
+            cls._management = management = management._replace(
+                dispatcher=BaseModel._get_dispatcher(management)
+            )
+
         return cls._get_management_param('dispatcher')
 
+    @classmethod
+    def get_cache(cls):
+        """
+        :return: QueryCache or None, if the cache is not enabled by Meta
+        """
+        return cls.get_dispatcher().cache
+
+    @classmethod
+    def get_decoder(cls):
+        return cls._get_management_param('decoder')
+
+    @classmethod
+    def get_db_name(cls):
+        return cls._get_management_param('db_name')
+
     @classmethod
     def get_collection_name(cls):
-        return cls.get_dispatcher().collection_name
+        return cls._get_management_param('collection_name')
 
     @classmethod
     def get_connection(cls):
@@ -352,19 +387,141 @@ class MongoModel(metaclass=BaseModel):
     def _get_management_param(cls, param):
         return getattr(cls._management, param, None)
 
-    async def save(self):
-        document = await self._update() if self._id else await self._create()
-        self.__dict__.update(document)
+    def _get_value(self, field_name, default=None):
+        """
+        Get the raw value of the field (default if it is not set).
+        Relation fields give the stored reference instead of the RelationProxy.
+        """
+        field_instance = self._management.declared_fields.get(field_name)
+
+        if isinstance(field_instance, BaseRelationField):
+            return self.__dict__.get(field_name, default)
+
+        if isinstance(field_instance, BaseBackwardRelationField):
+            return default
+
+        # The tracked values are not wrapped by reading
+        descriptor = getattr(self.__class__, field_name, None)
+
+        if isinstance(descriptor, TrackedValueDescriptor):
+            return descriptor.get_raw(self, default)
+
+        return getattr(self, field_name, default)
+
+    def _get_undeclared_values(self):
+        """
+        Get the values of the fields, that were set in the model instance, but not declared.
+        :return: dict
+        """
+        declared_fields = self._management.declared_fields
+
+        return {
+            field_name: field_value
+            for field_name, field_value in self.__dict__.items()
+            if field_name not in declared_fields and not field_name.startswith('_')
+        }
+
+    def _set_values(self, document):
+        for field_name, field_value in document.items():
+            setattr(self, field_name, field_value)
+
+    def _get_changes(self):
+        """
+        Compare the current values of the fields with the snapshot.
+        :return: tuple - (names of the modified fields, names of the deleted fields)
+        """
+        snapshot = self._snapshot or {}
+        declared_fields = self._management.declared_fields
+        modified_fields, deleted_fields = [], []
+
+        field_names = [
+            field_name for field_name, field_instance in declared_fields.items()
+            if not isinstance(field_instance, BaseBackwardRelationField)
+        ]
+        field_names.extend(self._get_undeclared_values())
+        field_names.extend(field_name for field_name in snapshot if field_name not in field_names)
+
+        for field_name in field_names:
+            if field_name == '_id':
+                continue
+
+            value = self._get_value(field_name, _MISSING)
+            snapshot_value = snapshot.get(field_name, _MISSING)
+
+            if value is snapshot_value:
+                continue
+
+            if value is _MISSING:
+                deleted_fields.append(field_name)
+
+            elif snapshot_value is _MISSING or not self._is_equal(field_name, value, snapshot_value):
+                modified_fields.append(field_name)
+
+        return modified_fields, deleted_fields
+
+    def _is_equal(self, field_name, value, snapshot_value):
+        # Relations are equal if they refer to the same document
+        if isinstance(self._management.declared_fields.get(field_name), BaseRelationField):
+            value = getattr(value, 'id', value)
+            snapshot_value = getattr(snapshot_value, 'id', snapshot_value)
+
+        # The tracked values are compared as the plain containers
+        value_type = getattr(value, 'container_type', None) or type(value)
+        snapshot_type = getattr(snapshot_value, 'container_type', None) or type(snapshot_value)
+
+        return value_type is snapshot_type and value == snapshot_value
+
+    async def save(self, check_relations=True):
+        """
+        :param check_relations: bool - check the existence of the related documents
+        """
+        # Written by the unit of work
+        session = Session.get_current()
+
+        if session is not None:
+            session.add(self, check_relations)
+            return
+
+        relation_checker = RelationChecker() if check_relations else None
+        is_created = not self._id
+
+        if is_created:
+            document = await self._create(relation_checker)
+        else:
+            document = await self._update(relation_checker)
+
+        # Nothing to update
+        if document is not None:
+            self._set_values(document)
+            self._set_snapshot(document)
+
         self._action = None
+        identity_map = IdentityMap.get_current()
+
+        if is_created and identity_map is not None:
+            identity_map.add(self)
 
     async def delete(self):
         """
         If the object to be deleted contains backwards relations, handle them
         """
+        # Written by the unit of work
+        session = Session.get_current()
+
+        if session is not None:
+            session.delete(self)
+            return
+
         if self.has_backwards:
             await OnDeleteManager().handle_backwards([self])
 
         await self.objects.internal_query.delete_one(_id=self._id)
+        RelationChecker.forget(self.__class__, [self._id])
+
+        identity_map = IdentityMap.get_current()
+
+        if identity_map is not None:
+            identity_map.discard(self)
 
         # Remove document id from the ODM object
         self._id = None
@@ -387,21 +544,28 @@ class MongoModel(metaclass=BaseModel):
 
         return document
 
-    async def get_internal_values(self):
+    async def get_internal_values(self, field_names=None, relation_checker=None):
         """
         Convert external values to internal for saving to a database.
+        :param field_names: list - names of the fields to convert (all fields if not specified)
+        :param relation_checker: RelationChecker - collects the references to the related documents,
+            the caller checks them (the references are not checked if not specified)
+        :return: dict
         """
         fields_values = {}
 
         for field_name, field_instance in self.get_declared_fields().items():
-            # Bring to internal values only modified fields (for update action)
-            if self._action is UPDATE and field_name not in self._modified_fields:
+            # Backward relations are not stored in the document
+            if isinstance(field_instance, BaseBackwardRelationField):
+                continue
+
+            if field_names is not None and field_name not in field_names:
                 continue
 
             field_value = None
 
             if isinstance(field_instance, BaseRelationField):
-                field_value = await self._relation_field_to_internal(field_name, field_instance)
+                field_value = self._relation_field_to_internal(field_name, field_instance, relation_checker)
 
             elif isinstance(field_instance, Field):
                 field_value = await self._field_to_internal(field_name, field_instance)
@@ -409,19 +573,25 @@ class MongoModel(metaclass=BaseModel):
             fields_values[field_name] = field_value
 
         # Undeclared fields are not validated
-        undeclared = self._undeclared_fields
-        fields_values.update(undeclared)
+        for field_name, field_value in self._get_undeclared_values().items():
+            if field_names is None or field_name in field_names:
+                fields_values[field_name] = field_value
 
         return fields_values
 
-    async def _create(self):
+    async def _create(self, relation_checker=None):
         """
         Create document with all defined fields.
         :return: dict
         """
         self._action = CREATE
-        field_values = await self.get_internal_values()
+        field_values = await self.get_internal_values(relation_checker=relation_checker)
+
+        if relation_checker is not None:
+            await relation_checker.check()
+
         insert_result = await self.objects.internal_query.create_one(**field_values)
+        RelationChecker.remember(self.__class__, [insert_result.inserted_id])
 
         # Generate document from field_values and inserted_id
         field_values.update({'_id': insert_result.inserted_id})
@@ -429,45 +599,159 @@ class MongoModel(metaclass=BaseModel):
 
         return document
 
-    async def _update(self):
+    async def _update(self, relation_checker=None):
         """
-        Update only modified document fields.
-        :return: dict
+        Update only modified document fields ($set) and remove the deleted ones ($unset).
+        :return: dict or None, if nothing was changed
         """
-        self._action = UPDATE
-        field_values = await self.get_internal_values()
-        document = await self.objects.internal_query.update_one(self._id, **field_values)
+        update = await self.get_update(relation_checker=relation_checker)
+
+        if update is None:
+            return None
+
+        if relation_checker is not None:
+            await relation_checker.check()
+
+        document = await self.objects.internal_query.update_one(self._id, update)
         document = self.get_external_values(document)
 
         return document
 
-    async def _relation_field_to_internal(self, field_name, field_instance):
+    async def get_update(self, field_names=None, relation_checker=None):
         """
-        Replace to relation ObjectId
+        Build the update document of the modified ($set) and the deleted ($unset) fields.
+        :param field_names: list - names of the fields to update (all fields if not specified)
+        :param relation_checker: RelationChecker - collects the references to the related documents
+        :return: dict or None, if nothing was changed
         """
-        field_value = self.__dict__.get(field_name)
+        self._action = UPDATE
+        modified_fields, deleted_fields = self._get_changes()
 
-        # Set the DBRef for the field value (create) or leave the same (update)
-        collection_name = field_instance.relation.get_collection_name()
-        document_id = getattr(field_value, '_id', field_value)
+        if field_names is not None:
+            modified_fields = [field_name for field_name in modified_fields if field_name in field_names]
+            deleted_fields = [field_name for field_name in deleted_fields if field_name in field_names]
+
+        if not modified_fields and not deleted_fields:
+            return None
+
+        # The fields, that are refreshed on each update
+        for field_name, field_instance in self.get_declared_fields().items():
+            if getattr(field_instance, 'auto_now_update', False) and field_name not in modified_fields:
+                modified_fields.append(field_name)
+
+        update = {}
+        snapshot = self._snapshot or {}
+        field_values = await self.get_internal_values(modified_fields, relation_checker)
+
+        # The changes of the tracked values are saved by the operators on their items
+        for field_name, field_value in list(field_values.items()):
+            value = self._get_value(field_name)
+
+            if isinstance(value, TrackedContainer) and value is field_value:
+                value_update = value.get_update(field_name, snapshot.get(field_name, _MISSING))
+
+                if value_update is not None:
+                    del field_values[field_name]
+                    update_document(update, value_update)
+
+        if field_values:
+            update.setdefault('$set', {}).update(field_values)
+
+        if deleted_fields:
+            update['$unset'] = {field_name: '' for field_name in deleted_fields}
+
+        return update
+
+    def set_updated(self, update):
+        """
+        Apply the written update document to the values and the snapshot.
+        :param update: dict - the result of `get_update`
+        """
+        values = {
+            field_name: field_value
+            for field_name, field_value in update.get('$set', {}).items() if '.' not in field_name
+        }
+        values = self.get_external_values(values)
+        snapshot = dict(self._snapshot or {})
+        self._set_values(values)
+
+        # The written values are copied to the snapshot, the tracked values start recording the changes again
+        written_fields = {path.split('.', 1)[0] for operator in update.values() for path in operator}
+
+        for field_name in written_fields:
+            value = self._get_value(field_name, _MISSING)
+
+            if value is _MISSING:
+                snapshot.pop(field_name, None)
+                continue
+
+            if isinstance(value, TrackedContainer):
+                value.reset()
+
+            snapshot[field_name] = copy_value(value)
+
+        self._snapshot = snapshot
+        self._action = None
+
+    def set_inserted(self, document):
+        """
+        Apply the inserted document to the values and the snapshot.
+        :param document: dict - internal values with `_id`
+        """
+        decoder = self.get_decoder()
+
+        if decoder.converters:
+            document = decoder.to_external(document)
+
+        self._set_values(document)
+        self._set_snapshot(document)
+        self._action = None
+
+        identity_map = IdentityMap.get_current()
 
-        # For consistency check if exist related object in the database
-        if not await field_instance.relation.objects.filter(_id=document_id).count():
+        if identity_map is not None:
+            identity_map.add(self)
+
+    def _set_snapshot(self, snapshot):
+        """
+        Set the copy of the saved document as the snapshot.
+        """
+        for field_value in snapshot.values():
+            if isinstance(field_value, TrackedContainer):
+                field_value.reset()
+
+        self._snapshot = copy_value(snapshot)
+
+    def _relation_field_to_internal(self, field_name, field_instance, relation_checker=None):
+        """
+        Replace to relation DBRef
+        """
+        field_value = self._get_value(field_name)
+
+        # An unset relation is reported as a missing related document
+        if field_value is None:
             raise ValueError(
-                'Relation document with ObjectId(\'{document_id}\') does not exist.\n'
+                'Relation document with ObjectId(\'None\') does not exist.\n'
                 'Model: \'{model_name}\', Field: \'{field_name}\''.format(
-                    document_id=str(document_id),
                     model_name=self.__class__.__name__,
                     field_name=field_name
                 ))
 
+        # Set the DBRef for the field value (create) or leave the same (update)
+        collection_name = field_instance.relation.get_collection_name()
+        document_id = getattr(field_value, 'id', field_value)
+
+        # For consistency the related document must exist in the database
+        if relation_checker is not None:
+            relation_checker.add(self.__class__.__name__, field_name, field_instance.relation, document_id)
+
         field_value = DBRef(collection_name, document_id)
 
         return field_value
 
     async def _field_to_internal(self, field_name, field_instance):
         # Validate field value
-        field_value = self.__dict__.get(field_name)
+        field_value = self._get_value(field_name)
         field_value = field_instance.get_value(field_name, field_value, self._action)
         field_instance.validate(field_name, field_value)
 
@@ -495,7 +779,7 @@ class MongoModel(metaclass=BaseModel):
         validator = getattr(self, 'validate_{}'.format(field_name), None)
 
         if callable(validator):
-            value = self.__dict__.get(field_name)
+            value = self._get_value(field_name)
             is_coro = asyncio.iscoroutinefunction(validator)
             new_value = await validator(value=value) if is_coro else validator(value=value)
 
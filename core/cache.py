@@ -0,0 +1,105 @@
+import time
+from collections import OrderedDict, namedtuple
+
+from bson import BSON
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'size', 'max_size', 'ttl'])
+
+
+class QueryCache:
+    """
+    LRU cache of the query results with the expiration time, one per collection.
+    It is enabled by the `cache` attribute of the model Meta:
+
+        class Meta:
+            cache = {'max_size': 1000, 'ttl': 60}  # or True for the defaults
+
+    The results are kept as BSON, so each hit gives the new documents.
+    Any write to the collection through the dispatcher clears the cache.
+    """
+    DEFAULT_MAX_SIZE = 1000
+    DEFAULT_TTL = 60
+
+    def __init__(self, max_size=None, ttl=None):
+        self.max_size = max_size or self.DEFAULT_MAX_SIZE
+        self.ttl = ttl or self.DEFAULT_TTL
+        self.hits = 0
+        self.misses = 0
+
+        # {key: (expiration time, BSON documents)}
+        self._results = OrderedDict()
+
+        # Incremented by each write, the results of the queries started before it are not cached
+        self._generation = 0
+
+    @classmethod
+    def from_settings(cls, settings):
+        """
+        Create the cache by the value of `Meta.cache`.
+        :param settings: bool or dict (max_size, ttl)
+        :return: QueryCache or None
+        """
+        if not settings:
+            return None
+
+        if settings is True:
+            return cls()
+
+        return cls(**settings)
+
+    @property
+    def generation(self):
+        return self._generation
+
+    def info(self):
+        return CacheInfo(
+            hits=self.hits,
+            misses=self.misses,
+            size=len(self._results),
+            max_size=self.max_size,
+            ttl=self.ttl
+        )
+
+    def get(self, key):
+        """
+        :param key: hashable - the canonical query
+        :return: list of dicts, or None if the result is not cached
+        """
+        item = self._results.get(key)
+
+        if item is not None:
+            expiration_time, documents = item
+
+            if expiration_time > time.monotonic():
+                self._results.move_to_end(key)
+                self.hits += 1
+                return [BSON(document).decode() for document in documents]
+
+            del self._results[key]
+
+        self.misses += 1
+        return None
+
+    def set(self, key, documents, generation):
+        """
+        :param key: hashable - the canonical query
+        :param documents: list of dicts
+        :param generation: int - the generation, the query was started in
+        """
+        if generation != self._generation:
+            return
+
+        self._results[key] = (time.monotonic() + self.ttl, [BSON.encode(document) for document in documents])
+        self._results.move_to_end(key)
+
+        while len(self._results) > self.max_size:
+            self._results.popitem(last=False)
+
+    def invalidate(self):
+        self._generation += 1
+        self._results.clear()
+
+    def clear(self):
+        self.invalidate()
+        self.hits = 0
+        self.misses = 0
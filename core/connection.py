@@ -1,9 +1,21 @@
-from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+import asyncio
+
+from .utils import freeze, get_settings
+from .constants import MONGODB
 
 
 class DatabaseManager:
+    """
+    The singleton registry of the clients and the databases.
+    One client (and so one connection pool) is created per cluster: (host, port, options).
+    """
     _instance = None
-    _databases = []
+
+    # {(host, port, options): AsyncIOMotorClient}
+    _clients = {}
+
+    # {(host, port, options, database name): AsyncIOMotorDatabase}
+    _databases = {}
 
     def __new__(cls):
         if not cls._instance:
@@ -11,47 +23,145 @@ class DatabaseManager:
 
         return cls._instance
 
-    def get_database(self, db_name):
-        database_instance = None
+    @staticmethod
+    def _get_client_key(host, port, options=None):
+        return host, port, freeze(dict(sorted((options or {}).items())))
 
-        for database in self._databases:
-            if database.name == db_name:
-                database_instance = database
+    def get_client(self, host, port, options=None):
+        """
+        Get the client of the cluster, the client is created once.
+        :param options: dict - keyword arguments of AsyncIOMotorClient
+            (maxPoolSize, minPoolSize, maxIdleTimeMS, waitQueueTimeoutMS, compressors, readPreference, ...)
+        :return: AsyncIOMotorClient
+        """
+        key = self._get_client_key(host, port, options)
+        client = self._clients.get(key)
 
-        return database_instance
+        if client is None:
+            # Motor is not required by the memory backend
+            from motor.motor_asyncio import AsyncIOMotorClient
 
-    def get_client(self, host, port):
-        client = None
-
-        for database in self._databases:
-            if database.client.HOST == host and database.client.PORT == port:
-                client = database.client
-                break
+            client = AsyncIOMotorClient(host, port, **(options or {}))
+            self._clients[key] = client
 
         return client
 
-    def set_database(self, database):
-        self._databases.append(database)
+    def get_database(self, db_name, host=None, port=None, options=None):
+        """
+        Get the database of the cluster, the database is created once.
+        :return: AsyncIOMotorDatabase
+        """
+        key = self._get_client_key(host, port, options) + (db_name,)
+        database = self._databases.get(key)
+
+        if database is None:
+            from motor.motor_asyncio import AsyncIOMotorDatabase
+
+            database = AsyncIOMotorDatabase(self.get_client(host, port, options), db_name)
+            self._databases[key] = database
+
+        return database
+
+
+class SettingsRegistry:
+    """
+    The singleton index of the DATABASES settings, the settings module is parsed once.
+    """
+    _instance = None
+
+    # {database name: database settings}
+    _databases = None
+
+    # {'module.ModelName': database name}
+    _models = None
+
+    def __new__(cls):
+        if not cls._instance:
+            cls._instance = object.__new__(cls)
+
+        return cls._instance
+
+    def _load(self):
+        databases = get_settings().DATABASES
+        models = {}
+
+        for db_name, db_settings in databases.items():
+            for path, model_names in db_settings.get('models', {}).items():
+                for model_name in model_names:
+                    models.setdefault('.'.join([path, model_name]), db_name)
+
+        SettingsRegistry._databases = databases
+        SettingsRegistry._models = models
+
+    def reload(self):
+        SettingsRegistry._databases = None
+        SettingsRegistry._models = None
+
+    def get_databases(self):
+        """
+        :return: dict - {database name: database settings}
+        """
+        if self._databases is None:
+            self._load()
+
+        return self._databases
+
+    def get_database_name(self, model):
+        """
+        :param model: str - the model path, e.g. 'app.models.User'
+        :return: str or None, if the model is not configured
+        """
+        if self._models is None:
+            self._load()
+
+        return self._models.get(model)
 
 
 class MongoConnection:
     host = None
     port = None
     database = None
+    options = None
 
     def __init__(self, **kwargs):
         self.__dict__.update(kwargs)
+        self._database = None
 
     async def get_database(self):
-        client = DatabaseManager().get_client(self.host, self.port)
+        if self._database is None:
+            self._database = DatabaseManager().get_database(self.database, self.host, self.port, self.options)
 
-        if not client:
-            client = AsyncIOMotorClient(self.host, self.port)
+        return self._database
 
-        database = DatabaseManager().get_database(self.database)
 
-        if not database:
-            database = AsyncIOMotorDatabase(client, self.database)
-            DatabaseManager().set_database(database)
+async def connect(warmup=1):
+    """
+    Connect to the clusters of the DATABASES settings up front,
+    so the first queries do not wait for the connection setup.
 
-        return database
+        await connect(warmup=10)
+
+    :param warmup: int - number of the connections to open in each pool
+    :return: list of AsyncIOMotorClient
+    """
+    clients = {}
+
+    for db_settings in SettingsRegistry().get_databases().values():
+        if db_settings.get('backend', MONGODB) != MONGODB:
+            continue
+
+        client = DatabaseManager().get_client(
+            db_settings.get('host'),
+            db_settings.get('port'),
+            db_settings.get('options')
+        )
+        clients[id(client)] = client
+
+    # The concurrent commands take the separate connections of the pool
+    await asyncio.gather(*[
+        client.admin.command('ping')
+        for client in clients.values()
+        for _ in range(warmup)
+    ])
+
+    return list(clients.values())
@@ -11,3 +11,12 @@ SET_DEFAULT = 3
 # produce variants
 DOCUMENT = 0
 ODM_OBJECT = 1
+VALUES_TUPLE = 2
+FLAT_VALUE = 3
+
+# The key of the document joined by QuerySet.select_related
+RELATED_PREFIX = '__related_'
+
+# DATABASES backends
+MONGODB = 'mongodb'
+MEMORY = 'memory'
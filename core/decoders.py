@@ -0,0 +1,114 @@
+from .fields import Field, BaseBackwardRelationField
+from .utils import copy_value
+
+
+class ModelDecoder:
+    """
+    Compiled per-model decoder of the raw documents into the model instances.
+    It is built once by the metaclass and bypasses MongoModel.__init__.
+    """
+    def __init__(self, model):
+        self.model = model
+        self.converters = self._get_converters(model)
+        self.setters = self._get_setters(model)
+
+        # Setters of the MongoModel bookkeeping slots
+        self._set_id = self._get_descriptor(model, '_id').__set__
+        self._set_action = self._get_descriptor(model, '_action').__set__
+        self._set_snapshot = self._get_descriptor(model, '_snapshot').__set__
+        self._set_relation_proxies = self._get_descriptor(model, '_relation_proxies').__set__
+
+    @staticmethod
+    def _get_descriptor(model, name):
+        for klass in model.__mro__:
+            if name in klass.__dict__:
+                return klass.__dict__[name]
+
+        return None
+
+    @staticmethod
+    def _get_converters(model):
+        """
+        Get `to_external_value` of the fields, that do not represent the stored value as is.
+        :return: dict - `key` is name of the field, `value` is a function(value)
+        """
+        converters = {}
+
+        for field_name, field_instance in model.get_declared_fields().items():
+            is_identity = type(field_instance).to_external_value is Field.to_external_value
+
+            if not is_identity and not isinstance(field_instance, BaseBackwardRelationField):
+                converters[field_name] = field_instance.to_external_value
+
+        return converters
+
+    def _get_setters(self, model):
+        """
+        Get the setter of a value for each declared field.
+        :return: dict - `key` is name of the field, `value` is a function(instance, value)
+        """
+        setters = {'_id': self._get_descriptor(model, '_id').__set__}
+
+        for field_name, field_instance in model.get_declared_fields().items():
+            # Backward relations are not stored in the document
+            if isinstance(field_instance, BaseBackwardRelationField):
+                continue
+
+            descriptor = self._get_descriptor(model, field_name)
+
+            # The tracked values are wrapped on access, the slot is set directly
+            setters[field_name] = getattr(descriptor, 'member', descriptor).__set__
+
+        return setters
+
+    def decode(self, document):
+        """
+        Create the model instance from the raw document.
+        The conversion is skipped for fields with the identity `to_external_value`.
+        :param document: dict
+        :return: MongoModel instance
+        """
+        if self.converters:
+            document = self.to_external(document)
+
+        instance = object.__new__(self.model)
+
+        self._set_id(instance, None)
+        self._set_action(instance, None)
+        self._set_snapshot(instance, copy_value(document))
+        self._set_relation_proxies(instance, None)
+
+        setters = self.setters
+
+        for field_name, field_value in document.items():
+            setter = setters.get(field_name)
+
+            if setter is not None:
+                setter(instance, field_value)
+            else:
+                instance.__dict__[field_name] = field_value
+
+        return instance
+
+    def decode_many(self, documents):
+        """
+        Create the model instances from a batch of raw documents.
+        :param documents: list of dicts
+        :return: list of MongoModel instances
+        """
+        decode = self.decode
+        return [decode(document) for document in documents]
+
+    def to_external(self, document):
+        """
+        Convert the internal values of the raw document to external.
+        :param document: dict
+        :return: dict - the new document
+        """
+        document = dict(document)
+
+        for field_name, convert in self.converters.items():
+            if field_name in document:
+                document[field_name] = convert(document[field_name])
+
+        return document
@@ -1,23 +1,67 @@
+import asyncio
+import copy
+import functools
+
+from bson.son import SON
 from pymongo import ReturnDocument
+
+from .utils import freeze
+from .constants import RELATED_PREFIX
 from .exceptions import DoesNotExist, MultipleObjectsReturned
 
 
+def invalidates_cache(method):
+    """
+    Clear the query cache of the collection after the write (even the failed one).
+    The queries in flight are not joined by the later ones any more.
+    """
+    @functools.wraps(method)
+    async def _method(self, *args, **kwargs):
+        try:
+            return await method(self, *args, **kwargs)
+        finally:
+            self._in_flight.clear()
+
+            if self.cache is not None:
+                self.cache.invalidate()
+
+    return _method
+
+
 class MongoDispatcher:
-    def __init__(self, connection, collection_name):
+    def __init__(self, connection, collection_name, cache=None, coalesce=False):
+        """
+        :param cache: QueryCache - the cache of `get` and `find_list` results
+        :param coalesce: bool - share the result of `get`, `find_list` and `count`
+            between the identical concurrent queries
+        """
         self.connection = connection
         self.collection_name = collection_name
+        self.cache = cache
+        self.coalesce = coalesce
+
+        # {query key: asyncio.Task} - the queries in flight
+        self._in_flight = {}
+
+        # The collection is taken once, the client and the database are shared by the dispatchers
+        self._collection = None
 
     async def count(self, **kwargs):
-        collection = await self.get_collection()
-        count = await collection.count(kwargs)
+        async def get_count():
+            collection = await self.get_collection()
+            return await collection.count(kwargs)
+
+        count = await self._read('count', {'filter': kwargs}, get_count, cached=False)
         return count
 
     async def get_collection(self):
-        # TODO: Disallow conflicting collection names ('name', ...)
-        database = await self.connection.get_database()
-        collection = getattr(database, self.collection_name)
-        return collection
+        if self._collection is None:
+            database = await self.connection.get_database()
+            self._collection = database[self.collection_name]
+
+        return self._collection
 
+    @invalidates_cache
     async def create(self, **kwargs):
         """
         Insert document.
@@ -28,49 +72,271 @@ class MongoDispatcher:
         insert_result = await collection.insert_one(kwargs)
         return insert_result
 
-    async def bulk_create(self, documents):
+    @invalidates_cache
+    async def bulk_create(self, documents, ordered=True):
+        """
+        Insert the documents.
+        :param documents: list of dicts
+        :param ordered: bool - stop on the first failed document
+        :return: InsertManyResult
+        """
+        collection = await self.get_collection()
+        result = await collection.insert_many(documents, ordered=ordered)
+        return result
+
+    @invalidates_cache
+    async def bulk_write(self, requests, ordered=True):
+        """
+        Execute the write operations (InsertOne, UpdateOne, DeleteOne, ...).
+        :param requests: list
+        :param ordered: bool - stop on the first failed operation
+        :return: BulkWriteResult
+        """
         collection = await self.get_collection()
-        results = await collection.bulk_write(documents)
-        return results
+        result = await collection.bulk_write(requests, ordered=ordered)
+        return result
 
-    async def update_one(self, _id, **kwargs):
+    @invalidates_cache
+    async def update_one(self, _id, update):
         """
         Find and modify by `_id`.
         :param _id: ObjectId
-        :param kwargs: dict (Fields to update)
-        :return: dict (Document before the changes)
+        :param update: dict (Update document with the operators, e.g. $set, $unset)
+        :return: dict (Document after the changes)
         """
         collection = await self.get_collection()
         document = await collection.find_one_and_update(
             filter={'_id': _id},
-            update={'$set': kwargs},
+            update=update,
             return_document=ReturnDocument.AFTER
         )
         return document
 
-    async def update_many(self, find, **kwargs):
+    @invalidates_cache
+    async def update_many(self, find, update):
+        """
+        :param find: dict (Filter)
+        :param update: dict or list (Update document with the operators, or the update pipeline)
+        :return: UpdateResult
+        """
         collection = await self.get_collection()
-        result = await collection.update_many(find, {'$set': kwargs})
+        result = await collection.update_many(find, update)
         return result
 
     async def get(self, projection, **kwargs):
-        count = await self.count(**kwargs)
+        """
+        Get the single document in one round trip.
+        :param projection: dict
+        :param kwargs: dict (filter)
+        :return: dict
+        """
+        async def get_documents():
+            return await self._get_documents(projection, kwargs)
 
-        if count == 1:
-            collection = await self.get_collection()
-            params = {'projection': projection} if projection else {}
-            document = await collection.find_one(kwargs, **params)
-            return document
+        documents = await self._read('get', {'filter': kwargs, 'projection': projection}, get_documents)
 
-        elif count < 1:
+        if not documents:
             raise DoesNotExist('Document does not exists!')
 
-        elif count > 1:
-            raise MultipleObjectsReturned('Got more than 1 document - it returned {count}'.format(count=count))
+        elif len(documents) > 1:
+            raise MultipleObjectsReturned('Got more than 1 document')
+
+        return documents[0]
+
+    async def _get_documents(self, projection, find):
+        """
+        Get up to two documents - enough to check, that the document is single.
+        """
+        collection = await self.get_collection()
+        params = {'projection': projection} if projection else {}
+
+        # _id is unique - the second document can not be found
+        if len(find) == 1 and '_id' in find and not isinstance(find['_id'], dict):
+            document = await collection.find_one(find, **params)
+            return [document] if document is not None else []
+
+        return await collection.find(find, limit=2, **params).to_list(2)
+
+    async def find_list(self, **kwargs):
+        """
+        Find the documents and fetch all of them.
+        :param kwargs: dict (the same params as for `find`)
+        :return: list of dicts
+        """
+        async def get_documents():
+            cursor = await self.find(**kwargs)
+            return await cursor.to_list(None)
+
+        return await self._read('find', self._get_find_params(**kwargs), get_documents)
+
+    async def _read(self, operation, params, read, cached=True):
+        """
+        Read through the cache; the identical concurrent reads are coalesced.
+        :param operation: str
+        :param params: dict - params of the query
+        :param read: coroutine function() - reads the result from the database
+        :param cached: bool - the result is a list of documents, that may be cached
+        :return: result of `read`
+        """
+        cache = self.cache if cached else None
+        key = self._get_query_key(operation, params) if cache is not None or self.coalesce else None
+
+        if key is None:
+            return await read()
+
+        if cache is not None:
+            documents = cache.get(key)
+
+            if documents is not None:
+                return documents
+
+            read = self._get_cache_writer(key, read)
+
+        if self.coalesce:
+            return await self._get_coalesced(key, read)
+
+        return await read()
+
+    def _get_cache_writer(self, key, read):
+        """
+        Wrap `read` to put its result to the cache.
+        """
+        async def read_through():
+            generation = self.cache.generation
+            documents = await read()
+            self.cache.set(key, documents, generation)
+            return documents
+
+        return read_through
+
+    async def _get_coalesced(self, key, read):
+        """
+        Join the identical query in flight, or start the new one.
+        Each caller gets its own copy of the result, the result of the task is kept intact.
+        """
+        task = self._in_flight.get(key)
+
+        if task is None:
+            task = asyncio.ensure_future(read())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._forget_in_flight(key, task))
+
+        # The query is not cancelled along with the first caller, while others wait for it
+        return copy.deepcopy(await asyncio.shield(task))
+
+    def _forget_in_flight(self, key, task):
+        # The key may be taken by the new query after the write
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+
+    @staticmethod
+    def _get_query_key(operation, params):
+        """
+        Get the canonical query: the order of the filter conditions does not matter.
+        :return: hashable, or None if the query can not be cached or coalesced
+        """
+        params = {name: value for name, value in params.items() if value and name != 'batch_size'}
+
+        if isinstance(params.get('filter'), dict):
+            params['filter'] = dict(sorted(params['filter'].items()))
+
+        key = operation, freeze(dict(sorted(params.items())))
+
+        try:
+            hash(key)
+        except TypeError:
+            return None
+
+        return key
 
     async def find(self, **kwargs):
         collection = await self.get_collection()
+        params = self._get_find_params(**kwargs)
+        cursor = collection.find(**params)
+
+        return cursor
+
+    async def find_related(self, lookups, **kwargs):
+        """
+        Find the documents joined with the documents they refer to.
+        Each referred document is put next to the DBRef under the RELATED_PREFIX'ed key.
+        :param lookups: list of tuples (path, collection_name), where path is a tuple of
+            the relation field names, e.g. ('author', 'profile'); parent paths go first
+        :param kwargs: dict (the same params as for `find`)
+        :return: aggregation cursor
+        """
+        collection = await self.get_collection()
+        params = self._get_find_params(**kwargs)
+        pipeline = []
+
+        if 'filter' in params:
+            pipeline.append({'$match': params['filter']})
+
+        if 'sort' in params:
+            pipeline.append({'$sort': SON(params['sort'])})
+
+        if 'skip' in params:
+            pipeline.append({'$skip': params['skip']})
+
+        if 'limit' in params:
+            pipeline.append({'$limit': params['limit']})
+
+        if 'projection' in params:
+            pipeline.append({'$project': self._get_related_projection(params['projection'], lookups)})
+
+        for path, collection_name in lookups:
+            alias = '.'.join(RELATED_PREFIX + field_name for field_name in path)
+            reference = '.'.join([RELATED_PREFIX + field_name for field_name in path[:-1]] + [path[-1]])
+
+            pipeline += [
+                {'$addFields': {alias: self._get_dbref_id('$' + reference)}},
+                {'$lookup': {'from': collection_name, 'localField': alias, 'foreignField': '_id', 'as': alias}},
+                {'$unwind': {'path': '$' + alias, 'preserveNullAndEmptyArrays': True}},
+            ]
+
+        options = {'batchSize': params['batch_size']} if 'batch_size' in params else {}
+        cursor = collection.aggregate(pipeline, **options)
+
+        return cursor
 
+    @staticmethod
+    def _get_dbref_id(reference):
+        """
+        Aggregation expression of the DBRef `$id`
+        (field paths can not address the fields, that start with `$`).
+        """
+        return {
+            '$let': {
+                'vars': {
+                    'item': {
+                        '$arrayElemAt': [{
+                            '$filter': {
+                                'input': {'$objectToArray': reference},
+                                'cond': {'$eq': ['$$this.k', {'$literal': '$id'}]}
+                            }
+                        }, 0]
+                    }
+                },
+                'in': '$$item.v'
+            }
+        }
+
+    @staticmethod
+    def _get_related_projection(projection, lookups):
+        # The inclusive projection must keep the references to join by
+        is_inclusive = any(
+            value and not isinstance(value, dict)
+            for field_name, value in projection.items()
+            if field_name != '_id'
+        )
+
+        if is_inclusive:
+            projection = dict(projection, **{path[0]: True for path, collection_name in lookups})
+
+        return projection
+
+    @staticmethod
+    def _get_find_params(**kwargs):
         # TODO: Move check and processing to QuerySet
         available_params = {
             'filter': dict,
@@ -78,6 +344,7 @@ class MongoDispatcher:
             'limit': int,
             'skip': int,
             'projection': dict,
+            'batch_size': int,
         }
         params = {}
         for param_name, param_type in available_params.items():
@@ -89,15 +356,15 @@ class MongoDispatcher:
 
                 params[param_name] = param_value
 
-        cursor = collection.find(**params)
-
-        return cursor
+        return params
 
+    @invalidates_cache
     async def delete_one(self, **kwargs):
         collection = await self.get_collection()
         result = await collection.delete_one(filter=kwargs)
         return result
 
+    @invalidates_cache
     async def delete_many(self, **kwargs):
         collection = await self.get_collection()
         result = await collection.delete_many(filter=kwargs)
@@ -0,0 +1,67 @@
+class Expression:
+    """
+    Base class of the aggregation expressions, used as values of QuerySet.update.
+    """
+    def __add__(self, other):
+        return CombinedExpression('$add', self, other)
+
+    def __radd__(self, other):
+        return CombinedExpression('$add', other, self)
+
+    def __sub__(self, other):
+        return CombinedExpression('$subtract', self, other)
+
+    def __rsub__(self, other):
+        return CombinedExpression('$subtract', other, self)
+
+    def __mul__(self, other):
+        return CombinedExpression('$multiply', self, other)
+
+    def __rmul__(self, other):
+        return CombinedExpression('$multiply', other, self)
+
+    def __truediv__(self, other):
+        return CombinedExpression('$divide', self, other)
+
+    def __rtruediv__(self, other):
+        return CombinedExpression('$divide', other, self)
+
+    def to_expression(self):
+        raise NotImplementedError
+
+    @staticmethod
+    def compile(value):
+        """
+        Compile the value to the aggregation expression.
+        The values, that are not expressions, are taken literally.
+        """
+        if isinstance(value, Expression):
+            return value.to_expression()
+
+        return {'$literal': value}
+
+
+class F(Expression):
+    """
+    Reference to the value of the field of the updated document.
+    Subfields are separated by `__`: F('data__count')
+    """
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return 'F({})'.format(self.name)
+
+    def to_expression(self):
+        return '${}'.format(self.name.replace('__', '.'))
+
+
+class CombinedExpression(Expression):
+    def __init__(self, operator, *args):
+        self.operator = operator
+        self.args = args
+
+    def to_expression(self):
+        return {
+            self.operator: [self.compile(arg) for arg in self.args]
+        }
@@ -1,6 +1,14 @@
+import asyncio
+import weakref
 from datetime import datetime
 from core.validators import FieldValidator
 from .constants import CREATE, UPDATE
+from .exceptions import DoesNotExist
+from .identity import IdentityMap
+
+
+async def _get_resolved(value):
+    return value
 
 
 class Field:
@@ -164,8 +172,251 @@ class FloatField(Field):
         self.choices = choices
 
 
+class TrackedContainer:
+    """
+    Base class of the containers, that record the changes of their items,
+    so the update touches only the changed items instead of the whole value.
+    The recorded changes are used only if they turn the snapshot value into the current one.
+    """
+    __slots__ = ()
+
+    def reset(self):
+        """
+        Start recording the changes from the current state.
+        """
+        self._changes = self._changes.__class__()
+        self._is_rewritten = False
+
+    @property
+    def is_changed(self):
+        return self._is_rewritten or bool(self._changes)
+
+    def get_update(self, field_name, snapshot_value):
+        """
+        Get the update operators for the recorded changes.
+        :param field_name: str - the path to the value in the document
+        :param snapshot_value: the stored value, the changes are recorded since
+        :return: dict, or None if the whole value has to be set
+        """
+        raise NotImplementedError
+
+    def _rewrite(self):
+        self._is_rewritten = True
+
+
+class TrackedList(TrackedContainer, list):
+    """
+    The value of ListField. Appends are saved by $push, removals by $pullAll or $pop,
+    the assignments by index by $set. Other changes save the whole list.
+    """
+    __slots__ = ('_changes', '_is_rewritten')
+
+    container_type = list
+    PUSH, PULL, POP, SET = range(4)
+
+    def __init__(self, value=()):
+        super().__init__(value)
+        self._changes = []
+        self._is_rewritten = False
+
+    def __reduce__(self):
+        # The copy is the plain list
+        return list, (list(self),)
+
+    def append(self, item):
+        super().append(item)
+        self._changes.append((self.PUSH, item))
+
+    def extend(self, items):
+        items = list(items)
+        super().extend(items)
+        self._changes.extend((self.PUSH, item) for item in items)
+
+    def __iadd__(self, items):
+        self.extend(items)
+        return self
+
+    def insert(self, index, item):
+        if index >= len(self):
+            self.append(item)
+        else:
+            super().insert(index, item)
+            self._rewrite()
+
+    def remove(self, item):
+        super().remove(item)
+
+        # $pull removes all equal items
+        if item in self:
+            self._rewrite()
+        else:
+            self._changes.append((self.PULL, item))
+
+    def pop(self, index=-1):
+        length = len(self)
+        item = super().pop(index)
+
+        if index in (-1, length - 1):
+            self._changes.append((self.POP, 1))
+        elif index in (0, -length):
+            self._changes.append((self.POP, -1))
+        else:
+            self._rewrite()
+
+        return item
+
+    def __setitem__(self, index, item):
+        super().__setitem__(index, item)
+
+        if isinstance(index, int):
+            index = index if index >= 0 else index + len(self)
+            self._changes.append((self.SET, index))
+        else:
+            self._rewrite()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._rewrite()
+
+    def __imul__(self, count):
+        result = super().__imul__(count)
+        self._rewrite()
+        return result
+
+    def clear(self):
+        super().clear()
+        self._rewrite()
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._rewrite()
+
+    def reverse(self):
+        super().reverse()
+        self._rewrite()
+
+    def get_update(self, field_name, snapshot_value):
+        kinds = {kind for kind, _ in self._changes}
+
+        # The different operators conflict on the same field
+        if self._is_rewritten or len(kinds) != 1 or not isinstance(snapshot_value, list):
+            return None
+
+        kind = kinds.pop()
+        values = [value for _, value in self._changes]
+
+        if kind == self.PUSH:
+            update = {'$push': {field_name: {'$each': values}}}
+            expected = snapshot_value + values
+
+        elif kind == self.PULL:
+            update = {'$pullAll': {field_name: values}}
+            expected = [item for item in snapshot_value if item not in values]
+
+        elif kind == self.POP:
+            if len(values) != 1:
+                return None
+
+            update = {'$pop': {field_name: values[0]}}
+            expected = snapshot_value[:-1] if values[0] == 1 else snapshot_value[1:]
+
+        else:
+            if max(values) >= len(snapshot_value):
+                return None
+
+            update = {'$set': {'{}.{}'.format(field_name, index): self[index] for index in values}}
+            expected = list(snapshot_value)
+
+            for index in values:
+                expected[index] = self[index]
+
+        # The changes inside of the items are not recorded
+        return update if self == expected else None
+
+
+class TrackedDict(TrackedContainer, dict):
+    """
+    The value of DictField. The changed keys are saved by $set and $unset on their paths.
+    """
+    __slots__ = ('_changes', '_is_rewritten')
+
+    container_type = dict
+    SET, UNSET = range(2)
+
+    def __init__(self, value=None):
+        super().__init__(value or {})
+        self._changes = {}
+        self._is_rewritten = False
+
+    def __reduce__(self):
+        # The copy is the plain dict
+        return dict, (dict(self),)
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._changes[key] = self.SET
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._changes[key] = self.UNSET
+
+    def pop(self, key, *args):
+        if key in self:
+            self._changes[key] = self.UNSET
+
+        return super().pop(key, *args)
+
+    def popitem(self):
+        key, value = super().popitem()
+        self._changes[key] = self.UNSET
+        return key, value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def clear(self):
+        super().clear()
+        self._rewrite()
+
+    def get_update(self, field_name, snapshot_value):
+        if self._is_rewritten or not isinstance(snapshot_value, dict):
+            return None
+
+        update = {}
+        expected = dict(snapshot_value)
+
+        for key, kind in self._changes.items():
+            # The key can not be used in the path
+            if not isinstance(key, str) or '.' in key or key.startswith('$'):
+                return None
+
+            path = '{}.{}'.format(field_name, key)
+
+            if kind == self.SET:
+                update.setdefault('$set', {})[path] = self[key]
+                expected[key] = self[key]
+            else:
+                update.setdefault('$unset', {})[path] = ''
+                expected.pop(key, None)
+
+        # The changes inside of the items are not recorded
+        return update if update and self == expected else None
+
+
 class ListField(Field):
     field_type = list
+    tracked_class = TrackedList
 
     def __init__(self, child=None, null=False, length=None, unique=False, default=None):
         self.child = child
@@ -192,6 +443,7 @@ class ListField(Field):
 
 class DictField(Field):
     field_type = dict
+    tracked_class = TrackedDict
 
     def __init__(self, null=False, unique=False, min_length=None, max_length=None, default=None):
         self.null = null
@@ -214,7 +466,7 @@ class DateTimeField(Field):
         self.auto_now_update = auto_now_update
 
     def get_value(self, name, value, action):
-        if (action is CREATE and self.auto_now_create) or (action is UPDATE and self.auto_now_update) and not value:
+        if (action is CREATE and self.auto_now_create) or (action is UPDATE and self.auto_now_update):
             # MonogoDB rounds microseconds, and ODM does not request the created document,
             # for data consistency I reset them
             value = datetime.now().replace(microsecond=0)
@@ -224,7 +476,6 @@ class DateTimeField(Field):
 
 class BaseRelationField(Field):
     backward_class = None
-    _query = None
 
     def __init__(self, relation, related_name=None, null=False, on_delete=None):
         self.relation = relation
@@ -232,71 +483,57 @@ class BaseRelationField(Field):
         self.null = null
         self.on_delete = on_delete
 
-    def __aiter__(self):
-        return self
+    def get_query(self, value):
+        """
+        Get the awaitable, that loads the related document.
+        :param value: DBRef, ObjectId or the related model instance
+        """
+        document_id = getattr(value, 'id', value)
+        identity_map = IdentityMap.get_current()
 
-    # TODO: Test it!
-    async def __anext__(self):
-        async for item in self._get_query():
-            return item
-        raise StopAsyncIteration()
+        # The known instance is given without a query
+        if identity_map is not None:
+            odm_object = identity_map.get(self.relation, document_id)
 
-    def __await__(self):
-        return self._get_query().__await__()
+            if odm_object is not None:
+                return _get_resolved(odm_object)
 
-    def _get_query(self):
-        raise NotImplementedError
+        loader = RelationLoader.get_loader(self.relation)
 
+        if loader is not None:
+            return loader.load(document_id)
 
-class BaseBackwardRelationField(Field):
-    _query = None
+        get_kwargs = {'_id': document_id}
+        return self.relation.objects.get(**get_kwargs)
 
-    def get_query(self):
-        raise NotImplementedError
 
+class BaseBackwardRelationField(Field):
     def __init__(self, relation):
         self.relation = relation
 
-    def __aiter__(self):
-        return self
-
-    async def __anext__(self):
-        async for item in self.get_query():
-            return item
-        raise StopAsyncIteration()
-
-    def __await__(self):
-        return self.get_query().__await__()
+    def get_query(self, value):
+        """
+        Get the awaitable, that loads the referring documents.
+        :param value: ObjectId of the referred document
+        """
+        raise NotImplementedError
 
 
 class ForeignKeyBackward(BaseBackwardRelationField):
-    def get_query(self):
-        if not self._query:
-            filter_kwargs = {self._name: self._value}
-            self._query = self.relation.objects.filter(**filter_kwargs)
-
-        return self._query
+    def get_query(self, value):
+        filter_kwargs = {self._name: value}
+        return self.relation.objects.filter(**filter_kwargs)
 
 
 class OneToOneBackward(BaseBackwardRelationField):
-    def get_query(self):
-        if not self._query:
-            filter_kwargs = {self._name: self._value}
-            self._query = self.relation.objects.get(**filter_kwargs)
-
-        return self._query
+    def get_query(self, value):
+        filter_kwargs = {self._name: value}
+        return self.relation.objects.get(**filter_kwargs)
 
 
 class ForeignKey(BaseRelationField):
     backward_class = ForeignKeyBackward
 
-    def _get_query(self):
-        if not self._query:
-            get_kwargs = {'_id': self._value.id}
-            self._query = self.relation.objects.get(**get_kwargs)
-
-        return self._query
-
 
 class OneToOne(BaseRelationField):
     backward_class = OneToOneBackward
@@ -305,6 +542,267 @@ class OneToOne(BaseRelationField):
         super().__init__(*args, **kwargs)
         self.unique = True
 
-    def _get_query(self):
-        get_kwargs = {'_id': self._value.id}
-        return self.relation.objects.get(**get_kwargs)
+
+class RelationLoader:
+    """
+    Batches the loading of related documents by `_id`: the lookups of a model, that arrive
+    within one event loop iteration, are sent as a single `$in` query.
+    Batching is opt-in and enabled per event loop (see `enable`).
+    """
+    # {event loop: {model: RelationLoader}}
+    _loaders = weakref.WeakKeyDictionary()
+
+    def __init__(self, model, loop):
+        self.model = model
+        self.loop = loop
+
+        # {_id: future} of the current batch
+        self._pending = {}
+
+    @classmethod
+    def enable(cls, loop=None):
+        loop = loop or asyncio.get_event_loop()
+        cls._loaders.setdefault(loop, {})
+
+    @classmethod
+    def disable(cls, loop=None):
+        loop = loop or asyncio.get_event_loop()
+        cls._loaders.pop(loop, None)
+
+    @classmethod
+    def is_enabled(cls, loop=None):
+        loop = loop or asyncio.get_event_loop()
+        return loop in cls._loaders
+
+    @classmethod
+    def get_loader(cls, model):
+        """
+        Get the loader of the model for the current event loop (None if batching is disabled).
+        """
+        loop = asyncio.get_event_loop()
+        loaders = cls._loaders.get(loop)
+
+        if loaders is None:
+            return None
+
+        loader = loaders.get(model)
+
+        if loader is None:
+            loader = loaders[model] = cls(model, loop)
+
+        return loader
+
+    def load(self, document_id):
+        """
+        Schedule the loading of the document.
+        :param document_id: ObjectId
+        :return: Future with the model instance
+        """
+        future = self._pending.get(document_id)
+
+        if future is None:
+            # The first lookup of the batch - dispatch it on the next loop iteration
+            if not self._pending:
+                self.loop.call_soon(self._dispatch)
+
+            future = self._pending[document_id] = self.loop.create_future()
+
+        return future
+
+    def _dispatch(self):
+        pending, self._pending = self._pending, {}
+        self.loop.create_task(self._load(pending))
+
+    async def _load(self, pending):
+        try:
+            odm_objects = await self.model.objects.filter(_id__in=list(pending))
+        except Exception as e:
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        odm_objects = {odm_object._id: odm_object for odm_object in odm_objects}
+
+        for document_id, future in pending.items():
+            if future.done():
+                continue
+
+            if document_id in odm_objects:
+                future.set_result(odm_objects[document_id])
+            else:
+                future.set_exception(DoesNotExist('Document does not exists!'))
+
+
+class RelationProxy:
+    """
+    Per-instance accessor of a relation field.
+    Can be awaited more than once - the resolved value is cached.
+    """
+    __slots__ = ('field_instance', 'value', '_result', '_resolved')
+
+    def __init__(self, field_instance, value):
+        self.field_instance = field_instance
+        self.value = value
+        self._result = None
+        self._resolved = False
+
+        # The related object is already at hand (e.g. Post(author=author))
+        relation = field_instance.relation
+        if isinstance(relation, type) and isinstance(value, relation):
+            self.set_result(value)
+
+    @property
+    def relation(self):
+        return self.field_instance.relation
+
+    @property
+    def key(self):
+        """
+        The ObjectId the relation is resolved by.
+        """
+        return getattr(self.value, 'id', self.value)
+
+    @property
+    def is_resolved(self):
+        return self._resolved
+
+    def get_field_name(self):
+        return self.field_instance.get_field_name()
+
+    def get_field_value(self):
+        return self.value
+
+    def get_query(self):
+        return self.field_instance.get_query(self.value)
+
+    def set_result(self, result):
+        self._result = result
+        self._resolved = True
+
+    async def resolve(self):
+        if not self._resolved:
+            if self.value is None and isinstance(self.field_instance, BaseRelationField):
+                result = None
+            else:
+                result = await self.get_query()
+
+            self.set_result(result)
+
+        return self._result
+
+    def __await__(self):
+        return self.resolve().__await__()
+
+    async def __aiter__(self):
+        result = await self.resolve()
+
+        for item in result if isinstance(result, list) else [result]:
+            yield item
+
+
+class RelationDescriptor:
+    """
+    Data descriptor, that gives access to a relation field
+    of the model instance through the cached RelationProxy.
+    """
+    def __init__(self, field_name, field_instance):
+        self.field_name = field_name
+        self.field_instance = field_instance
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self.field_instance
+
+        value = self.get_value(instance)
+        proxies = instance._relation_proxies
+
+        if proxies is None:
+            proxies = instance._relation_proxies = {}
+
+        proxy = proxies.get(self.field_name)
+
+        if proxy is None or proxy.value is not value:
+            previous, proxy = proxy, RelationProxy(self.field_instance, value)
+
+            # The value was replaced by another reference to the same document
+            if previous is not None and previous.is_resolved and previous.key == proxy.key:
+                proxy.set_result(previous._result)
+
+            proxies[self.field_name] = proxy
+
+        return proxy
+
+    def get_value(self, instance):
+        raise NotImplementedError
+
+
+class ForwardRelationDescriptor(RelationDescriptor):
+    def __set__(self, instance, value):
+        instance.__dict__[self.field_name] = value
+
+    def __delete__(self, instance):
+        if instance._relation_proxies:
+            instance._relation_proxies.pop(self.field_name, None)
+
+        try:
+            del instance.__dict__[self.field_name]
+        except KeyError:
+            raise AttributeError(self.field_name)
+
+    def get_value(self, instance):
+        try:
+            return instance.__dict__[self.field_name]
+        except KeyError:
+            raise AttributeError(self.field_name)
+
+
+class BackwardRelationDescriptor(RelationDescriptor):
+    def __set__(self, instance, value):
+        raise AttributeError(
+            'Backward relation `{field_name}` can not be set'.format(
+                field_name=self.field_name
+            )
+        )
+
+    def get_value(self, instance):
+        return instance._id
+
+
+class TrackedValueDescriptor:
+    """
+    Gives the values of ListField and DictField as the tracked containers.
+    The value is stored in the slot and wrapped on the first access.
+    """
+    __slots__ = ('member', 'tracked_class')
+
+    def __init__(self, member, tracked_class):
+        self.member = member
+        self.tracked_class = tracked_class
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+
+        value = self.member.__get__(instance, owner)
+
+        if type(value) is self.tracked_class.container_type:
+            value = self.tracked_class(value)
+            self.member.__set__(instance, value)
+
+        return value
+
+    def __set__(self, instance, value):
+        self.member.__set__(instance, value)
+
+    def __delete__(self, instance):
+        self.member.__delete__(instance)
+
+    def get_raw(self, instance, default=None):
+        """
+        Get the stored value without wrapping.
+        """
+        try:
+            return self.member.__get__(instance, type(instance))
+        except AttributeError:
+            return default
@@ -0,0 +1,91 @@
+from contextvars import ContextVar
+
+_current_identity_map = ContextVar('identity_map', default=None)
+
+
+class IdentityMap:
+    """
+    Keeps a single model instance per document (database, collection, _id) in the current context.
+    The querysets of complete documents (without projection) give the known instances
+    instead of the new ones, `get(_id=...)` and the relations are resolved without a query.
+
+        async with identity_map():
+            post_1, post_2 = await Post.objects.filter(author=author)
+            assert await post_1.author is await post_2.author
+    """
+    def __init__(self):
+        self._objects = {}
+        self._token = None
+
+    @staticmethod
+    def get_current():
+        """
+        Get the identity map of the current context.
+        :return: IdentityMap or None
+        """
+        return _current_identity_map.get()
+
+    def __enter__(self):
+        self._token = _current_identity_map.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _current_identity_map.reset(self._token)
+        self.clear()
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.__exit__(exc_type, exc_value, traceback)
+
+    @staticmethod
+    def _get_key(model, document_id):
+        return model.get_db_name(), model.get_collection_name(), document_id
+
+    def get(self, model, document_id):
+        """
+        :return: MongoModel instance or None
+        """
+        return self._objects.get(self._get_key(model, document_id))
+
+    def add(self, odm_object):
+        self._objects[self._get_key(odm_object.__class__, odm_object.id)] = odm_object
+
+    def discard(self, odm_object):
+        self._objects.pop(self._get_key(odm_object.__class__, odm_object.id), None)
+
+    def clear(self):
+        self._objects.clear()
+
+    def decode(self, model, document):
+        """
+        Get the known instance of the document, or create it from the raw document.
+        The values of the known instance are not changed.
+        :param model: MongoModel class
+        :param document: dict
+        :return: MongoModel instance
+        """
+        document_id = document.get('_id')
+        key = self._get_key(model, document_id)
+        odm_object = self._objects.get(key)
+
+        if odm_object is None:
+            odm_object = model.get_decoder().decode(document)
+
+            if document_id is not None:
+                self._objects[key] = odm_object
+
+        return odm_object
+
+    def decode_many(self, model, documents):
+        decode = self.decode
+        return [decode(model, document) for document in documents]
+
+
+def identity_map():
+    """
+    Start the identity map in the current context.
+    :return: IdentityMap
+    """
+    return IdentityMap()
@@ -1,8 +1,12 @@
-import copy
+import time
+import asyncio
 from collections import namedtuple
 
 from core.constants import CASCADE, PROTECTED, SET_NULL, SET_DEFAULT
-from core.fields import BaseRelationField, BaseBackwardRelationField, OneToOneBackward, ForeignKeyBackward
+from core.fields import (
+    BaseRelationField, BaseBackwardRelationField, OneToOneBackward, ForeignKeyBackward,
+    BackwardRelationDescriptor, RelationProxy
+)
 
 WaitedRelation = namedtuple('WaitedRelation', [
     'field_name', 'field_instance', 'model_name'
@@ -98,6 +102,7 @@ class RelationManager:
         # Add backward relation by related_name argument
         declared_fields = rel_model.get_declared_fields()
         declared_fields[related_name] = backward_relation
+        setattr(rel_model, related_name, BackwardRelationDescriptor(related_name, backward_relation))
 
     def _handle_waited_relations(self):
         for waited_relation in self._waited_relations:
@@ -114,8 +119,131 @@ class RelationManager:
                 del self._waited_relations[index]
 
 
+class RelationChecker:
+    """
+    Checks the existence of the documents, referenced by the relation fields.
+    The references are collected and checked by one `$in` query per related model.
+    The ids, found in the database, can be cached for a short time (disabled by default).
+    """
+    CACHE_MAX_SIZE = 100000
+
+    # {relation model: {document_id: expiration time}}
+    _cache = {}
+    _cache_ttl = None
+
+    def __init__(self, known_ids=None):
+        """
+        :param known_ids: set - ids of the documents, that are considered to be existing
+        """
+        # {relation model: {document_id: (model_name, field_name)}}
+        self._references = {}
+        self._known_ids = known_ids or set()
+
+    @classmethod
+    def enable_cache(cls, ttl=5):
+        """
+        Remember the existing ids for `ttl` seconds.
+        Documents deleted within that time are still considered to be existing.
+        :param ttl: int or float - seconds
+        """
+        cls._cache_ttl = ttl
+
+    @classmethod
+    def disable_cache(cls):
+        cls._cache_ttl = None
+        cls._cache.clear()
+
+    @classmethod
+    def remember(cls, model, document_ids):
+        """
+        Mark the documents of the model as existing.
+        """
+        if cls._cache_ttl is None:
+            return
+
+        cache = cls._cache.setdefault(model, {})
+        expiration_time = time.monotonic() + cls._cache_ttl
+        cache.update(dict.fromkeys(document_ids, expiration_time))
+
+        if len(cache) > cls.CACHE_MAX_SIZE:
+            cls._prune(cache)
+
+    @classmethod
+    def forget(cls, model, document_ids):
+        cache = cls._cache.get(model)
+
+        if cache:
+            for document_id in document_ids:
+                cache.pop(document_id, None)
+
+    @classmethod
+    def _prune(cls, cache):
+        now = time.monotonic()
+
+        for document_id, expiration_time in list(cache.items()):
+            if expiration_time <= now:
+                del cache[document_id]
+
+        # Too many ids are alive, start over
+        if len(cache) > cls.CACHE_MAX_SIZE:
+            cache.clear()
+
+    @classmethod
+    def _is_known(cls, model, document_id):
+        expiration_time = cls._cache.get(model, {}).get(document_id)
+        return expiration_time is not None and expiration_time > time.monotonic()
+
+    def add(self, model_name, field_name, relation, document_id):
+        """
+        Add the reference to check.
+        :param model_name: str - name of the referencing model
+        :param field_name: str - name of the relation field
+        :param relation: MongoModel class - the related model
+        :param document_id: ObjectId
+        """
+        references = self._references.setdefault(relation, {})
+
+        if document_id not in references:
+            references[document_id] = (model_name, field_name)
+
+    async def check(self):
+        """
+        Check all added references.
+        :raise ValueError: if a related document does not exist
+        """
+        references, self._references = self._references, {}
+        checks, queries = [], []
+
+        for relation, documents in references.items():
+            document_ids = [
+                document_id for document_id in documents
+                if document_id not in self._known_ids and not self._is_known(relation, document_id)
+            ]
+
+            if document_ids:
+                checks.append((relation, document_ids))
+                queries.append(relation.objects.filter(_id__in=document_ids).values_list('_id', flat=True))
+
+        results = await asyncio.gather(*queries)
+
+        for (relation, document_ids), found_ids in zip(checks, results):
+            self.remember(relation, found_ids)
+            found_ids = set(found_ids)
+
+            for document_id in document_ids:
+                if document_id not in found_ids:
+                    model_name, field_name = references[relation][document_id]
+                    raise ValueError(
+                        'Relation document with ObjectId(\'{document_id}\') does not exist.\n'
+                        'Model: \'{model_name}\', Field: \'{field_name}\''.format(
+                            document_id=str(document_id),
+                            model_name=model_name,
+                            field_name=field_name
+                        ))
+
+
 class OnDeleteManager:
-    async def process(self, field_instance, action):
+    async def process(self, proxy, action):
         actions_names = {
             CASCADE: 'cascade',
             PROTECTED: 'protected',
@@ -126,36 +254,36 @@ class OnDeleteManager:
         method = getattr(self, 'on_{}'.format(action_name), None)
 
         if callable(method):
-            await method(field_instance)
+            await method(proxy)
 
     @staticmethod
-    async def on_cascade(field_instance):
-        if isinstance(field_instance, OneToOneBackward):
+    async def on_cascade(proxy):
+        if isinstance(proxy.field_instance, OneToOneBackward):
             filter_kwargs = {
-                field_instance.get_field_name(): field_instance.get_field_value()
+                proxy.get_field_name(): proxy.get_field_value()
             }
-            await field_instance.relation.objects.filter(**filter_kwargs).delete()
+            await proxy.relation.objects.filter(**filter_kwargs).delete()
 
-        elif isinstance(field_instance, ForeignKeyBackward):
-            await field_instance.get_query().delete()
+        elif isinstance(proxy.field_instance, ForeignKeyBackward):
+            await proxy.get_query().delete()
 
     @staticmethod
-    async def on_protected(field_instance):
+    async def on_protected(proxy):
         raise Exception('ProtectedError')
 
     @staticmethod
-    async def on_set_null(field_instance):
-        if isinstance(field_instance, OneToOneBackward):
-            field_name = field_instance.get_field_name()
-            result = await field_instance
+    async def on_set_null(proxy):
+        if isinstance(proxy.field_instance, OneToOneBackward):
+            field_name = proxy.get_field_name()
+            result = await proxy
             setattr(result, field_name, None)
 
-        elif isinstance(field_instance, ForeignKeyBackward):
-            field_name = field_instance.get_field_name()
-            await field_instance.get_query().update(**{field_name: None})
+        elif isinstance(proxy.field_instance, ForeignKeyBackward):
+            field_name = proxy.get_field_name()
+            await proxy.get_query().update(**{field_name: None})
 
     @staticmethod
-    async def on_set_default(field_instance):
+    async def on_set_default(proxy):
         # TODO: Implement setting the default value
         pass
 
@@ -169,23 +297,22 @@ class OnDeleteManager:
             for field_name, field_instance in odm_object.get_declared_fields().items():
                 # Find backward relationships
                 if isinstance(field_instance, BaseBackwardRelationField):
-                    bwd_field_instance = getattr(odm_object, field_name)
-                    relation_field_name = bwd_field_instance.get_field_name()
+                    bwd_proxy = getattr(odm_object, field_name)
+                    relation_field_name = bwd_proxy.get_field_name()
 
                     # Get declared fields from the model referenced by backward field
-                    declared_fields = bwd_field_instance.relation.get_declared_fields()
+                    declared_fields = bwd_proxy.relation.get_declared_fields()
                     relation_field_instance = declared_fields.get(relation_field_name)
 
-                    # Get 'on_delete' parameter with the action applied to bwd_field_instance documents
+                    # Get 'on_delete' parameter with the action applied to bwd_proxy documents
                     on_delete = relation_field_instance.on_delete
 
-                    # await the copied object (prevent 'can not reuse awaitable coroutine')
-                    rel_odm_objects = await copy.deepcopy(bwd_field_instance)
+                    rel_odm_objects = await bwd_proxy
                     rel_odm_objects = rel_odm_objects if isinstance(rel_odm_objects, list) else [rel_odm_objects]
 
                     # Recursively process related objects
                     children = {
-                        bwd_field_instance: await self.analyze_backwards(odm_objects=rel_odm_objects)
+                        bwd_proxy: await self.analyze_backwards(odm_objects=rel_odm_objects)
                     }
 
                     data.setdefault(on_delete, [])
@@ -207,9 +334,9 @@ class OnDeleteManager:
                         await _walk(tree=value, action=action)
 
                         # Handle the 'on_delete' parameter in relationships from depth
-                        if isinstance(key, BaseBackwardRelationField):
-                            # In the nested structure key might be an BaseBackwardRelationField
-                            await self.process(field_instance=key, action=action)
+                        if isinstance(key, RelationProxy):
+                            # In the nested structure key might be a RelationProxy of the backward field
+                            await self.process(proxy=key, action=action)
 
                 pass
 
@@ -0,0 +1,989 @@
+import re
+import operator
+import datetime
+from numbers import Number
+
+from bson import BSON, ObjectId, DBRef
+from pymongo import InsertOne, UpdateOne, UpdateMany, ReplaceOne, DeleteOne, DeleteMany
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
+from pymongo.results import InsertOneResult, InsertManyResult, UpdateResult, DeleteResult, BulkWriteResult
+
+from .utils import freeze
+from .constants import RELATED_PREFIX
+from .dispatchers import MongoDispatcher
+
+# Marks the field, that is removed by the update pipeline
+_REMOVE = object()
+
+DUPLICATE_KEY_ERROR = 11000
+
+
+def _get_values(value, parts):
+    """
+    Get the values by the path, the arrays on the path are traversed.
+    :param parts: list - the path, split by dots
+    :return: list - the found values (empty, if the path does not exist)
+    """
+    if not parts:
+        return [value]
+
+    part, rest = parts[0], parts[1:]
+
+    if isinstance(value, dict):
+        return _get_values(value[part], rest) if part in value else []
+
+    if isinstance(value, DBRef):
+        item = {'$id': value.id, '$ref': value.collection, '$db': value.database}.get(part)
+        return _get_values(item, rest) if item is not None else []
+
+    if isinstance(value, list):
+        values = []
+
+        if part.isdigit():
+            index = int(part)
+            values += _get_values(value[index], rest) if index < len(value) else []
+
+        for item in value:
+            if isinstance(item, (dict, DBRef)):
+                values += _get_values(item, parts)
+
+        return values
+
+    return []
+
+
+def _get_type_rank(value):
+    """
+    The order of the types in the comparisons and the sorting.
+    """
+    if value is None:
+        return 1
+    if isinstance(value, bool):
+        return 8
+    if isinstance(value, Number):
+        return 2
+    if isinstance(value, str):
+        return 3
+    if isinstance(value, dict):
+        return 4
+    if isinstance(value, list):
+        return 5
+    if isinstance(value, bytes):
+        return 6
+    if isinstance(value, ObjectId):
+        return 7
+    if isinstance(value, datetime.datetime):
+        return 9
+
+    return 10
+
+
+def _get_sort_key(value):
+    rank = _get_type_rank(value)
+    return (rank, value) if rank in (2, 3, 6, 7, 8, 9) else (rank, repr(value))
+
+
+def _is_equal(value, argument):
+    if isinstance(argument, re.Pattern):
+        return isinstance(value, str) and argument.search(value) is not None
+
+    # True is not 1
+    if isinstance(value, bool) != isinstance(argument, bool):
+        return False
+
+    return value == argument
+
+
+def _expand(values):
+    # The arrays are matched by themselves and by their items
+    for value in values:
+        yield value
+
+        if isinstance(value, list):
+            yield from value
+
+
+class MemoryQuery:
+    """
+    Matches the documents by the MongoDB query: the conditions of the ODM operators,
+    the logical operators and a few more ($regex, $size, $elemMatch).
+    """
+    def __init__(self, query):
+        self.query = query or {}
+
+    def match(self, document):
+        return self._match(document, self.query)
+
+    def _match(self, document, query):
+        for key, condition in query.items():
+            if key.startswith('$'):
+                method = getattr(self, 'logical_{}'.format(key[1:]), None)
+
+                if not callable(method):
+                    raise OperationFailure('unknown top level operator: {}'.format(key))
+
+                if not method(document, condition):
+                    return False
+
+            elif not self.match_values(_get_values(document, key.split('.')), condition):
+                return False
+
+        return True
+
+    def logical_and(self, document, queries):
+        return all(self._match(document, query) for query in queries)
+
+    def logical_or(self, document, queries):
+        return any(self._match(document, query) for query in queries)
+
+    def logical_nor(self, document, queries):
+        return not self.logical_or(document, queries)
+
+    def match_values(self, values, condition):
+        """
+        :param values: list - the values of the field
+        :param condition: the value to compare with, or the dict of the operators
+        """
+        if not self._is_operators(condition):
+            return self.op_eq(values, condition)
+
+        for name, argument in condition.items():
+            if name == '$options':
+                continue
+
+            if name == '$regex':
+                argument = self._get_pattern(argument, condition.get('$options', ''))
+
+            method = getattr(self, 'op_{}'.format(name[1:]), None)
+
+            if not callable(method):
+                raise OperationFailure('unknown operator: {}'.format(name))
+
+            if not method(values, argument):
+                return False
+
+        return True
+
+    @staticmethod
+    def _is_operators(condition):
+        return isinstance(condition, dict) and bool(condition) and all(key.startswith('$') for key in condition)
+
+    @staticmethod
+    def _get_pattern(pattern, options):
+        flags = 0
+
+        for option, flag in (('i', re.IGNORECASE), ('m', re.MULTILINE), ('s', re.DOTALL), ('x', re.VERBOSE)):
+            if option in options:
+                flags |= flag
+
+        return re.compile(pattern, flags) if isinstance(pattern, str) else pattern
+
+    @staticmethod
+    def _compare(values, argument, compare):
+        # Only the values of the same type are compared
+        rank = _get_type_rank(argument)
+
+        for value in _expand(values):
+            if _get_type_rank(value) == rank and compare(value, argument):
+                return True
+
+        return False
+
+    def op_eq(self, values, argument):
+        # The missing field is equal to null
+        if argument is None and not values:
+            return True
+
+        return any(_is_equal(value, argument) for value in _expand(values))
+
+    def op_ne(self, values, argument):
+        return not self.op_eq(values, argument)
+
+    def op_gt(self, values, argument):
+        return self._compare(values, argument, operator.gt)
+
+    def op_gte(self, values, argument):
+        return self._compare(values, argument, operator.ge)
+
+    def op_lt(self, values, argument):
+        return self._compare(values, argument, operator.lt)
+
+    def op_lte(self, values, argument):
+        return self._compare(values, argument, operator.le)
+
+    def op_in(self, values, argument):
+        return any(self.op_eq(values, item) for item in argument)
+
+    def op_nin(self, values, argument):
+        return not self.op_in(values, argument)
+
+    def op_all(self, values, argument):
+        return bool(argument) and all(self.op_eq(values, item) for item in argument)
+
+    @staticmethod
+    def op_exists(values, argument):
+        return bool(values) == bool(argument)
+
+    def op_not(self, values, argument):
+        return not self.match_values(values, argument if isinstance(argument, dict) else {'$regex': argument})
+
+    @staticmethod
+    def op_regex(values, argument):
+        return any(isinstance(value, str) and argument.search(value) for value in _expand(values))
+
+    @staticmethod
+    def op_size(values, argument):
+        return any(isinstance(value, list) and len(value) == argument for value in values)
+
+    def op_elemMatch(self, values, argument):
+        for value in values:
+            for item in value if isinstance(value, list) else ():
+                if self._is_operators(argument):
+                    if self.match_values([item], argument):
+                        return True
+
+                elif isinstance(item, dict) and self._match(item, argument):
+                    return True
+
+        return False
+
+
+class MemoryExpression:
+    """
+    Evaluates the aggregation expressions of the update pipeline.
+    """
+    def evaluate(self, document, expression):
+        if isinstance(expression, str) and expression.startswith('$$'):
+            if expression == '$$REMOVE':
+                return _REMOVE
+
+            if expression == '$$ROOT':
+                return document
+
+            raise OperationFailure('unknown variable: {}'.format(expression))
+
+        if isinstance(expression, str) and expression.startswith('$'):
+            values = _get_values(document, expression[1:].split('.'))
+            return values[0] if len(values) == 1 else (values or None)
+
+        if isinstance(expression, dict) and len(expression) == 1 and next(iter(expression)).startswith('$'):
+            name, argument = next(iter(expression.items()))
+
+            if name == '$literal':
+                return argument
+
+            method = getattr(self, 'op_{}'.format(name[1:]), None)
+
+            if not callable(method):
+                raise OperationFailure('unknown expression: {}'.format(name))
+
+            arguments = argument if isinstance(argument, list) else [argument]
+            return method([self.evaluate(document, item) for item in arguments])
+
+        if isinstance(expression, dict):
+            return {key: self.evaluate(document, value) for key, value in expression.items()}
+
+        if isinstance(expression, list):
+            return [self.evaluate(document, item) for item in expression]
+
+        return expression
+
+    @staticmethod
+    def _is_null(arguments):
+        return any(argument is None or argument is _REMOVE for argument in arguments)
+
+    def op_add(self, arguments):
+        return None if self._is_null(arguments) else sum(arguments)
+
+    def op_subtract(self, arguments):
+        return None if self._is_null(arguments) else arguments[0] - arguments[1]
+
+    def op_multiply(self, arguments):
+        if self._is_null(arguments):
+            return None
+
+        result = 1
+
+        for argument in arguments:
+            result *= argument
+
+        return result
+
+    def op_divide(self, arguments):
+        return None if self._is_null(arguments) else arguments[0] / arguments[1]
+
+    @staticmethod
+    def op_ifNull(arguments):
+        for argument in arguments[:-1]:
+            if argument is not None and argument is not _REMOVE:
+                return argument
+
+        return arguments[-1]
+
+    @staticmethod
+    def op_min(arguments):
+        arguments = [argument for argument in arguments if argument is not None and argument is not _REMOVE]
+        return min(arguments, key=_get_sort_key) if arguments else None
+
+    @staticmethod
+    def op_max(arguments):
+        arguments = [argument for argument in arguments if argument is not None and argument is not _REMOVE]
+        return max(arguments, key=_get_sort_key) if arguments else None
+
+
+class MemoryUpdate:
+    """
+    Applies the update document (or the update pipeline) to the document.
+    """
+    def __init__(self, update):
+        self.update = update
+
+    def apply(self, document):
+        if isinstance(self.update, list):
+            for stage in self.update:
+                self._apply_stage(document, stage)
+            return
+
+        for name, fields in self.update.items():
+            method = getattr(self, 'op_{}'.format(name[1:]), None) if name.startswith('$') else None
+
+            if not callable(method):
+                raise OperationFailure('Unknown modifier: {}'.format(name))
+
+            for path, value in fields.items():
+                method(document, path.split('.'), value)
+
+    def _apply_stage(self, document, stage):
+        (name, argument), = stage.items()
+
+        if name in ('$set', '$addFields'):
+            # The expressions of the stage are evaluated by the input document
+            values = {path: MemoryExpression().evaluate(document, value) for path, value in argument.items()}
+
+            for path, value in values.items():
+                if value is _REMOVE:
+                    self.op_unset(document, path.split('.'), '')
+                else:
+                    self.op_set(document, path.split('.'), value)
+
+        elif name == '$unset':
+            for path in [argument] if isinstance(argument, str) else argument:
+                self.op_unset(document, path.split('.'), '')
+
+        else:
+            raise OperationFailure('Unsupported update pipeline stage: {}'.format(name))
+
+    @staticmethod
+    def _get_container(document, parts, create=True):
+        """
+        Get the dict (or the list) that contains the last part of the path.
+        :return: dict, list or None, if the path does not exist
+        """
+        container = document
+
+        for part in parts[:-1]:
+            if isinstance(container, list) and part.isdigit():
+                index = int(part)
+
+                if index >= len(container):
+                    if not create:
+                        return None
+
+                    container.extend([None] * (index + 1 - len(container)))
+
+                if container[index] is None and create:
+                    container[index] = {}
+
+                container = container[index]
+
+            elif isinstance(container, dict):
+                if part not in container:
+                    if not create:
+                        return None
+
+                    container[part] = {}
+
+                container = container[part]
+
+            else:
+                if not create:
+                    return None
+
+                raise OperationFailure('Cannot create field \'{}\' in element'.format(part))
+
+        return container
+
+    @classmethod
+    def _get(cls, document, parts, default=None):
+        container = cls._get_container(document, parts, create=False)
+        part = parts[-1]
+
+        if isinstance(container, list) and part.isdigit():
+            return container[int(part)] if int(part) < len(container) else default
+
+        if isinstance(container, dict):
+            return container.get(part, default)
+
+        return default
+
+    @classmethod
+    def _get_array(cls, document, parts):
+        value = cls._get(document, parts)
+
+        if value is None:
+            value = []
+            cls.op_set(document, parts, value)
+
+        if not isinstance(value, list):
+            raise OperationFailure('The field \'{}\' must be an array'.format('.'.join(parts)))
+
+        return value
+
+    @classmethod
+    def op_set(cls, document, parts, value):
+        container = cls._get_container(document, parts)
+        part = parts[-1]
+
+        if isinstance(container, list):
+            index = int(part)
+            container.extend([None] * (index + 1 - len(container)))
+            container[index] = value
+        else:
+            container[part] = value
+
+    @classmethod
+    def op_unset(cls, document, parts, value):
+        container = cls._get_container(document, parts, create=False)
+        part = parts[-1]
+
+        # The items of the arrays are set to null
+        if isinstance(container, list) and part.isdigit():
+            if int(part) < len(container):
+                container[int(part)] = None
+
+        elif isinstance(container, dict):
+            container.pop(part, None)
+
+    @classmethod
+    def _set_number(cls, document, parts, value, compute):
+        current = cls._get(document, parts)
+
+        if current is not None and not isinstance(current, Number):
+            raise OperationFailure('Cannot apply the arithmetic modifier to a non-numeric field')
+
+        cls.op_set(document, parts, compute(current, value))
+
+    @classmethod
+    def op_inc(cls, document, parts, value):
+        cls._set_number(document, parts, value, lambda current, value: value if current is None else current + value)
+
+    @classmethod
+    def op_mul(cls, document, parts, value):
+        cls._set_number(document, parts, value, lambda current, value: 0 * value if current is None else current * value)
+
+    @classmethod
+    def op_min(cls, document, parts, value):
+        current = cls._get(document, parts, _REMOVE)
+
+        if current is _REMOVE or _get_sort_key(value) < _get_sort_key(current):
+            cls.op_set(document, parts, value)
+
+    @classmethod
+    def op_max(cls, document, parts, value):
+        current = cls._get(document, parts, _REMOVE)
+
+        if current is _REMOVE or _get_sort_key(value) > _get_sort_key(current):
+            cls.op_set(document, parts, value)
+
+    @classmethod
+    def op_push(cls, document, parts, value):
+        array = cls._get_array(document, parts)
+
+        if isinstance(value, dict) and '$each' in value:
+            items = list(value['$each'])
+            position = value.get('$position', len(array))
+            array[position:position] = items
+
+            if '$slice' in value:
+                array[:] = array[:value['$slice']] if value['$slice'] >= 0 else array[value['$slice']:]
+        else:
+            array.append(value)
+
+    @classmethod
+    def op_addToSet(cls, document, parts, value):
+        array = cls._get_array(document, parts)
+        items = value['$each'] if isinstance(value, dict) and '$each' in value else [value]
+
+        for item in items:
+            if not any(_is_equal(existing, item) for existing in array):
+                array.append(item)
+
+    @classmethod
+    def op_pull(cls, document, parts, value):
+        array = cls._get(document, parts)
+
+        if not isinstance(array, list):
+            return
+
+        query = MemoryQuery(None)
+
+        if MemoryQuery._is_operators(value):
+            matches = lambda item: query.match_values([item], value)  # noqa: E731
+        elif isinstance(value, dict):
+            matches = lambda item: isinstance(item, dict) and MemoryQuery(value).match(item)  # noqa: E731
+        else:
+            matches = lambda item: _is_equal(item, value)  # noqa: E731
+
+        array[:] = [item for item in array if not matches(item)]
+
+    @classmethod
+    def op_pullAll(cls, document, parts, value):
+        array = cls._get(document, parts)
+
+        if isinstance(array, list):
+            array[:] = [item for item in array if not any(_is_equal(item, other) for other in value)]
+
+    @classmethod
+    def op_pop(cls, document, parts, value):
+        array = cls._get(document, parts)
+
+        if isinstance(array, list) and array:
+            array.pop(0 if value == -1 else -1)
+
+    @classmethod
+    def op_rename(cls, document, parts, value):
+        current = cls._get(document, parts, _REMOVE)
+
+        if current is not _REMOVE:
+            cls.op_unset(document, parts, '')
+            cls.op_set(document, value.split('.'), current)
+
+    @classmethod
+    def op_currentDate(cls, document, parts, value):
+        cls.op_set(document, parts, datetime.datetime.utcnow())
+
+    @staticmethod
+    def op_setOnInsert(document, parts, value):
+        # The upserts are not supported
+        pass
+
+
+class MemoryCursor:
+    """
+    The cursor over the found documents, the documents are decoded on the fetch.
+    """
+    def __init__(self, documents, projection=None):
+        """
+        :param documents: list of bytes (BSON) or dicts
+        :param projection: dict
+        """
+        self._documents = documents
+        self._projection = projection
+        self._position = 0
+
+    def _decode(self, document):
+        if isinstance(document, bytes):
+            document = BSON(document).decode()
+
+        return project(document, self._projection) if self._projection else document
+
+    async def to_list(self, length):
+        end = len(self._documents) if length is None else self._position + length
+        documents = [self._decode(document) for document in self._documents[self._position:end]]
+        self._position += len(documents)
+        return documents
+
+    def close(self):
+        self._documents = []
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        documents = await self.to_list(1)
+
+        if not documents:
+            raise StopAsyncIteration
+
+        return documents[0]
+
+
+def project(document, projection):
+    """
+    Apply the projection to the document (the document is changed).
+    :param document: dict
+    :param projection: dict - {path: True/False or {'$slice': ...}}
+    :return: dict
+    """
+    include_id = projection.get('_id', True)
+    fields = {key: value for key, value in projection.items() if key != '_id'}
+    slices = {key: value['$slice'] for key, value in fields.items() if isinstance(value, dict) and '$slice' in value}
+    included = [key for key, value in fields.items() if value and not isinstance(value, dict)]
+
+    if included or (not fields and projection.get('_id')):
+        result = {}
+
+        if include_id and '_id' in document:
+            result['_id'] = document['_id']
+
+        # The sliced arrays are included with the fields
+        for key in included + list(slices):
+            _copy_path(document, result, key.split('.'))
+
+        # The fields are kept in the order of the document
+        order = {key: index for index, key in enumerate(document)}
+        document = {key: result[key] for key in sorted(result, key=lambda key: order.get(key, len(order)))}
+
+    else:
+        for key, value in fields.items():
+            if not value and not isinstance(value, dict):
+                MemoryUpdate.op_unset(document, key.split('.'), '')
+
+        if not include_id:
+            document.pop('_id', None)
+
+    for key, argument in slices.items():
+        array = MemoryUpdate._get(document, key.split('.'))
+
+        if isinstance(array, list):
+            if isinstance(argument, (list, tuple)):
+                skip, limit = argument
+                skip = max(len(array) + skip, 0) if skip < 0 else skip
+                array[:] = array[skip:skip + limit]
+            else:
+                array[:] = array[:argument] if argument >= 0 else array[argument:]
+
+    return document
+
+
+def _copy_path(source, target, parts):
+    part, rest = parts[0], parts[1:]
+
+    if not isinstance(source, dict) or part not in source:
+        return
+
+    if not rest:
+        target[part] = source[part]
+
+    elif isinstance(source[part], dict):
+        _copy_path(source[part], target.setdefault(part, {}), rest)
+
+    elif isinstance(source[part], list):
+        items = target.setdefault(part, [])
+
+        for item in source[part]:
+            if isinstance(item, dict):
+                projected = {}
+                _copy_path(item, projected, rest)
+                items.append(projected)
+
+
+class MemoryCollection:
+    """
+    The collection of the memory database with the methods of the Motor collection,
+    that are used by the dispatcher.
+    The documents are kept as BSON, so the reads give the new documents,
+    like the documents received from the server.
+    """
+    def __init__(self, database, name):
+        self.database = database
+        self.name = name
+
+        # {frozen _id: (BSON, document)}
+        self._documents = {}
+
+    @staticmethod
+    def _get_key(document_id):
+        return freeze(document_id)
+
+    def get_document(self, document_id):
+        """
+        :return: dict or None
+        """
+        item = self._documents.get(self._get_key(document_id))
+        return BSON(item[0]).decode() if item is not None else None
+
+    def _find(self, query):
+        """
+        :return: list of tuples (BSON, document) of the matched documents
+        """
+        query = query or {}
+
+        # The document is taken by _id without the scan
+        if len(query) == 1 and '_id' in query and not isinstance(query['_id'], dict):
+            item = self._documents.get(self._get_key(query['_id']))
+            return [item] if item is not None else []
+
+        matcher = MemoryQuery(query)
+        return [item for item in self._documents.values() if matcher.match(item[1])]
+
+    @staticmethod
+    def _sort(items, sort):
+        for field_name, direction in reversed(sort):
+            parts = field_name.split('.')
+            select = min if direction > 0 else max
+
+            def get_key(item):
+                values = list(_expand(_get_values(item[1], parts))) or [None]
+                return select(_get_sort_key(value) for value in values)
+
+            items.sort(key=get_key, reverse=direction < 0)
+
+        return items
+
+    def find(self, filter=None, projection=None, skip=0, limit=0, sort=None, **kwargs):
+        items = self._find(filter)
+
+        if sort:
+            items = self._sort(items, sort)
+
+        items = items[skip or 0:]
+
+        if limit:
+            items = items[:abs(limit)]
+
+        return MemoryCursor([raw for raw, _ in items], projection)
+
+    async def find_one(self, filter=None, projection=None, **kwargs):
+        documents = await self.find(filter, projection, limit=1).to_list(1)
+        return documents[0] if documents else None
+
+    async def count(self, filter=None, **kwargs):
+        return len(self._find(filter))
+
+    async def count_documents(self, filter, **kwargs):
+        return await self.count(filter)
+
+    def _insert(self, document):
+        if '_id' not in document:
+            document['_id'] = ObjectId()
+
+        key = self._get_key(document['_id'])
+
+        if key in self._documents:
+            raise DuplicateKeyError(
+                'E11000 duplicate key error collection: {}.{} index: _id_'.format(self.database.name, self.name),
+                DUPLICATE_KEY_ERROR
+            )
+
+        raw = BSON.encode(document)
+        self._documents[key] = (raw, BSON(raw).decode())
+
+    def _update(self, item, update, replace=False):
+        """
+        :return: bool - the document is modified
+        """
+        raw, document = item
+        document = BSON(raw).decode()
+
+        if replace:
+            document = dict(update, _id=document['_id'])
+        else:
+            MemoryUpdate(update).apply(document)
+
+        if document.get('_id') != item[1].get('_id'):
+            raise OperationFailure('Performing an update on the path \'_id\' would modify the immutable field \'_id\'')
+
+        new_raw = BSON.encode(document)
+
+        if new_raw == raw:
+            return False
+
+        self._documents[self._get_key(document['_id'])] = (new_raw, BSON(new_raw).decode())
+        return True
+
+    def _delete(self, item):
+        self._documents.pop(self._get_key(item[1]['_id']), None)
+
+    async def insert_one(self, document, **kwargs):
+        self._insert(document)
+        return InsertOneResult(document['_id'], True)
+
+    async def insert_many(self, documents, ordered=True, **kwargs):
+        documents = list(documents)
+        result = await self.bulk_write([InsertOne(document) for document in documents], ordered=ordered)
+        return InsertManyResult([document['_id'] for document in documents if '_id' in document], result.acknowledged)
+
+    async def find_one_and_update(self, filter, update, return_document=False, **kwargs):
+        items = self._find(filter)[:1]
+
+        if not items:
+            return None
+
+        before = BSON(items[0][0]).decode()
+        self._update(items[0], update)
+
+        return self.get_document(before['_id']) if return_document else before
+
+    async def update_one(self, filter, update, **kwargs):
+        items = self._find(filter)[:1]
+        modified = sum(self._update(item, update) for item in items)
+        return UpdateResult({'n': len(items), 'nModified': modified, 'ok': 1.0}, True)
+
+    async def update_many(self, filter, update, **kwargs):
+        items = self._find(filter)
+        modified = sum(self._update(item, update) for item in items)
+        return UpdateResult({'n': len(items), 'nModified': modified, 'ok': 1.0}, True)
+
+    async def replace_one(self, filter, replacement, **kwargs):
+        items = self._find(filter)[:1]
+        modified = sum(self._update(item, replacement, replace=True) for item in items)
+        return UpdateResult({'n': len(items), 'nModified': modified, 'ok': 1.0}, True)
+
+    async def delete_one(self, filter, **kwargs):
+        items = self._find(filter)[:1]
+
+        for item in items:
+            self._delete(item)
+
+        return DeleteResult({'n': len(items), 'ok': 1.0}, True)
+
+    async def delete_many(self, filter, **kwargs):
+        items = self._find(filter)
+
+        for item in items:
+            self._delete(item)
+
+        return DeleteResult({'n': len(items), 'ok': 1.0}, True)
+
+    async def bulk_write(self, requests, ordered=True, **kwargs):
+        result = {
+            'writeErrors': [], 'writeConcernErrors': [], 'upserted': [],
+            'nInserted': 0, 'nUpserted': 0, 'nMatched': 0, 'nModified': 0, 'nRemoved': 0,
+        }
+
+        for index, request in enumerate(requests):
+            try:
+                self._write(request, result)
+
+            except DuplicateKeyError as e:
+                result['writeErrors'].append({'index': index, 'code': e.code, 'errmsg': str(e), 'op': request._doc})
+
+                if ordered:
+                    break
+
+        if result['writeErrors']:
+            raise BulkWriteError(result)
+
+        return BulkWriteResult(result, True)
+
+    def _write(self, request, result):
+        if isinstance(request, InsertOne):
+            self._insert(request._doc)
+            result['nInserted'] += 1
+
+        elif isinstance(request, (UpdateOne, UpdateMany, ReplaceOne)):
+            items = self._find(request._filter)
+            items = items if isinstance(request, UpdateMany) else items[:1]
+            replace = isinstance(request, ReplaceOne)
+
+            result['nMatched'] += len(items)
+            result['nModified'] += sum(self._update(item, request._doc, replace) for item in items)
+
+        elif isinstance(request, (DeleteOne, DeleteMany)):
+            items = self._find(request._filter)
+            items = items if isinstance(request, DeleteMany) else items[:1]
+
+            for item in items:
+                self._delete(item)
+
+            result['nRemoved'] += len(items)
+
+        else:
+            raise OperationFailure('Unsupported bulk write request: {!r}'.format(request))
+
+    async def drop(self):
+        self._documents.clear()
+
+
+class MemoryDatabase:
+    def __init__(self, name):
+        self.name = name
+        self._collections = {}
+
+    def __getitem__(self, name):
+        collection = self._collections.get(name)
+
+        if collection is None:
+            collection = MemoryCollection(self, name)
+            self._collections[name] = collection
+
+        return collection
+
+    async def drop_collection(self, name):
+        await self[name].drop()
+
+
+class MemoryConnection:
+    """
+    The connection of the memory backend, the databases live in the current process.
+    """
+    host = None
+    port = None
+    database = None
+    options = None
+
+    # {database name: MemoryDatabase}
+    _databases = {}
+
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+    async def get_database(self):
+        database = self._databases.get(self.database)
+
+        if database is None:
+            database = MemoryDatabase(self.database)
+            self._databases[self.database] = database
+
+        return database
+
+
+class MemoryDispatcher(MongoDispatcher):
+    """
+    The dispatcher of the memory backend, it runs the queries without the server:
+
+        DATABASES = {
+            'test_db': {
+                'backend': 'memory',
+                'models': {...},
+            },
+        }
+    """
+    async def find_related(self, lookups, **kwargs):
+        """
+        Find the documents joined with the documents they refer to (see MongoDispatcher.find_related).
+        """
+        params = self._get_find_params(**kwargs)
+        params.pop('batch_size', None)
+
+        if 'projection' in params:
+            params['projection'] = self._get_related_projection(params['projection'], lookups)
+
+        collection = await self.get_collection()
+        database = await self.connection.get_database()
+        documents = await collection.find(**params).to_list(None)
+
+        for document in documents:
+            for path, collection_name in lookups:
+                self._join(document, path, database[collection_name])
+
+        return MemoryCursor(documents)
+
+    @staticmethod
+    def _join(document, path, collection):
+        container = document
+
+        for field_name in path[:-1]:
+            container = container.get(RELATED_PREFIX + field_name)
+
+            if not isinstance(container, dict):
+                return
+
+        reference = container.get(path[-1])
+
+        if isinstance(reference, DBRef):
+            related_document = collection.get_document(reference.id)
+
+            if related_document is not None:
+                container[RELATED_PREFIX + path[-1]] = related_document
@@ -82,24 +82,102 @@ class QueryCompilerVisitor(QNodeVisitor):
         return self.transform_query(self.manager, **query.query)
 
     def transform_query(self, manager, **kwargs):
-        query = {}
+        plan = QueryPlan.get(manager.model, tuple(kwargs))
+        return plan.bind(kwargs.values())
 
-        for field_name, field_value in kwargs.copy().items():
-            operator = None
 
-            # Split query conditions by delimiter and modify it to MongoDB format.
-            if self.delimiter in field_name:
-                field_name, operator = field_name.split(self.delimiter, 1)
+class Param:
+    """
+    Placeholder of the value, that is given on each call of the prepared query.
+    """
+    def __init__(self, name):
+        self.name = name
 
-            declared_fields = manager.model.get_declared_fields()
-            field_instance = declared_fields.get(field_name)
-            operator = 'base' if not operator else operator
-            operator = 'rel' if isinstance(field_instance, BaseRelationField) else operator
+    def __repr__(self):
+        return 'Param({})'.format(self.name)
 
-            condition = Operator().process(operator, field_name, field_value)
-            update(query, condition)
 
-        return query
+class QueryPlan:
+    """
+    Compiled keyword conditions (e.g. `title='News', views__gte=10`) - the template,
+    that is bound to the values without building and visiting the Q tree.
+    The plans are cached by the shape of the query: the model, the conditions and the inversion.
+    """
+    delimiter = '__'
+
+    MAX_SIZE = 1000
+    _plans = {}
+
+    def __init__(self, model, keys, invert=False):
+        """
+        :param model: MongoModel class
+        :param keys: tuple - the conditions, e.g. ('title', 'views__gte')
+        :param invert: bool - the conditions are negated (exclude)
+        """
+        self.keys = keys
+        self.invert = invert
+        self.conditions = [self._get_condition(model, key) for key in keys]
+
+    @classmethod
+    def get(cls, model, keys, invert=False):
+        """
+        Get the cached plan of the query shape, or compile the new one.
+        :return: QueryPlan
+        """
+        shape = (model, keys, invert)
+        plan = cls._plans.get(shape)
+
+        if plan is None:
+            plan = cls(model, keys, invert)
+
+            # The shapes come from the code, the limit only guards against the generated ones
+            if len(cls._plans) >= cls.MAX_SIZE:
+                cls._plans.clear()
+
+            cls._plans[shape] = plan
+
+        return plan
+
+    @classmethod
+    def _get_condition(cls, model, key):
+        """
+        :return: tuple (field name, operator function)
+        """
+        field_name, operator = key, None
+
+        # Split query conditions by delimiter and modify it to MongoDB format.
+        if cls.delimiter in key:
+            field_name, operator = key.split(cls.delimiter, 1)
+
+        field_instance = model.get_declared_fields().get(field_name)
+        operator = 'base' if not operator else operator
+        operator = 'rel' if isinstance(field_instance, BaseRelationField) else operator
+
+        method = getattr(Operator, 'op_{}'.format(operator), None)
+
+        if not callable(method):
+            raise Exception('Unknown condition `{operator}`'.format(operator=operator))
+
+        return field_name, method
+
+    def bind(self, values):
+        """
+        :param values: iterable - the values of the conditions, in the order of the keys
+        :return: dict (MongoDB query)
+        """
+        query = {}
+
+        for (field_name, method), value in zip(self.conditions, values):
+            condition = method(field_name, value)
+
+            # The conditions of the same field (views__gte, views__lte) are merged
+            for key, item in condition.items():
+                if key in query:
+                    update(query, {key: item})
+                else:
+                    query[key] = item
+
+        return QNot.invert(query) if self.invert else query
 
 
 class QNode(object):
@@ -193,7 +271,10 @@ class QNot(QNode):
         return self.to_query(manager)
 
     def to_query(self, manager):
-        query = self.query.to_query(manager)
+        return self.invert(self.query.to_query(manager))
+
+    @staticmethod
+    def invert(query):
         result = {}
 
         for key, value in query.items():
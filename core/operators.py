@@ -1,3 +1,6 @@
+from .expressions import Expression
+
+
 class Operator:
     def process(self, operator, field_name, value):
         method = getattr(self, 'op_{}'.format(operator), None)
@@ -95,3 +98,197 @@ class Operator:
                 '$all': value
             }
         }
+
+
+class UpdateOperator:
+    """
+    Compiles the keyword arguments of QuerySet.update to the update operators.
+    """
+    def process(self, operator, field_name, value):
+        method = getattr(self, 'op_{}'.format(operator), None)
+
+        if not callable(method):
+            raise Exception('Unknown update operator `{operator}`'.format(operator=operator))
+
+        return method(field_name, value)
+
+    @classmethod
+    def is_operator(cls, operator):
+        return callable(getattr(cls, 'op_{}'.format(operator), None))
+
+    @staticmethod
+    def op_set(field_name, value):
+        return {
+            '$set': {
+                field_name: value
+            }
+        }
+
+    @staticmethod
+    def op_unset(field_name, value):
+        return {
+            '$unset': {
+                field_name: ''
+            }
+        }
+
+    @staticmethod
+    def op_inc(field_name, value):
+        return {
+            '$inc': {
+                field_name: value
+            }
+        }
+
+    @staticmethod
+    def op_mul(field_name, value):
+        return {
+            '$mul': {
+                field_name: value
+            }
+        }
+
+    @staticmethod
+    def op_min(field_name, value):
+        return {
+            '$min': {
+                field_name: value
+            }
+        }
+
+    @staticmethod
+    def op_max(field_name, value):
+        return {
+            '$max': {
+                field_name: value
+            }
+        }
+
+    @staticmethod
+    def op_push(field_name, value):
+        return {
+            '$push': {
+                field_name: value
+            }
+        }
+
+    @staticmethod
+    def op_push_all(field_name, value):
+        return {
+            '$push': {
+                field_name: {
+                    '$each': list(value)
+                }
+            }
+        }
+
+    @staticmethod
+    def op_add_to_set(field_name, value):
+        return {
+            '$addToSet': {
+                field_name: value
+            }
+        }
+
+    @staticmethod
+    def op_pull(field_name, value):
+        return {
+            '$pull': {
+                field_name: value
+            }
+        }
+
+    @staticmethod
+    def op_pull_all(field_name, value):
+        return {
+            '$pullAll': {
+                field_name: list(value)
+            }
+        }
+
+    @staticmethod
+    def op_pop(field_name, value):
+        # 1 removes the last item, -1 removes the first one
+        return {
+            '$pop': {
+                field_name: value
+            }
+        }
+
+
+class PipelineUpdateOperator(UpdateOperator):
+    """
+    Compiles the keyword arguments of QuerySet.update to the `$set` stage of the update pipeline.
+    It is used, when the values refer to the fields of the document (F expressions).
+    The update pipeline is supported by MongoDB 4.2+ (and pymongo 3.9+, see requirements.txt).
+    """
+    def process(self, operator, field_name, value):
+        method = getattr(self, 'pipeline_{}'.format(operator), None)
+
+        if not callable(method):
+            raise ValueError(
+                'Update operator `{operator}` can not be combined with F expressions'.format(operator=operator)
+            )
+
+        return method(field_name, Expression.compile(value))
+
+    @staticmethod
+    def _get_field(field_name):
+        return '${}'.format(field_name)
+
+    @staticmethod
+    def pipeline_set(field_name, value):
+        return {
+            '$set': {
+                field_name: value
+            }
+        }
+
+    @staticmethod
+    def pipeline_unset(field_name, value):
+        return {
+            '$set': {
+                field_name: '$$REMOVE'
+            }
+        }
+
+    @classmethod
+    def pipeline_inc(cls, field_name, value):
+        # The missing field is considered to be 0, like $inc does
+        return {
+            '$set': {
+                field_name: {
+                    '$add': [{'$ifNull': [cls._get_field(field_name), 0]}, value]
+                }
+            }
+        }
+
+    @classmethod
+    def pipeline_mul(cls, field_name, value):
+        return {
+            '$set': {
+                field_name: {
+                    '$multiply': [{'$ifNull': [cls._get_field(field_name), 0]}, value]
+                }
+            }
+        }
+
+    @classmethod
+    def pipeline_min(cls, field_name, value):
+        return {
+            '$set': {
+                field_name: {
+                    '$min': [cls._get_field(field_name), value]
+                }
+            }
+        }
+
+    @classmethod
+    def pipeline_max(cls, field_name, value):
+        return {
+            '$set': {
+                field_name: {
+                    '$max': [cls._get_field(field_name), value]
+                }
+            }
+        }
@@ -1,6 +1,28 @@
+import copy
+import asyncio
+import inspect
+from collections import namedtuple
+
 from .utils import update
-from .node import Q, QNode, QNot, QCombination
-from pymongo import DESCENDING, ASCENDING, InsertOne
+from .node import Q, QNode, QNot, QCombination, QueryPlan, Param
+from .fields import BaseRelationField, BaseBackwardRelationField, OneToOneBackward
+from .exceptions import DoesNotExist, MultipleObjectsReturned
+from .managers import RelationChecker
+from .operators import UpdateOperator, PipelineUpdateOperator
+from .expressions import Expression
+from .identity import IdentityMap
+from .constants import DOCUMENT, ODM_OBJECT, VALUES_TUPLE, FLAT_VALUE, RELATED_PREFIX, CREATE
+from bson import ObjectId, DBRef
+from pymongo import DESCENDING, ASCENDING, UpdateOne
+from pymongo.errors import BulkWriteError
+
+
+BulkUpdateResult = namedtuple('BulkUpdateResult', ['matched_count', 'modified_count'])
+
+
+async def _to_async_iterator(iterable):
+    for item in iterable:
+        yield item
 
 
 class InternalQuery:
@@ -11,8 +33,8 @@ class InternalQuery:
         insert_result = await self.queryset.model.get_dispatcher().create(**kwargs)
         return insert_result
 
-    async def update_one(self, document_id, **kwargs):
-        result = await self.queryset.model.get_dispatcher().update_one(document_id, **kwargs)
+    async def update_one(self, document_id, update):
+        result = await self.queryset.model.get_dispatcher().update_one(document_id, update)
         return result
 
     async def delete_one(self, **kwargs):
@@ -23,6 +45,13 @@ class InternalQuery:
 class QuerySet:
     model = None
 
+    # Documents fetched by one round trip during the iteration
+    DEFAULT_BATCH_SIZE = 100
+
+    # Documents inserted by one round trip and the round trips in flight during bulk_create
+    DEFAULT_BULK_BATCH_SIZE = 1000
+    DEFAULT_BULK_CONCURRENCY = 4
+
     def __init__(self, **kwargs):
         # TODO: aggregate
         self.internal_query = InternalQuery(self)
@@ -34,6 +63,17 @@ class QuerySet:
         self._limit = None
         self._skip = None
         self._cursor = None
+
+        # What is produced from the documents (see values/values_list)
+        self._produce = ODM_OBJECT
+        self._produce_fields = ()
+        self._produce_external = False
+
+        # Tree of the relation fields to join: {'author': {'profile': {}}}
+        self._select_related = {}
+
+        # Tree of the relation fields to load by separate batched queries: {'posts': {'comments': {}}}
+        self._prefetch_related = {}
         self.__dict__.update(**kwargs)
 
     def all(self):
@@ -41,11 +81,45 @@ class QuerySet:
         return self
 
     async def get(self, **kwargs):
+        identity_map = self._get_identity_map()
+
+        # The known instance is given without a query
+        if identity_map is not None and not self._find and list(kwargs) == ['_id']:
+            odm_object = identity_map.get(self.model, kwargs['_id'])
+
+            if odm_object is not None:
+                return odm_object
+
+        if self._is_select_related:
+            return await self._get_related(**kwargs)
+
         get_kwargs = self._to_query(**kwargs)
         result = await self.model.get_dispatcher().get(self._projection, **get_kwargs)
         odm_object = self._to_object(result)
+
+        if self._is_prefetch_related:
+            await self._prefetch_related_objects([odm_object])
+
         return odm_object
 
+    async def _get_related(self, **kwargs):
+        """
+        Get the single object with the joined relations.
+        As in `get`, only the given conditions are applied, the queryset is not changed.
+        """
+        queryset = self._clone()
+        queryset._find = self._to_query(**kwargs)
+        queryset._sort, queryset._skip, queryset._limit = [], None, 2
+        objects = await queryset._to_list()
+
+        if not objects:
+            raise DoesNotExist('Document does not exists!')
+
+        elif len(objects) > 1:
+            raise MultipleObjectsReturned('Got more than 1 document')
+
+        return objects[0]
+
     def filter(self, *args, **kwargs):
         self._find = update(self._find, self._to_query(*args, **kwargs))
         return self
@@ -54,6 +128,33 @@ class QuerySet:
         self._find = update(self._find, self._to_query(*args, invert=True, **kwargs))
         return self
 
+    def prepare(self, **kwargs):
+        """
+        Compile the conditions of the hot query once, the values of `Param` are given on each call.
+        The other settings of the queryset (sort, only, limit, ...) are kept.
+
+            popular = Post.objects.sort('-views').prepare(author=Param('author'), views__gte=10)
+            posts = await popular(author=author)
+
+        :param kwargs: dict - the conditions, the same as for `filter`
+        :return: PreparedQuery
+        """
+        return PreparedQuery(self, kwargs)
+
+    def _clone(self):
+        queryset = self.__class__.__new__(self.__class__)
+        queryset.__dict__.update(self.__dict__)
+        queryset.internal_query = InternalQuery(queryset)
+        queryset._cursor = None
+
+        queryset._projection = dict(self._projection)
+        queryset._sort = list(self._sort)
+        queryset._find = copy.deepcopy(self._find) if self._find else {}
+        queryset._select_related = copy.deepcopy(self._select_related) if self._select_related else {}
+        queryset._prefetch_related = copy.deepcopy(self._prefetch_related) if self._prefetch_related else {}
+
+        return queryset
+
     def sort(self, *args):
         # If not specified in queryset - take from meta
         args = args if args else self.model.get_sorting()
@@ -77,9 +178,9 @@ class QuerySet:
         if not self.model.has_backwards:
             result = await self.model.get_dispatcher().delete_many(**self._find)
         else:
-            async for document in await self.cursor:
-                odm_object = self._to_object(document)
-                await odm_object.delete()
+            async for documents in self._iterate_batches(self.DEFAULT_BATCH_SIZE, prefetch=False):
+                for odm_object in self.model.get_decoder().decode_many(documents):
+                    await odm_object.delete()
 
         return result
 
@@ -93,9 +194,44 @@ class QuerySet:
         return document
 
     async def update(self, **kwargs):
-        result = await self.model.get_dispatcher().update_many(self._find, **kwargs)
+        """
+        Update the documents on the server side, in one round trip.
+        The operator follows the name of the field (`$set` by default):
+            update(views__inc=1, tags__push='python', rating__max=10, data__count__inc=1)
+        The values may refer to the fields of the document by F expressions
+        (they are sent as the update pipeline, MongoDB 4.2+ is needed):
+            update(rating=F('likes') - F('dislikes'))
+        :return: UpdateResult
+        """
+        update_document = self._compile_update(**kwargs)
+        result = await self.model.get_dispatcher().update_many(self._find, update_document)
         return result
 
+    def _compile_update(self, **kwargs):
+        """
+        Compile the keyword arguments to the update document,
+        or to the update pipeline, if F expressions are used.
+        """
+        is_pipeline = any(isinstance(value, Expression) for value in kwargs.values())
+        operator = PipelineUpdateOperator() if is_pipeline else UpdateOperator()
+        declared_fields = self.model.get_declared_fields()
+        update_document = {}
+
+        for key, value in kwargs.items():
+            parts = key.split('__')
+            operator_name = parts.pop() if len(parts) > 1 and UpdateOperator.is_operator(parts[-1]) else 'set'
+            field_instance = declared_fields.get(parts[0])
+
+            # Relations are stored as DBRef
+            if len(parts) == 1 and isinstance(field_instance, BaseRelationField) and value is not None \
+                    and not isinstance(value, Expression):
+                value = DBRef(field_instance.relation.get_collection_name(), getattr(value, 'id', value))
+
+            condition = operator.process(operator_name, '.'.join(parts), value)
+            update(update_document, condition)
+
+        return [update_document] if is_pipeline else update_document
+
     def fields(self, **kwargs):
         available_operators = ('slice',)
 
@@ -119,17 +255,440 @@ class QuerySet:
         self.fields(**{field_name: True for field_name in args})
         return self
 
-    async def bulk_create(self, *args):
-        documents = []
+    def select_related(self, *args):
+        """
+        Load the objects of ForeignKey/OneToOne fields by the same query.
+        :param args: names of the relation fields, nested by `__`, e.g. `author__profile`
+        """
+        for path in args:
+            self._add_related_path(self._select_related, path, (BaseRelationField,), 'select_related')
+
+        return self
+
+    def prefetch_related(self, *args):
+        """
+        Load the related objects by one extra query per relation for the whole result.
+        :param args: names of the relation (backward) fields, nested by `__`, e.g. `posts__comments`
+        """
+        for path in args:
+            relation_types = (BaseRelationField, BaseBackwardRelationField)
+            self._add_related_path(self._prefetch_related, path, relation_types, 'prefetch_related')
+
+        return self
+
+    def _add_related_path(self, tree, path, relation_types, method_name):
+        model = self.model
+
+        for field_name in path.split('__'):
+            field_instance = model.get_declared_fields().get(field_name)
+
+            if not isinstance(field_instance, relation_types):
+                raise ValueError(
+                    'Invalid field name \'{field_name}\' in {method_name}: '
+                    'it is not a relation field of \'{model_name}\'.'.format(
+                        field_name=field_name,
+                        method_name=method_name,
+                        model_name=model.__name__
+                    )
+                )
+
+            model, tree = field_instance.relation, tree.setdefault(field_name, {})
+
+    @property
+    def _is_select_related(self):
+        return bool(self._select_related) and self._produce is ODM_OBJECT
+
+    def _get_lookups(self, model=None, tree=None, path=()):
+        """
+        Get the list of (path, collection_name) to join, parents first.
+        """
+        model = model or self.model
+        tree = self._select_related if tree is None else tree
+        lookups = []
+
+        for field_name, children in tree.items():
+            relation = model.get_declared_fields().get(field_name).relation
+            lookups.append((path + (field_name,), relation.get_collection_name()))
+            lookups += self._get_lookups(relation, children, path + (field_name,))
+
+        return lookups
+
+    def _decode_related(self, model, document, tree, identity_map=None):
+        """
+        Create the model instance and fill in its relation proxies by the joined documents.
+        """
+        related_documents = {
+            field_name: document.pop(RELATED_PREFIX + field_name, None)
+            for field_name in tree
+        }
+
+        if identity_map is not None:
+            odm_object = identity_map.decode(model, document)
+        else:
+            odm_object = model.get_decoder().decode(document)
+
+        for field_name, children in tree.items():
+            related_document = related_documents[field_name]
+
+            # The referred document does not exist (or the reference is not set)
+            if not isinstance(related_document, dict) or '_id' not in related_document:
+                continue
+
+            relation = model.get_declared_fields().get(field_name).relation
+            # The joined documents are complete
+            related_object = self._decode_related(relation, related_document, children, IdentityMap.get_current())
+
+            try:
+                getattr(odm_object, field_name).set_result(related_object)
+            except AttributeError:
+                # The reference is excluded by the projection
+                pass
+
+        return odm_object
+
+    @property
+    def _is_prefetch_related(self):
+        return bool(self._prefetch_related) and self._produce is ODM_OBJECT
+
+    async def _prefetch_related_objects(self, odm_objects, model=None, tree=None):
+        """
+        Fill in the relation proxies of the objects by one query per relation.
+        """
+        model = model or self.model
+        tree = self._prefetch_related if tree is None else tree
+
+        for field_name, children in tree.items():
+            field_instance = model.get_declared_fields().get(field_name)
+
+            if isinstance(field_instance, BaseBackwardRelationField):
+                related_objects = await self._prefetch_backward(odm_objects, field_name, field_instance)
+            else:
+                related_objects = await self._prefetch_forward(odm_objects, field_name, field_instance)
+
+            if children and related_objects:
+                await self._prefetch_related_objects(related_objects, field_instance.relation, children)
+
+    @staticmethod
+    async def _prefetch_backward(odm_objects, field_name, field_instance):
+        relation_field_name = field_instance.get_field_name()
+        ids = [odm_object._id for odm_object in odm_objects if odm_object._id is not None]
+
+        if not ids:
+            return []
+
+        related_objects = await field_instance.relation.objects.raw_query({
+            '{}.$id'.format(relation_field_name): {'$in': ids}
+        })
+
+        # Group the referring objects by the id of the referred one
+        grouped = {}
+
+        for related_object in related_objects:
+            reference = related_object._get_value(relation_field_name)
+            grouped.setdefault(getattr(reference, 'id', reference), []).append(related_object)
+
+        for odm_object in odm_objects:
+            group = grouped.get(odm_object._id, [])
+
+            if isinstance(field_instance, OneToOneBackward):
+                # Missing object raises DoesNotExist on await as usual
+                if group:
+                    getattr(odm_object, field_name).set_result(group[0])
+            else:
+                getattr(odm_object, field_name).set_result(group)
+
+        return related_objects
+
+    @staticmethod
+    async def _prefetch_forward(odm_objects, field_name, field_instance):
+        proxies = []
+
+        for odm_object in odm_objects:
+            try:
+                proxy = getattr(odm_object, field_name)
+            except AttributeError:
+                # The reference is excluded by the projection
+                continue
+
+            if not proxy.is_resolved and proxy.key is not None:
+                proxies.append(proxy)
+
+        if not proxies:
+            return []
+
+        ids = list({proxy.key for proxy in proxies})
+        related_objects = await field_instance.relation.objects.filter(_id__in=ids)
+        related_by_id = {related_object._id: related_object for related_object in related_objects}
+
+        for proxy in proxies:
+            if proxy.key in related_by_id:
+                proxy.set_result(related_by_id[proxy.key])
+
+        return related_objects
+
+    def values(self, *args, external=False):
+        """
+        Produce the documents as dicts, without the model instantiation.
+        :param args: names of the fields (all fields if not specified)
+        :param external: bool - convert the values by `to_external_value` of the fields
+        """
+        return self._set_produce(DOCUMENT, args, external)
+
+    def values_list(self, *args, flat=False, external=False):
+        """
+        Produce the documents as tuples, without the model instantiation.
+        :param args: names of the fields (all fields if not specified)
+        :param flat: bool - produce the value of the single field instead of tuple
+        :param external: bool - convert the values by `to_external_value` of the fields
+        """
+        if flat and len(args) != 1:
+            raise TypeError('\'flat\' is valid only for values_list with a single field')
+
+        return self._set_produce(FLAT_VALUE if flat else VALUES_TUPLE, args, external)
+
+    def _set_produce(self, produce, fields, external):
+        self._produce = produce
+        self._produce_fields = fields
+        self._produce_external = external
+
+        if fields:
+            self.only(*fields)
+
+            if '_id' not in fields:
+                self._projection['_id'] = False
+
+        return self
+
+    async def bulk_create(self, *args, batch_size=None, ordered=False, concurrency=None, check_relations=True):
+        """
+        Insert the documents by batches, several batches are written at the same time.
+        The inserted ids are set to the objects (the failed objects are left without `_id`).
+        :param args: MongoModel instances, or an iterable (async iterable) of them
+        :param batch_size: int - documents inserted by one round trip
+        :param ordered: bool - stop on the first failed document (the batches are written one by one)
+        :param concurrency: int - batches written at the same time
+        :param check_relations: bool - check the existence of the related documents
+        :return: int - number of the inserted documents
+        """
+        objects = args[0] if len(args) == 1 and not isinstance(args[0], self.model) else args
+
+        async def prepare(batch):
+            return await self._get_internal_documents(batch, check_relations)
+
+        async def write(batch, documents):
+            return await self._insert_objects(batch, documents, ordered)
+
+        results = await self._write_batches(objects, batch_size, ordered, concurrency, prepare, write)
+
+        return sum(results)
+
+    async def bulk_update(self, objects, fields=None, batch_size=None, ordered=False, concurrency=None,
+                          check_relations=True):
+        """
+        Update the modified fields of the objects by batches of UpdateOne requests.
+        The objects without changes are skipped.
+        :param objects: MongoModel instances, or an iterable (async iterable) of them
+        :param fields: list - names of the fields to update (all modified fields if not specified)
+        :param batch_size: int - documents updated by one round trip
+        :param ordered: bool - stop on the first failed document (the batches are written one by one)
+        :param concurrency: int - batches written at the same time
+        :param check_relations: bool - check the existence of the related documents
+        :return: BulkUpdateResult
+        """
+        async def prepare(batch):
+            return await self._get_updates(batch, fields, check_relations)
+
+        async def write(batch, updates):
+            return await self._update_objects(updates, ordered)
+
+        results = await self._write_batches(objects, batch_size, ordered, concurrency, prepare, write)
 
-        for index, document in enumerate(args):
-            internal_values = await document.get_internal_values()
+        return BulkUpdateResult(
+            matched_count=sum(result.matched_count for result in results),
+            modified_count=sum(result.modified_count for result in results)
+        )
 
-            # Wrap each document with InsertOne
-            document = InsertOne(internal_values)
+    async def _write_batches(self, objects, batch_size, ordered, concurrency, prepare, write):
+        """
+        Prepare the batches of the objects one by one and write them concurrently.
+        :param prepare: coroutine function(batch) - returns the requests of the batch
+        :param write: coroutine function(batch, requests) - returns the result of the batch
+        :return: list - results of the batches
+        """
+        batch_size = batch_size or self.DEFAULT_BULK_BATCH_SIZE
+        concurrency = 1 if ordered else concurrency or self.DEFAULT_BULK_CONCURRENCY
+
+        results = []
+        pending = set()
+
+        try:
+            async for batch in self._get_batches(objects, batch_size):
+                requests = await prepare(batch)
+
+                # Wait for a free slot
+                while len(pending) >= concurrency:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    results.extend(self._get_results(done))
+
+                pending.add(asyncio.ensure_future(write(batch, requests)))
+
+            if pending:
+                done, pending = await asyncio.wait(pending)
+                results.extend(self._get_results(done))
+
+        finally:
+            # Let the batches in flight complete on error, their objects get the values
+            if pending:
+                done, _ = await asyncio.wait(pending)
+
+                for task in done:
+                    task.exception()
+
+        return results
+
+    @staticmethod
+    async def _get_batches(objects, batch_size):
+        batch = []
+
+        if not hasattr(objects, '__aiter__'):
+            objects = _to_async_iterator(objects)
+
+        async for obj in objects:
+            batch.append(obj)
+
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+
+        if batch:
+            yield batch
+
+    async def _get_internal_documents(self, objects, check_relations):
+        """
+        Convert the objects to the documents to insert, with the generated `_id`.
+        :return: list of dicts
+        """
+        relation_checker = RelationChecker() if check_relations else None
+        documents = []
+
+        for obj in objects:
+            obj._action = CREATE
+            document = await obj.get_internal_values(relation_checker=relation_checker)
+            document['_id'] = obj._id or ObjectId()
             documents.append(document)
 
-        await self.model.get_dispatcher().bulk_create(documents)
+        # The references of the batch are checked at once
+        if relation_checker is not None:
+            await relation_checker.check()
+
+        return documents
+
+    async def _insert_objects(self, objects, documents, ordered):
+        """
+        Insert the batch and set the values of the inserted documents to the objects.
+        :return: int - number of the inserted documents
+        """
+        try:
+            await self.model.get_dispatcher().bulk_create(documents, ordered=ordered)
+
+        except BulkWriteError as e:
+            failed = self._get_failed_indexes(e, len(documents), ordered)
+            self._set_inserted(objects, documents, failed)
+            raise
+
+        return self._set_inserted(objects, documents)
+
+    def _set_inserted(self, objects, documents, failed=()):
+        inserted_ids = []
+
+        for index, (obj, document) in enumerate(zip(objects, documents)):
+            obj._action = None
+
+            if index not in failed:
+                obj.set_inserted(document)
+                inserted_ids.append(document['_id'])
+
+        RelationChecker.remember(self.model, inserted_ids)
+
+        return len(inserted_ids)
+
+    async def _get_updates(self, objects, fields, check_relations):
+        """
+        Build the update documents of the modified objects.
+        :return: list of tuples - (object, update document)
+        """
+        relation_checker = RelationChecker() if check_relations else None
+        updates = []
+
+        for obj in objects:
+            if obj.id is None:
+                raise ValueError('All bulk_update() objects must be saved.')
+
+            update = await obj.get_update(fields, relation_checker)
+
+            if update is not None:
+                updates.append((obj, update))
+            else:
+                obj._action = None
+
+        # The references of the batch are checked at once
+        if relation_checker is not None:
+            await relation_checker.check()
+
+        return updates
+
+    async def _update_objects(self, updates, ordered):
+        """
+        Write the update documents and apply them to the objects.
+        :return: BulkUpdateResult
+        """
+        if not updates:
+            return BulkUpdateResult(matched_count=0, modified_count=0)
+
+        requests = [UpdateOne({'_id': obj.id}, update) for obj, update in updates]
+
+        try:
+            result = await self.model.get_dispatcher().bulk_write(requests, ordered=ordered)
+
+        except BulkWriteError as e:
+            failed = self._get_failed_indexes(e, len(requests), ordered)
+
+            for index, (obj, update) in enumerate(updates):
+                if index not in failed:
+                    obj.set_updated(update)
+
+            raise
+
+        for obj, update in updates:
+            obj.set_updated(update)
+
+        return BulkUpdateResult(matched_count=result.matched_count, modified_count=result.modified_count)
+
+    @staticmethod
+    def _get_failed_indexes(error, count, ordered):
+        """
+        Get the indexes of the requests, that were not written.
+        :param error: BulkWriteError
+        :param count: int - number of the requests
+        :param ordered: bool
+        :return: set
+        """
+        failed = {write_error['index'] for write_error in error.details.get('writeErrors', [])}
+
+        # The requests after the first error are not written
+        if ordered and failed:
+            failed = set(range(min(failed), count))
+
+        return failed
+
+    @staticmethod
+    def _get_results(tasks):
+        errors = [task.exception() for task in tasks if task.exception() is not None]
+
+        if errors:
+            raise errors[0]
+
+        return [task.result() for task in tasks]
 
     def _recursive_invert(self, q_item):
         """
@@ -161,6 +720,10 @@ class QuerySet:
         """
         raw_query = {}
 
+        # The keyword conditions are bound to the cached plan of the query shape
+        if kwargs and not args:
+            return QueryPlan.get(self.model, tuple(kwargs), invert).bind(kwargs.values())
+
         if kwargs or args:
             q_args = args[0] if len(args) == 1 and isinstance(args[0], QNode) else None
             q_kwargs = Q(**kwargs)
@@ -187,8 +750,65 @@ class QuerySet:
 
         return raw_query
 
+    def _get_identity_map(self):
+        """
+        Get the identity map of the current context, if the query gives the complete instances.
+        """
+        if self._produce is not ODM_OBJECT or self._projection:
+            return None
+
+        return IdentityMap.get_current()
+
     def _to_object(self, document):
-        return self.model(**document)
+        identity_map = self._get_identity_map()
+
+        if self._is_select_related:
+            return self._decode_related(self.model, document, self._select_related, identity_map)
+
+        if identity_map is not None:
+            return identity_map.decode(self.model, document)
+
+        if self._produce is ODM_OBJECT:
+            return self.model.get_decoder().decode(document)
+
+        if self._produce_external:
+            document = self.model.get_decoder().to_external(document)
+
+        if not self._produce_fields:
+            return document if self._produce is DOCUMENT else tuple(document.values())
+
+        values = [self._get_path_value(document, field_name) for field_name in self._produce_fields]
+
+        if self._produce is DOCUMENT:
+            return dict(zip(self._produce_fields, values))
+
+        return tuple(values) if self._produce is VALUES_TUPLE else values[0]
+
+    def _to_objects(self, documents):
+        if self._produce is ODM_OBJECT and not self._is_select_related:
+            identity_map = self._get_identity_map()
+
+            if identity_map is not None:
+                return identity_map.decode_many(self.model, documents)
+
+            return self.model.get_decoder().decode_many(documents)
+
+        return [self._to_object(document) for document in documents]
+
+    @staticmethod
+    def _get_path_value(document, path):
+        """
+        Get the value of the (nested) field, e.g. `data__key`.
+        """
+        value = document
+
+        for key in path.split('__'):
+            if not isinstance(value, dict):
+                return None
+
+            value = value.get(key)
+
+        return value
 
     def __getitem__(self, item):
         if isinstance(item, slice):
@@ -204,29 +824,133 @@ class QuerySet:
     @property
     async def cursor(self):
         if not self._cursor:
-            self._cursor = await self.model.get_dispatcher().find(
-                sort=self._sort,
-                limit=self._limit,
-                skip=self._skip,
-                filter=self._find,
-                projection=self._projection
-            )
+            self._cursor = await self._get_cursor()
         return self._cursor
 
+    def _get_find_params(self, **kwargs):
+        return dict(
+            sort=self._sort,
+            limit=self._limit,
+            skip=self._skip,
+            filter=self._find,
+            projection=self._projection,
+            **kwargs
+        )
+
+    async def _get_cursor(self, **kwargs):
+        params = self._get_find_params(**kwargs)
+
+        if self._is_select_related:
+            return await self.model.get_dispatcher().find_related(self._get_lookups(), **params)
+
+        cursor = await self.model.get_dispatcher().find(**params)
+        return cursor
+
     async def _to_list(self):
-        res = [self._to_object(document) async for document in await self.cursor]
-        self._cursor = None
-        return res
+        if self._is_select_related or self._cursor:
+            documents = await (await self.cursor).to_list(None)
+            self._cursor = None
+        else:
+            # Read through the query cache
+            documents = await self.model.get_dispatcher().find_list(**self._get_find_params())
+        odm_objects = self._to_objects(documents)
 
-    def __aiter__(self):
-        return self
+        if self._is_prefetch_related:
+            await self._prefetch_related_objects(odm_objects)
 
-    # TODO: Test it!
-    async def __anext__(self):
-        async for document in await self.cursor:
-            odm_object = self._to_object(document)
-            return odm_object
-        raise StopAsyncIteration()
+        return odm_objects
+
+    def iterator(self, batch_size=DEFAULT_BATCH_SIZE, prefetch=True):
+        """
+        Stream the results through a single cursor, keeping at most two batches in memory.
+        :param batch_size: int - number of documents fetched by one round trip
+        :param prefetch: bool - fetch the next batch while the current one is consumed
+        :return: async iterator
+        """
+        return self._iterate(batch_size, prefetch)
+
+    async def _iterate(self, batch_size, prefetch):
+        async for documents in self._iterate_batches(batch_size, prefetch):
+            odm_objects = self._to_objects(documents)
+
+            if self._is_prefetch_related:
+                await self._prefetch_related_objects(odm_objects)
+
+            for odm_object in odm_objects:
+                yield odm_object
+
+    async def _iterate_batches(self, batch_size, prefetch):
+        cursor = await self._get_cursor(batch_size=batch_size)
+        next_batch = None
+
+        try:
+            documents = await cursor.to_list(batch_size)
+
+            while documents:
+                if prefetch:
+                    next_batch = asyncio.ensure_future(cursor.to_list(batch_size))
+
+                yield documents
+
+                documents = await next_batch if prefetch else await cursor.to_list(batch_size)
+                next_batch = None
+        finally:
+            # The iteration is interrupted
+            if next_batch is not None:
+                next_batch.cancel()
+
+            closed = cursor.close()
+
+            if inspect.isawaitable(closed):
+                await closed
+
+    def __aiter__(self):
+        return self.iterator()
 
     def __await__(self):
         return self._to_list().__await__()
+
+
+class PreparedQuery:
+    """
+    The queryset with the compiled conditions, see QuerySet.prepare.
+    """
+    def __init__(self, queryset, conditions):
+        """
+        :param queryset: QuerySet - the template
+        :param conditions: dict - the conditions with the `Param` placeholders
+        """
+        self.queryset = queryset
+        self.plan = QueryPlan.get(queryset.model, tuple(conditions))
+        self.values = list(conditions.values())
+
+        # list of tuples (index of the value, name of the param)
+        self.params = [
+            (index, value.name)
+            for index, value in enumerate(self.values)
+            if isinstance(value, Param)
+        ]
+
+    def __call__(self, **params):
+        """
+        Bind the values of the params.
+        :return: QuerySet
+        """
+        unknown = set(params) - {name for _, name in self.params}
+
+        if unknown:
+            raise ValueError('Unknown params: {}'.format(', '.join(sorted(unknown))))
+
+        values = list(self.values)
+
+        for index, name in self.params:
+            if name not in params:
+                raise ValueError('The value of the `{}` param is not given'.format(name))
+
+            values[index] = params[name]
+
+        queryset = self.queryset._clone()
+        query = self.plan.bind(values)
+        queryset._find = update(queryset._find, query) if queryset._find else query
+
+        return queryset
@@ -0,0 +1,235 @@
+from contextvars import ContextVar
+
+from bson import ObjectId
+from pymongo import InsertOne, UpdateOne, DeleteOne
+from pymongo.errors import BulkWriteError
+
+from .constants import CREATE
+from .managers import OnDeleteManager, RelationChecker
+from .identity import IdentityMap
+
+_current_session = ContextVar('session', default=None)
+
+SAVE, DELETE = range(2)
+
+
+class Session:
+    """
+    Unit of work: `save()` and `delete()` of the models are queued and written on exit,
+    by one ordered bulk_write per collection.
+    The queued operations are discarded, if the block raises an exception.
+
+        async with session():
+            author = Author(username='Ivan')
+            await author.save()
+            await Post(title='News', author=author).save()
+    """
+    def __init__(self):
+        # list of tuples - (operation, model instance, check_relations)
+        self._operations = []
+        self._token = None
+
+    @staticmethod
+    def get_current():
+        """
+        Get the session of the current context.
+        :return: Session or None
+        """
+        return _current_session.get()
+
+    async def __aenter__(self):
+        self._token = _current_session.set(self)
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        _current_session.reset(self._token)
+
+        if exc_type is None:
+            await self.flush()
+        else:
+            self.clear()
+
+    def add(self, obj, check_relations=True):
+        """
+        Queue saving of the model instance.
+        The values are taken at the moment of the flush.
+        """
+        self._operations.append((SAVE, obj, check_relations))
+
+    def delete(self, obj):
+        """
+        Queue deleting of the model instance.
+        """
+        self._operations.append((DELETE, obj, False))
+
+    def clear(self):
+        self._operations = []
+
+    async def flush(self):
+        """
+        Write the queued operations.
+        The documents are converted (and the relations are checked) before any write,
+        the backward relations of the deleted documents are handled after it.
+        """
+        operations, self._operations = self._operations, []
+        operations = self._get_unique(operations)
+
+        # The new objects get the ids at once, so the objects of the session can refer to each other
+        created = [obj for operation, obj, _ in operations if operation is SAVE and obj.id is None]
+
+        for obj in created:
+            obj._id = ObjectId()
+
+        # The objects, which documents are deleted by the writes
+        deleted = []
+
+        try:
+            batches = await self._get_batches(operations, {obj.id for obj in created}, deleted)
+
+            try:
+                for dispatcher, requests in batches.items():
+                    await self._write(dispatcher, requests)
+
+            finally:
+                await self._handle_backwards(deleted)
+
+        finally:
+            # The ids of the objects, that were not inserted, are removed
+            for obj in created:
+                if obj._snapshot is None:
+                    obj._id = None
+                    obj._action = None
+
+    @staticmethod
+    def _get_unique(operations):
+        """
+        Skip the repeated saves of the same object.
+        """
+        saved = set()
+        unique_operations = []
+
+        for operation in operations:
+            kind, obj, _ = operation
+
+            if kind is SAVE:
+                if id(obj) in saved:
+                    continue
+
+                saved.add(id(obj))
+
+            unique_operations.append(operation)
+
+        return unique_operations
+
+    async def _get_batches(self, operations, created_ids, deleted):
+        """
+        Get the requests of the operations, grouped by the dispatcher.
+        :param deleted: list - the deleted objects are added to it on success
+        :return: dict - `key` is MongoDispatcher, `value` is a list of tuples (request, function on success)
+        """
+        relation_checker = RelationChecker(known_ids=created_ids)
+        batches = {}
+
+        for kind, obj, check_relations in operations:
+            checker = relation_checker if check_relations else None
+            requests = batches.setdefault(obj.get_dispatcher(), [])
+
+            if kind is DELETE:
+                request = self._get_delete_request(obj, deleted)
+            elif obj.id in created_ids:
+                request = await self._get_insert_request(obj, checker)
+            else:
+                request = await self._get_update_request(obj, checker)
+
+            if request is not None:
+                requests.append(request)
+
+        await relation_checker.check()
+
+        return batches
+
+    @staticmethod
+    async def _get_insert_request(obj, relation_checker):
+        obj._action = CREATE
+        document = await obj.get_internal_values(relation_checker=relation_checker)
+        document['_id'] = obj.id
+
+        def on_success():
+            obj.set_inserted(document)
+            RelationChecker.remember(obj.__class__, [obj.id])
+
+        return InsertOne(document), on_success
+
+    @staticmethod
+    async def _get_update_request(obj, relation_checker):
+        update = await obj.get_update(relation_checker=relation_checker)
+
+        if update is None:
+            obj._action = None
+            return None
+
+        def on_success():
+            obj.set_updated(update)
+
+        return UpdateOne({'_id': obj.id}, update), on_success
+
+    @staticmethod
+    def _get_delete_request(obj, deleted):
+        if obj.id is None:
+            return None
+
+        def on_success():
+            RelationChecker.forget(obj.__class__, [obj.id])
+            identity_map = IdentityMap.get_current()
+
+            if identity_map is not None:
+                identity_map.discard(obj)
+
+            # The id is removed after the backward relations are handled
+            deleted.append(obj)
+
+        return DeleteOne({'_id': obj.id}), on_success
+
+    @staticmethod
+    async def _handle_backwards(deleted):
+        """
+        Handle the backward relations (on_delete) of the deleted documents.
+        """
+        try:
+            objects = [obj for obj in deleted if obj.has_backwards]
+
+            if objects:
+                await OnDeleteManager().handle_backwards(objects)
+
+        finally:
+            # Remove document id from the ODM objects
+            for obj in deleted:
+                obj._id = None
+
+    @staticmethod
+    async def _write(dispatcher, requests):
+        if not requests:
+            return
+
+        try:
+            await dispatcher.bulk_write([request for request, _ in requests], ordered=True)
+
+        except BulkWriteError as e:
+            # The requests before the first error are written
+            written = min(write_error['index'] for write_error in e.details.get('writeErrors', [{'index': 0}]))
+
+            for _, on_success in requests[:written]:
+                on_success()
+
+            raise
+
+        for _, on_success in requests:
+            on_success()
+
+
+def session():
+    """
+    Start the unit of work in the current context.
+    :return: Session
+    """
+    return Session()
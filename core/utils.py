@@ -1,4 +1,6 @@
-import collections
+import os
+import importlib
+import collections.abc
 
 
 class classproperty(object):
@@ -11,9 +13,63 @@ class classproperty(object):
 
 def update(d, u):
     for k, v in u.items():
-        if isinstance(v, collections.Mapping):
+        if isinstance(v, collections.abc.Mapping):
             r = update(d.get(k, {}), v)
             d[k] = r
         else:
             d[k] = u[k]
     return d
+
+
+def freeze(value):
+    """
+    Get the hashable representation of the value (e.g. of a query).
+    The order of the dict keys is kept - it matters for the embedded documents.
+    The booleans are kept apart from the equal numbers (True == 1), MongoDB does not match them.
+    """
+    if isinstance(value, bool):
+        return bool, value
+
+    if isinstance(value, dict):
+        return dict, tuple((key, freeze(item)) for key, item in value.items())
+
+    if isinstance(value, (list, tuple)):
+        return list, tuple(freeze(item) for item in value)
+
+    return value
+
+
+def copy_value(value):
+    """
+    Copy the dicts and the lists of the value (e.g. of a document), the other values are kept.
+    The copy does not change with the in-place changes of the value.
+    """
+    if isinstance(value, dict):
+        value = dict(value)
+
+        for key, item in value.items():
+            if isinstance(item, (dict, list)):
+                value[key] = copy_value(item)
+
+    elif isinstance(value, list):
+        value = list(value)
+
+        for index, item in enumerate(value):
+            if isinstance(item, (dict, list)):
+                value[index] = copy_value(item)
+
+    return value
+
+
+def get_settings():
+    """
+    Import the settings module, specified by the ODM_SETTINGS_MODULE environment variable.
+    """
+    settings_module = os.environ.get('ODM_SETTINGS_MODULE')
+
+    if not settings_module:
+        raise ImportError(
+            'Specify an \'ODM_SETTINGS_MODULE\' variable in the environment.'
+        )
+
+    return importlib.import_module(settings_module)
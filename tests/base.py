@@ -41,3 +41,24 @@ class BaseAsyncTestCase(unittest.TestCase):
 
             return self._function_cache[item]
         return attr
+
+    def spy(self, model, method_name, record=None, calls=None):
+        """
+        Record the calls of the method of the model dispatcher, the method keeps working.
+        The method is restored after the test.
+        :param record: function(*args, **kwargs) - gives the recorded value of a call (the arguments by default)
+        :param calls: list - to record the calls to (the new one by default)
+        :return: list - the recorded values
+        """
+        dispatcher = model.get_dispatcher()
+        method = getattr(dispatcher, method_name)
+        calls = [] if calls is None else calls
+
+        async def wrapper(*args, **kwargs):
+            calls.append(record(*args, **kwargs) if record else (args, kwargs))
+            return await method(*args, **kwargs)
+
+        setattr(dispatcher, method_name, wrapper)
+        self.addCleanup(delattr, dispatcher, method_name)
+
+        return calls
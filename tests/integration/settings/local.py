@@ -12,14 +12,29 @@ DATABASES = {
             'tests.integration.test_queryset_fields_defer_only': ['User'],
             'tests.integration.test_queryset_exclude': ['Profile'],
             'tests.integration.test_several_relations': ['User', 'Post', 'Comment', 'PostData'],
-            'tests.integration.test_abstract': ['User']
+            'tests.integration.test_abstract': ['User'],
+            'tests.integration.test_select_related': ['Profile', 'Author', 'Post'],
+            'tests.integration.test_prefetch_related': ['User', 'UserData', 'Post', 'Comment'],
+            'tests.integration.test_relation_loader': ['Author', 'Post'],
+            'tests.integration.test_model_update': ['Group', 'Member'],
+            'tests.integration.test_relation_checker': ['Author', 'Post'],
+            'tests.integration.test_bulk_create': ['Item'],
+            'tests.integration.test_bulk_update': ['Task'],
+            'tests.integration.test_queryset_update': ['Article'],
+            'tests.integration.test_tracked_values': ['Feed'],
+            'tests.integration.test_session': ['Author', 'Post'],
+            'tests.integration.test_identity_map': ['Author', 'Post'],
+            'tests.integration.test_cache': ['Product'],
+            'tests.integration.test_coalesce': ['Listing'],
+            'tests.integration.test_connection': ['Lazy', 'Duplicate'],
         },
     },
     'test_odm': {
         'host': 'localhost',
         'port': 27017,
         'models': {
-            'tests.models': ['Author']
+            'tests.models': ['Author'],
+            'tests.integration.test_identity_map': ['ArchivedAuthor'],
         },
     }
 }
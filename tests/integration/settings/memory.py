@@ -0,0 +1,14 @@
+"""
+The settings of the test suite with the in-memory backend (no MongoDB server is needed):
+
+    ODM_SETTINGS_MODULE=tests.integration.settings.memory python -m pytest tests
+
+The unique fields are enforced by the unique indexes of the server (the ODM does not create them),
+so test_fields_attrs.py::test_unique and test_one_to_one.py::test_save_one_to_one fail with this backend.
+"""
+from .local import DATABASES as LOCAL_DATABASES
+
+DATABASES = {
+    db_name: dict(db_settings, backend='memory')
+    for db_name, db_settings in LOCAL_DATABASES.items()
+}
@@ -0,0 +1,75 @@
+from pymongo.errors import BulkWriteError
+
+from core.base import MongoModel
+from core.fields import StringField, IntegerField
+from tests.base import BaseAsyncTestCase
+
+
+class Item(MongoModel):
+    class Meta:
+        collection_name = 'bulk_item'
+
+    name = StringField()
+    index = IntegerField()
+
+
+async def generate_items(count):
+    for index in range(count):
+        yield Item(name='Item', index=index)
+
+
+class BulkCreateTests(BaseAsyncTestCase):
+    async def setUp(self):
+        self.batches = self.spy(Item, 'bulk_create', record=lambda documents, **kwargs: len(documents))
+
+    async def tearDown(self):
+        await Item.objects.delete()
+
+    async def test_bulk_create_args(self):
+        items = [Item(name='Item', index=index) for index in range(3)]
+        inserted = await Item.objects.bulk_create(*items)
+
+        self.assertEqual(inserted, 3)
+        self.assertTrue(all(item.id for item in items))
+
+        item = await Item.objects.get(index=1)
+        self.assertEqual(item.id, items[1].id)
+
+    async def test_bulk_create_iterable(self):
+        items = [Item(name='Item', index=index) for index in range(10)]
+        inserted = await Item.objects.bulk_create(iter(items), batch_size=4, concurrency=2)
+
+        self.assertEqual(inserted, 10)
+        self.assertEqual(sorted(self.batches), [2, 4, 4])
+        self.assertEqual(await Item.objects.count(), 10)
+
+    async def test_bulk_create_async_iterable(self):
+        inserted = await Item.objects.bulk_create(generate_items(25), batch_size=10)
+
+        self.assertEqual(inserted, 25)
+        self.assertEqual(len(self.batches), 3)
+        self.assertEqual(await Item.objects.count(), 25)
+
+    async def test_bulk_create_failed_documents(self):
+        existing = await Item.objects.create(name='Existing', index=0)
+        duplicate = Item(_id=existing.id, name='Duplicate', index=1)
+        items = [Item(name='Item', index=index) for index in range(2, 5)]
+
+        with self.assertRaises(BulkWriteError):
+            await Item.objects.bulk_create(items[0], duplicate, *items[1:])
+
+        # Unordered writes continue after the failed document
+        self.assertTrue(all(item.id for item in items))
+        self.assertEqual(await Item.objects.count(), 4)
+
+    async def test_bulk_create_ordered(self):
+        existing = await Item.objects.create(name='Existing', index=0)
+        duplicate = Item(_id=existing.id, name='Duplicate', index=1)
+        items = [Item(name='Item', index=index) for index in range(2, 5)]
+
+        with self.assertRaises(BulkWriteError):
+            await Item.objects.bulk_create(items[0], duplicate, *items[1:], ordered=True)
+
+        self.assertTrue(items[0].id)
+        self.assertFalse(any(item.id for item in items[1:]))
+        self.assertEqual(await Item.objects.count(), 2)
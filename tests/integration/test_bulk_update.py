@@ -0,0 +1,62 @@
+from core.base import MongoModel
+from core.fields import StringField, IntegerField
+from tests.base import BaseAsyncTestCase
+
+
+class Task(MongoModel):
+    class Meta:
+        collection_name = 'bulk_update_task'
+
+    title = StringField()
+    priority = IntegerField()
+
+
+class BulkUpdateTests(BaseAsyncTestCase):
+    async def setUp(self):
+        await Task.objects.bulk_create(Task(title='Task {}'.format(index), priority=index) for index in range(10))
+
+        self.batches = self.spy(Task, 'bulk_write', record=lambda requests, **kwargs: len(requests))
+
+    async def tearDown(self):
+        await Task.objects.delete()
+
+    async def test_bulk_update(self):
+        tasks = await Task.objects.sort('priority')
+
+        for task in tasks[:5]:
+            task.priority += 10
+
+        result = await Task.objects.bulk_update(tasks, batch_size=2)
+
+        self.assertEqual(result.matched_count, 5)
+        self.assertEqual(result.modified_count, 5)
+        self.assertEqual(self.batches, [2, 2, 1])
+        self.assertEqual(await Task.objects.filter(priority__gte=10).count(), 5)
+
+        # The written values are not modified anymore
+        result = await Task.objects.bulk_update(tasks)
+        self.assertEqual(result.matched_count, 0)
+
+    async def test_bulk_update_fields(self):
+        task = await Task.objects.get(priority=0)
+        task.title = 'Updated'
+        task.priority = 100
+
+        await Task.objects.bulk_update([task], fields=['priority'])
+
+        task = await Task.objects.get(_id=task.id)
+        self.assertEqual(task.title, 'Task 0')
+        self.assertEqual(task.priority, 100)
+
+    async def test_bulk_update_unset(self):
+        task = await Task.objects.get(priority=0)
+        del task.title
+
+        await Task.objects.bulk_update([task])
+
+        document, = await Task.objects.filter(priority=0).values()
+        self.assertNotIn('title', document)
+
+    async def test_bulk_update_unsaved(self):
+        with self.assertRaises(ValueError):
+            await Task.objects.bulk_update([Task(title='Task')])
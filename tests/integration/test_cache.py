@@ -0,0 +1,105 @@
+from core.base import MongoModel
+from core.exceptions import DoesNotExist
+from core.fields import StringField, IntegerField
+from tests.base import BaseAsyncTestCase
+
+
+class Product(MongoModel):
+    class Meta:
+        collection_name = 'cache_product'
+        cache = {'max_size': 10, 'ttl': 60}
+
+    name = StringField()
+    price = IntegerField()
+
+
+class QueryCacheTests(BaseAsyncTestCase):
+    async def setUp(self):
+        self.product = await Product.objects.create(name='Tea', price=10)
+        await Product.objects.create(name='Coffee', price=20)
+
+        Product.get_dispatcher().cache.clear()
+
+        self.queries = self.spy(Product, '_get_documents')
+        self.spy(Product, 'find', calls=self.queries)
+
+    async def tearDown(self):
+        await Product.objects.delete()
+
+    async def test_get(self):
+        product_1 = await Product.objects.get(name='Tea')
+        product_2 = await Product.objects.get(name='Tea')
+
+        self.assertEqual(len(self.queries), 1)
+        self.assertEqual(product_2.id, product_1.id)
+        self.assertIsNot(product_2, product_1)
+
+        cache_info = Product.get_cache().info()
+        self.assertEqual((cache_info.hits, cache_info.misses), (1, 1))
+
+    async def test_filter(self):
+        products_1 = await Product.objects.filter(price__gte=10, name__in=['Tea', 'Coffee']).sort('name')
+        products_2 = await Product.objects.filter(name__in=['Tea', 'Coffee'], price__gte=10).sort('name')
+
+        self.assertEqual(len(self.queries), 1)
+        self.assertEqual([p.name for p in products_2], ['Coffee', 'Tea'])
+
+        await Product.objects.filter(price__gte=10).sort('-name')
+        self.assertEqual(len(self.queries), 2)
+
+    async def test_filter_bool_and_int(self):
+        await Product.objects.create(name='Gum', price=1)
+
+        products_1 = await Product.objects.filter(price=1)
+        products_2 = await Product.objects.filter(price=True)
+
+        # True and 1 are the different queries for MongoDB
+        self.assertEqual(len(self.queries), 2)
+        self.assertEqual([p.name for p in products_1], ['Gum'])
+        self.assertEqual(products_2, [])
+
+    async def test_cached_documents_are_copies(self):
+        product = await Product.objects.get(name='Tea')
+        product.price = 15
+
+        product = await Product.objects.get(name='Tea')
+        self.assertEqual(product.price, 10)
+
+    async def test_invalidated_by_save(self):
+        await Product.objects.get(name='Tea')
+
+        self.product.price = 12
+        await self.product.save()
+
+        product = await Product.objects.get(name='Tea')
+        self.assertEqual(product.price, 12)
+        self.assertEqual(len(self.queries), 2)
+
+    async def test_invalidated_by_update(self):
+        await Product.objects.filter(name='Tea')
+        await Product.objects.filter(name='Tea').update(price__inc=1)
+
+        product, = await Product.objects.filter(name='Tea')
+        self.assertEqual(product.price, 11)
+        self.assertEqual(len(self.queries), 2)
+
+    async def test_invalidated_by_bulk_create(self):
+        self.assertEqual(len(await Product.objects.filter(price=30)), 0)
+
+        await Product.objects.bulk_create(Product(name='Milk', price=30))
+
+        self.assertEqual(len(await Product.objects.filter(price=30)), 1)
+        self.assertEqual(len(self.queries), 2)
+
+    async def test_invalidated_by_delete(self):
+        await Product.objects.get(name='Tea')
+        await self.product.delete()
+
+        with self.assertRaises(DoesNotExist):
+            await Product.objects.get(name='Tea')
+
+    async def test_max_size(self):
+        for price in range(15):
+            await Product.objects.filter(price=price)
+
+        self.assertEqual(Product.get_cache().info().size, 10)
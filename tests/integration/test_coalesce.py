@@ -0,0 +1,83 @@
+import asyncio
+
+from core.base import MongoModel
+from core.fields import StringField, IntegerField, ListField, DictField
+from tests.base import BaseAsyncTestCase
+
+
+class Listing(MongoModel):
+    class Meta:
+        collection_name = 'coalesce_listing'
+        coalesce = True
+
+    title = StringField()
+    views = IntegerField()
+    tags = ListField(StringField())
+    data = DictField()
+
+
+class CoalesceTests(BaseAsyncTestCase):
+    async def setUp(self):
+        for index in range(3):
+            await Listing.objects.create(
+                title='Listing {}'.format(index), views=index, tags=['home'], data={'rank': {'value': index}}
+            )
+
+        self.find_calls = self.spy(Listing, 'find')
+
+    async def tearDown(self):
+        await Listing.objects.delete()
+
+    async def test_concurrent_queries(self):
+        results = await asyncio.gather(*[
+            Listing.objects.filter(tags='home').sort('title')
+            for _ in range(20)
+        ])
+
+        self.assertEqual(len(self.find_calls), 1)
+
+        for listings in results:
+            self.assertEqual([listing.title for listing in listings], ['Listing 0', 'Listing 1', 'Listing 2'])
+
+    async def test_results_are_copies(self):
+        listings_1, listings_2 = await asyncio.gather(
+            Listing.objects.filter(views__gte=0).sort('title'),
+            Listing.objects.filter(views__gte=0).sort('title'),
+        )
+        self.assertEqual(len(self.find_calls), 1)
+
+        listings_1[0].tags.append('top')
+        self.assertIsNot(listings_1[0], listings_2[0])
+        self.assertEqual(listings_2[0].tags, ['home'])
+
+    async def test_first_result_is_copy(self):
+        async def change():
+            listings = await Listing.objects.filter(views__gte=0).sort('title')
+            listings[0].data['rank']['value'] = 99
+            return listings
+
+        # The first caller changes its result before the others are resumed
+        listings_1, listings_2 = await asyncio.gather(
+            change(),
+            Listing.objects.filter(views__gte=0).sort('title'),
+        )
+        self.assertEqual(len(self.find_calls), 1)
+        self.assertEqual(listings_2[0].data, {'rank': {'value': 0}})
+
+    async def test_different_queries(self):
+        await asyncio.gather(
+            Listing.objects.filter(views=1),
+            Listing.objects.filter(views=2),
+        )
+        self.assertEqual(len(self.find_calls), 2)
+
+    async def test_count(self):
+        counts = await asyncio.gather(*[Listing.objects.filter(tags='home').count() for _ in range(5)])
+        self.assertEqual(counts, [3] * 5)
+
+    async def test_sequential_queries(self):
+        await Listing.objects.filter(tags='home')
+        await Listing.objects.create(title='Listing 3', views=3, tags=['home'])
+
+        self.assertEqual(len(await Listing.objects.filter(tags='home')), 4)
+        self.assertEqual(len(self.find_calls), 2)
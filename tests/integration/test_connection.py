@@ -0,0 +1,65 @@
+from unittest import skipIf
+
+from core.base import MongoModel
+from core.connection import DatabaseManager, SettingsRegistry, connect
+from core.constants import MEMORY
+from core.fields import StringField
+from tests.base import BaseAsyncTestCase
+from tests.integration.models import Profile
+from tests.models import Post, Author
+
+MEMORY_BACKEND = all(
+    db_settings.get('backend') == MEMORY
+    for db_settings in SettingsRegistry().get_databases().values()
+)
+
+
+class ConnectionTests(BaseAsyncTestCase):
+    @skipIf(MEMORY_BACKEND, 'The clients are not used by the memory backend')
+    async def test_shared_client(self):
+        profiles = await Profile.get_dispatcher().get_collection()
+        posts = await Post.get_dispatcher().get_collection()
+        authors = await Author.get_dispatcher().get_collection()
+
+        # One database per name, one client per cluster
+        self.assertIs(profiles.database, posts.database)
+        self.assertIsNot(authors.database, posts.database)
+        self.assertIs(authors.database.client, posts.database.client)
+
+    async def test_cached_collection(self):
+        collection = await Profile.get_dispatcher().get_collection()
+        self.assertIs(await Profile.get_dispatcher().get_collection(), collection)
+
+    async def test_client_options(self):
+        client = DatabaseManager().get_client('localhost', 27017, {'maxPoolSize': 10})
+
+        self.assertIs(DatabaseManager().get_client('localhost', 27017, {'maxPoolSize': 10}), client)
+        self.assertIsNot(DatabaseManager().get_client('localhost', 27017), client)
+
+    @skipIf(MEMORY_BACKEND, 'The clients are not used by the memory backend')
+    async def test_connect(self):
+        clients = await connect(warmup=2)
+
+        # Both databases of the settings are on the same cluster
+        self.assertEqual(len(clients), 1)
+        self.assertIs(clients[0], (await Profile.get_connection().get_database()).client)
+
+    async def test_lazy_dispatcher(self):
+        class Lazy(MongoModel):
+            name = StringField()
+
+        self.assertIsNone(Lazy._management.dispatcher)
+        self.assertEqual(Lazy.get_collection_name(), 'lazy')
+
+        dispatcher = Lazy.get_dispatcher()
+        self.assertEqual(dispatcher.collection_name, 'lazy')
+        self.assertEqual(Lazy.get_connection().database, 'async_odm')
+        self.assertIs(Lazy.get_dispatcher(), dispatcher)
+
+    async def test_collection_name_conflict(self):
+        with self.assertRaises(ValueError):
+            class Duplicate(MongoModel):
+                class Meta:
+                    collection_name = 'profile'
+
+                name = StringField()
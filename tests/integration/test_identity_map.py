@@ -0,0 +1,89 @@
+from core.base import MongoModel
+from core.identity import identity_map
+from core.fields import StringField, ForeignKey
+from tests.base import BaseAsyncTestCase
+
+
+class Author(MongoModel):
+    class Meta:
+        collection_name = 'identity_author'
+
+    username = StringField()
+
+
+# The same collection in the other database
+class ArchivedAuthor(MongoModel):
+    class Meta:
+        collection_name = 'identity_author'
+
+    username = StringField()
+
+
+class Post(MongoModel):
+    class Meta:
+        collection_name = 'identity_post'
+
+    title = StringField()
+    author = ForeignKey(Author, related_name='posts')
+
+
+class IdentityMapTests(BaseAsyncTestCase):
+    async def setUp(self):
+        self.author = await Author.objects.create(username='Ivan')
+
+        for index in range(3):
+            await Post.objects.create(title='Post {}'.format(index), author=self.author)
+
+        self.get_calls = self.spy(Author, 'get')
+
+    async def tearDown(self):
+        await Post.objects.delete()
+        await Author.objects.delete()
+        await ArchivedAuthor.objects.delete()
+
+    async def test_relation_instances(self):
+        async with identity_map():
+            posts = await Post.objects.sort('title')
+            authors = [await post.author for post in posts]
+
+        self.assertEqual(len(self.get_calls), 1)
+        self.assertTrue(authors[0] is authors[1] is authors[2])
+
+    async def test_get_by_id(self):
+        with identity_map():
+            author = await Author.objects.get(username='Ivan')
+            self.assertIs(await Author.objects.get(_id=author.id), author)
+            self.assertIs((await Author.objects.filter(username='Ivan'))[0], author)
+
+        self.assertEqual(len(self.get_calls), 1)
+
+    async def test_created_instance(self):
+        with identity_map():
+            author = await Author.objects.create(username='Peter')
+            self.assertIs(await Author.objects.get(_id=author.id), author)
+
+        self.assertEqual(len(self.get_calls), 0)
+
+    async def test_projection(self):
+        with identity_map():
+            author = await Author.objects.get(username='Ivan')
+            partial, = await Author.objects.filter(username='Ivan').only('username')
+
+        self.assertIsNot(partial, author)
+
+    async def test_databases(self):
+        await ArchivedAuthor.objects.bulk_create(ArchivedAuthor(_id=self.author.id, username='Archived'))
+
+        with identity_map():
+            author = await Author.objects.get(_id=self.author.id)
+            archived_author = await ArchivedAuthor.objects.get(_id=self.author.id)
+
+        self.assertIsNot(archived_author, author)
+        self.assertEqual(archived_author.username, 'Archived')
+
+    async def test_without_identity_map(self):
+        author_1 = await Author.objects.get(_id=self.author.id)
+        author_2 = await Author.objects.get(_id=self.author.id)
+
+        self.assertIsNot(author_1, author_2)
+        self.assertEqual(len(self.get_calls), 2)
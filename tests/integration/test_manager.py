@@ -1,4 +1,5 @@
 from core.base import MongoModel
+from core.exceptions import DoesNotExist, MultipleObjectsReturned
 from core.fields import StringField
 from tests.base import BaseAsyncTestCase
 
@@ -90,6 +91,30 @@ class QueryManagerTests(BaseAsyncTestCase):
         await folder_1.delete()
         await folder_2.delete()
 
+    async def test_get_does_not_exist(self):
+        with self.assertRaises(DoesNotExist):
+            await Folder.objects.get(name='missing')
+
+    async def test_get_multiple_objects(self):
+        await Folder.objects.create(name='test')
+        await Folder.objects.create(name='test')
+
+        with self.assertRaises(MultipleObjectsReturned):
+            await Folder.objects.get(name='test')
+
+        await Folder.objects.delete()
+
+    async def test_get_by_id(self):
+        folder = await Folder.objects.create(name='test')
+
+        found = await Folder.objects.get(_id=folder._id)
+        self.assertEqual(found.name, 'test')
+
+        await folder.delete()
+
+        with self.assertRaises(DoesNotExist):
+            await Folder.objects.get(_id=folder._id)
+
     async def test_delete(self):
         folder = Folder(name='test')
         await folder.save()
@@ -0,0 +1,62 @@
+from pymongo.errors import DuplicateKeyError, OperationFailure
+
+from core.memory import MemoryDatabase
+from tests.base import BaseAsyncTestCase
+
+
+class MemoryCollectionTests(BaseAsyncTestCase):
+    async def setUp(self):
+        self.collection = MemoryDatabase('memory_test')['item']
+        await self.collection.insert_many([
+            {'_id': 1, 'name': 'a', 'qty': 5, 'tags': ['x', 'y'], 'size': {'h': 10}},
+            {'_id': 2, 'name': 'b', 'qty': 15, 'tags': ['y'], 'size': {'h': 20}},
+            {'_id': 3, 'name': 'c', 'tags': []},
+        ])
+
+    def find(self, *args, **kwargs):
+        return self.collection.find(*args, **kwargs).to_list(None)
+
+    async def test_query_operators(self):
+        self.assertEqual(len(await self.find({'qty': {'$gte': 5, '$lt': 15}})), 1)
+        self.assertEqual(len(await self.find({'tags': 'y'})), 2)
+        self.assertEqual(len(await self.find({'tags': {'$size': 0}})), 1)
+        self.assertEqual(len(await self.find({'qty': {'$exists': False}})), 1)
+        self.assertEqual(len(await self.find({'size.h': {'$in': [20, 30]}})), 1)
+        self.assertEqual(len(await self.find({'$or': [{'name': 'a'}, {'qty': {'$gt': 10}}]})), 2)
+        self.assertEqual(len(await self.find({'qty': {'$not': {'$gt': 10}}})), 2)
+
+        with self.assertRaises(OperationFailure):
+            await self.find({'qty': {'$unknown': 1}})
+
+    async def test_sort_skip_limit(self):
+        documents = await self.find(sort=[('qty', -1)], skip=1, limit=1)
+        self.assertEqual([document['_id'] for document in documents], [1])
+
+    async def test_projection(self):
+        document = await self.collection.find_one({'_id': 1}, {'name': True, 'tags': {'$slice': 1}})
+        self.assertEqual(document, {'_id': 1, 'name': 'a', 'tags': ['x']})
+
+        document = await self.collection.find_one({'_id': 1}, {'size': False, 'tags': False})
+        self.assertEqual(document, {'_id': 1, 'name': 'a', 'qty': 5})
+
+    async def test_update_operators(self):
+        await self.collection.update_one({'_id': 1}, {
+            '$inc': {'qty': 2},
+            '$push': {'tags': {'$each': ['z']}},
+            '$set': {'size.w': 3},
+            '$unset': {'name': ''},
+        })
+
+        document = await self.collection.find_one({'_id': 1})
+        self.assertEqual(document, {'_id': 1, 'qty': 7, 'tags': ['x', 'y', 'z'], 'size': {'h': 10, 'w': 3}})
+
+    async def test_isolated_documents(self):
+        document = await self.collection.find_one({'_id': 1})
+        document['tags'].append('z')
+
+        document = await self.collection.find_one({'_id': 1})
+        self.assertEqual(document['tags'], ['x', 'y'])
+
+    async def test_duplicate_key(self):
+        with self.assertRaises(DuplicateKeyError):
+            await self.collection.insert_one({'_id': 1})
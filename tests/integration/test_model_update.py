@@ -0,0 +1,103 @@
+from core.base import MongoModel
+from core.fields import StringField, IntegerField, ListField, ForeignKey
+from tests.base import BaseAsyncTestCase
+
+
+class Group(MongoModel):
+    class Meta:
+        collection_name = 'update_group'
+
+    name = StringField()
+
+
+class Member(MongoModel):
+    class Meta:
+        collection_name = 'update_member'
+
+    username = StringField()
+    age = IntegerField()
+    tags = ListField()
+    group = ForeignKey(Group)
+
+
+class ModelUpdateTests(BaseAsyncTestCase):
+    async def setUp(self):
+        self.group_1 = await Group.objects.create(name='Admins')
+        self.group_2 = await Group.objects.create(name='Users')
+        await Member.objects.create(username='Ivan', age=30, tags=['a'], group=self.group_1, nickname='ivan')
+
+        self.updates = self.spy(Member, 'update_one', record=lambda _id, update: update)
+
+    async def tearDown(self):
+        await Member.objects.delete()
+        await Group.objects.delete()
+
+    async def test_update_modified_fields(self):
+        member = await Member.objects.get(username='Ivan')
+        member.age = 31
+        await member.save()
+
+        self.assertEqual(self.updates, [{'$set': {'age': 31}}])
+
+        member = await Member.objects.get(username='Ivan')
+        self.assertEqual(member.age, 31)
+        self.assertEqual(member.tags, ['a'])
+
+    async def test_update_unchanged(self):
+        member = await Member.objects.get(username='Ivan')
+        member.age = 30
+        member.group = self.group_1
+        await member.save()
+
+        self.assertEqual(self.updates, [])
+
+    async def test_update_relation(self):
+        member = await Member.objects.get(username='Ivan')
+        member.group = self.group_2
+        await member.save()
+
+        self.assertEqual(list(self.updates[0]['$set']), ['group'])
+
+        member = await Member.objects.get(username='Ivan')
+        group = await member.group
+        self.assertEqual(group.name, 'Users')
+
+    async def test_update_deleted_fields(self):
+        member = await Member.objects.get(username='Ivan')
+        del member.nickname
+        del member.age
+        await member.save()
+
+        self.assertEqual(self.updates, [{'$unset': {'age': '', 'nickname': ''}}])
+
+        document, = await Member.objects.filter(username='Ivan').values()
+        self.assertNotIn('age', document)
+        self.assertNotIn('nickname', document)
+
+    async def test_update_after_save(self):
+        member = Member(username='Peter', age=20, group=self.group_1)
+        await member.save()
+
+        member.username = 'Petr'
+        await member.save()
+        await member.save()
+
+        self.assertEqual(self.updates, [{'$set': {'username': 'Petr'}}])
+
+    async def test_update_in_place(self):
+        await Member.objects.create(username='Olga', group=self.group_1, links=[{'url': 'a'}])
+
+        member = await Member.objects.get(username='Olga')
+        member.links[0]['url'] = 'b'
+        await member.save()
+
+        self.assertEqual(self.updates, [{'$set': {'links': [{'url': 'b'}]}}])
+
+        # The reassigned copy is compared with the loaded document
+        member = await Member.objects.get(username='Olga')
+        member.links[0]['url'] = 'c'
+        member.links = [dict(link) for link in member.links]
+        await member.save()
+
+        member = await Member.objects.get(username='Olga')
+        self.assertEqual(member.links, [{'url': 'c'}])
@@ -0,0 +1,91 @@
+from core.base import MongoModel
+from core.fields import StringField, ForeignKey, OneToOne
+from tests.base import BaseAsyncTestCase
+
+
+class User(MongoModel):
+    class Meta:
+        collection_name = 'prefetch_user'
+
+    username = StringField()
+
+
+class UserData(MongoModel):
+    class Meta:
+        collection_name = 'prefetch_user_data'
+
+    user = OneToOne(User, related_name='data')
+    bio = StringField()
+
+
+class Post(MongoModel):
+    class Meta:
+        collection_name = 'prefetch_post'
+
+    author = ForeignKey(User, related_name='posts')
+    title = StringField()
+
+
+class Comment(MongoModel):
+    class Meta:
+        collection_name = 'prefetch_comment'
+
+    post = ForeignKey(Post, related_name='comments')
+    content = StringField()
+
+
+class PrefetchRelatedTests(BaseAsyncTestCase):
+    async def setUp(self):
+        self.user_1 = await User.objects.create(username='Ivan')
+        self.user_2 = await User.objects.create(username='Peter')
+        await UserData.objects.create(user=self.user_1, bio='bio')
+
+        post_1 = await Post.objects.create(author=self.user_1, title='News')
+        post_2 = await Post.objects.create(author=self.user_1, title='Weather')
+        await Comment.objects.create(post=post_1, content='first')
+        await Comment.objects.create(post=post_1, content='second')
+        await Comment.objects.create(post=post_2, content='third')
+
+    async def tearDown(self):
+        await Comment.objects.delete()
+        await Post.objects.delete()
+        await UserData.objects.delete()
+        await User.objects.delete()
+
+    async def test_prefetch_backward(self):
+        users = await User.objects.prefetch_related('posts').sort('username')
+
+        self.assertTrue(users[0].posts.is_resolved)
+        self.assertEqual(sorted(post.title for post in await users[0].posts), ['News', 'Weather'])
+        self.assertEqual(await users[1].posts, [])
+
+    async def test_prefetch_nested(self):
+        user = await User.objects.prefetch_related('posts__comments').get(username='Ivan')
+        comments = {}
+
+        for post in await user.posts:
+            self.assertTrue(post.comments.is_resolved)
+            comments[post.title] = sorted(comment.content for comment in await post.comments)
+
+        self.assertEqual(comments, {'News': ['first', 'second'], 'Weather': ['third']})
+
+    async def test_prefetch_one_to_one_backward(self):
+        users = await User.objects.prefetch_related('data').sort('username')
+
+        self.assertEqual((await users[0].data).bio, 'bio')
+        self.assertFalse(users[1].data.is_resolved)
+
+    async def test_prefetch_forward(self):
+        posts = await Post.objects.prefetch_related('author')
+
+        for post in posts:
+            self.assertTrue(post.author.is_resolved)
+            self.assertEqual((await post.author).username, 'Ivan')
+
+    async def test_prefetch_iterator(self):
+        async for user in User.objects.prefetch_related('posts').iterator(batch_size=1):
+            self.assertTrue(user.posts.is_resolved)
+
+    async def test_prefetch_wrong_field(self):
+        with self.assertRaises(ValueError):
+            User.objects.prefetch_related('username')
@@ -0,0 +1,47 @@
+from core.node import Param, QueryPlan
+from tests.base import BaseAsyncTestCase
+from tests.integration.models import Profile
+
+
+class PreparedQueryTests(BaseAsyncTestCase):
+    async def setUp(self):
+        await Profile(username='Ivan', age=30, docs=[1, 2]).save()
+        await Profile(username='Peter', age=20, docs=[1, 2, 3, 4]).save()
+        await Profile(username='Geoff', age=18, docs=[1, 2, 4]).save()
+
+        self.adults = Profile.objects.sort('username').prepare(age__gte=Param('age'), docs__all=[1, 2])
+
+    async def tearDown(self):
+        await Profile.objects.all().delete()
+
+    async def test_bind(self):
+        profiles = await self.adults(age=20)
+        self.assertEqual([profile.username for profile in profiles], ['Ivan', 'Peter'])
+
+        profiles = await self.adults(age=25)
+        self.assertEqual([profile.username for profile in profiles], ['Ivan'])
+
+    async def test_chain(self):
+        count = await self.adults(age=18).filter(docs=4).count()
+        self.assertEqual(count, 2)
+
+        # The template is not changed by the bound querysets
+        self.assertEqual(await self.adults(age=18).count(), 3)
+
+    async def test_params(self):
+        with self.assertRaises(ValueError):
+            self.adults()
+
+        with self.assertRaises(ValueError):
+            self.adults(age=18, username='Ivan')
+
+    async def test_plan_cache(self):
+        self.assertEqual(await Profile.objects.filter(age=30, username='Ivan').count(), 1)
+        plan = QueryPlan.get(Profile, ('age', 'username'))
+
+        self.assertEqual(await Profile.objects.filter(age=20, username='Peter').count(), 1)
+        self.assertIs(QueryPlan.get(Profile, ('age', 'username')), plan)
+
+    async def test_exclude(self):
+        profiles = await Profile.objects.exclude(age__gte=20, age__lte=25)
+        self.assertEqual(sorted(profile.username for profile in profiles), ['Geoff', 'Ivan'])
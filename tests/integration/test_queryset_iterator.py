@@ -0,0 +1,39 @@
+from tests.integration.models import Profile
+from tests.base import BaseAsyncTestCase
+
+
+class QuerysetIteratorTests(BaseAsyncTestCase):
+    async def setUp(self):
+        for age in range(10):
+            await Profile.objects.create(username='user_{}'.format(age), age=age)
+
+    async def tearDown(self):
+        await Profile.objects.all().delete()
+
+    async def test_async_for(self):
+        ages = []
+
+        async for user in Profile.objects.sort('age'):
+            ages.append(user.age)
+
+        self.assertEqual(ages, list(range(10)))
+
+    async def test_iterator_batches(self):
+        for prefetch in (True, False):
+            ages = []
+
+            async for user in Profile.objects.filter(age__gte=2).sort('age').iterator(batch_size=3, prefetch=prefetch):
+                ages.append(user.age)
+
+            self.assertEqual(ages, list(range(2, 10)))
+
+    async def test_iterator_break(self):
+        async for user in Profile.objects.sort('age').iterator(batch_size=2):
+            if user.age == 3:
+                break
+
+        self.assertEqual(user.age, 3)
+
+    async def test_iterator_values_list(self):
+        names = [name async for name in Profile.objects.sort('age').values_list('username', flat=True).iterator()]
+        self.assertEqual(names, ['user_{}'.format(age) for age in range(10)])
@@ -0,0 +1,73 @@
+from core.base import MongoModel
+from core.expressions import F
+from core.fields import StringField, IntegerField, ListField, DictField
+from tests.base import BaseAsyncTestCase
+
+
+class Article(MongoModel):
+    class Meta:
+        collection_name = 'update_article'
+
+    title = StringField()
+    views = IntegerField()
+    likes = IntegerField()
+    dislikes = IntegerField()
+    rating = IntegerField()
+    tags = ListField()
+    data = DictField()
+
+
+class QuerySetUpdateTests(BaseAsyncTestCase):
+    async def setUp(self):
+        await Article.objects.create(title='News', views=10, likes=5, dislikes=2, tags=['a', 'b'], data={'count': 1})
+
+    async def tearDown(self):
+        await Article.objects.delete()
+
+    def get_article(self):
+        return Article.objects.get(title='News')
+
+    async def test_update_set(self):
+        await Article.objects.filter(title='News').update(views=0)
+
+        article = await self.get_article()
+        self.assertEqual(article.views, 0)
+
+    async def test_update_inc(self):
+        await Article.objects.filter(title='News').update(views__inc=3, data__count__inc=1)
+
+        article = await self.get_article()
+        self.assertEqual(article.views, 13)
+        self.assertEqual(article.data, {'count': 2})
+
+    async def test_update_min_max(self):
+        await Article.objects.filter(title='News').update(views__max=5, likes__max=7, dislikes__min=1)
+
+        article = await self.get_article()
+        self.assertEqual((article.views, article.likes, article.dislikes), (10, 7, 1))
+
+    async def test_update_lists(self):
+        await Article.objects.filter(title='News').update(tags__push='c')
+        await Article.objects.filter(title='News').update(tags__push_all=['d', 'e'])
+        await Article.objects.filter(title='News').update(tags__pull='a')
+        await Article.objects.filter(title='News').update(tags__add_to_set='b')
+
+        article = await self.get_article()
+        self.assertEqual(article.tags, ['b', 'c', 'd', 'e'])
+
+    async def test_update_unset(self):
+        await Article.objects.filter(title='News').update(data__unset=True)
+
+        document, = await Article.objects.filter(title='News').values()
+        self.assertNotIn('data', document)
+
+    async def test_update_f_expression(self):
+        await Article.objects.filter(title='News').update(rating=F('likes') - F('dislikes'), views__inc=F('likes'))
+
+        article = await self.get_article()
+        self.assertEqual(article.rating, 3)
+        self.assertEqual(article.views, 15)
+
+    async def test_update_f_expression_unsupported_operator(self):
+        with self.assertRaises(ValueError):
+            await Article.objects.update(tags__push='c', rating=F('likes'))
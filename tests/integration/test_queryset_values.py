@@ -0,0 +1,46 @@
+from tests.integration.models import Profile
+from tests.base import BaseAsyncTestCase
+
+
+class QuerysetValuesTests(BaseAsyncTestCase):
+    async def setUp(self):
+        self.user_1 = Profile(username='Ivan', age=30, docs=[1, 2], data={'city': 'Moscow'})
+        self.user_2 = Profile(username='Peter', age=20, docs=[1, 2, 3, 4], data={'city': 'Omsk'})
+
+        await self.user_1.save()
+        await self.user_2.save()
+
+    async def tearDown(self):
+        await Profile.objects.all().delete()
+
+    async def test_values(self):
+        users = await Profile.objects.filter(username='Ivan').values('username', 'age')
+        self.assertEqual(users, [{'username': 'Ivan', 'age': 30}])
+
+    async def test_values_all_fields(self):
+        users = await Profile.objects.filter(username='Ivan').values()
+
+        self.assertEqual(len(users), 1)
+        self.assertTrue(isinstance(users[0], dict))
+        self.assertEqual(users[0]['_id'], self.user_1._id)
+        self.assertEqual(users[0]['docs'], [1, 2])
+
+    async def test_values_nested_field(self):
+        users = await Profile.objects.sort('age').values('data__city')
+        self.assertEqual(users, [{'data__city': 'Omsk'}, {'data__city': 'Moscow'}])
+
+    async def test_values_list(self):
+        users = await Profile.objects.sort('age').values_list('username', 'age')
+        self.assertEqual(users, [('Peter', 20), ('Ivan', 30)])
+
+    async def test_values_list_flat(self):
+        ids = await Profile.objects.sort('age').values_list('_id', flat=True)
+        self.assertEqual(ids, [self.user_2._id, self.user_1._id])
+
+    async def test_values_list_flat_several_fields(self):
+        with self.assertRaises(TypeError):
+            Profile.objects.values_list('username', 'age', flat=True)
+
+    async def test_values_get(self):
+        user = await Profile.objects.values('username').get(age=20)
+        self.assertEqual(user, {'username': 'Peter'})
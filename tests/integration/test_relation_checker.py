@@ -0,0 +1,102 @@
+from bson import ObjectId
+
+from core.base import MongoModel
+from core.managers import RelationChecker
+from core.fields import StringField, ForeignKey
+from tests.base import BaseAsyncTestCase
+
+
+class Author(MongoModel):
+    class Meta:
+        collection_name = 'checker_author'
+
+    username = StringField()
+
+
+class Post(MongoModel):
+    class Meta:
+        collection_name = 'checker_post'
+
+    title = StringField()
+    author = ForeignKey(Author)
+    editor = ForeignKey(Author)
+
+
+class RelationCheckerTests(BaseAsyncTestCase):
+    async def setUp(self):
+        self.author_1 = await Author.objects.create(username='Ivan')
+        self.author_2 = await Author.objects.create(username='Peter')
+
+        self.find_calls = self.spy(Author, 'find')
+
+    async def tearDown(self):
+        RelationChecker.disable_cache()
+
+        await Post.objects.delete()
+        await Author.objects.delete()
+
+    def get_posts(self, count, author=None):
+        return [
+            Post(title='Post {}'.format(index), author=author or self.author_1, editor=self.author_2)
+            for index in range(count)
+        ]
+
+    async def test_bulk_create_single_query(self):
+        await Post.objects.bulk_create(*self.get_posts(10))
+
+        self.assertEqual(len(self.find_calls), 1)
+        self.assertEqual(await Post.objects.count(), 10)
+
+    async def test_bulk_create_missing_relation(self):
+        posts = self.get_posts(3) + self.get_posts(1, author=ObjectId())
+
+        with self.assertRaises(ValueError):
+            await Post.objects.bulk_create(*posts)
+
+        self.assertEqual(await Post.objects.count(), 0)
+
+    async def test_bulk_create_without_check(self):
+        await Post.objects.bulk_create(*self.get_posts(3, author=ObjectId()), check_relations=False)
+
+        self.assertEqual(len(self.find_calls), 0)
+        self.assertEqual(await Post.objects.count(), 3)
+
+    async def test_save_missing_relation(self):
+        post = Post(title='Post', author=ObjectId(), editor=self.author_2)
+
+        with self.assertRaises(ValueError):
+            await post.save()
+
+        await post.save(check_relations=False)
+        self.assertTrue(post.id)
+
+    async def test_save_unset_relation(self):
+        with self.assertRaises(ValueError):
+            await Post(title='Post', author=self.author_1).save()
+
+        with self.assertRaises(ValueError):
+            await Post(title='Post', author=self.author_1).save(check_relations=False)
+
+        with self.assertRaises(ValueError):
+            await Post.objects.bulk_create(*self.get_posts(3), Post(title='Post', author=self.author_1))
+
+        self.assertEqual(await Post.objects.count(), 0)
+
+    async def test_cache(self):
+        RelationChecker.enable_cache(ttl=60)
+
+        await Post.objects.bulk_create(*self.get_posts(3))
+        await Post(title='Post', author=self.author_1, editor=self.author_2).save()
+        self.assertEqual(len(self.find_calls), 1)
+
+        # The created documents are known to exist
+        author = await Author.objects.create(username='Alex')
+        await Post(title='Post', author=author, editor=self.author_2).save()
+        self.assertEqual(len(self.find_calls), 1)
+
+        # The deleted documents are forgotten
+        author_id = author.id
+        await author.delete()
+
+        with self.assertRaises(ValueError):
+            await Post(title='Post', author=author_id, editor=self.author_2).save()
@@ -0,0 +1,63 @@
+import asyncio
+
+from core.base import MongoModel
+from core.exceptions import DoesNotExist
+from core.fields import StringField, ForeignKey, RelationLoader
+from tests.base import BaseAsyncTestCase
+
+
+class Author(MongoModel):
+    class Meta:
+        collection_name = 'loader_author'
+
+    username = StringField()
+
+
+class Post(MongoModel):
+    class Meta:
+        collection_name = 'loader_post'
+
+    title = StringField()
+    author = ForeignKey(Author, related_name='posts')
+
+
+class RelationLoaderTests(BaseAsyncTestCase):
+    async def setUp(self):
+        self.author_1 = await Author.objects.create(username='Ivan')
+        self.author_2 = await Author.objects.create(username='Peter')
+
+        for index in range(6):
+            author = self.author_1 if index % 2 else self.author_2
+            await Post.objects.create(title='Post {}'.format(index), author=author)
+
+        self.find_calls = self.spy(Author, 'find')
+        RelationLoader.enable()
+
+    async def tearDown(self):
+        RelationLoader.disable()
+
+        await Post.objects.delete()
+        await Author.objects.delete()
+
+    async def test_batch_loading(self):
+        posts = await Post.objects.sort('title')
+        authors = await asyncio.gather(*[post.author for post in posts])
+
+        self.assertEqual(len(self.find_calls), 1)
+        self.assertEqual([author.username for author in authors], ['Peter', 'Ivan'] * 3)
+
+    async def test_batch_loading_missing_document(self):
+        post = await Post.objects.get(title='Post 0')
+        await self.author_2.delete()
+
+        with self.assertRaises(DoesNotExist):
+            await post.author
+
+    async def test_batch_loading_disabled(self):
+        RelationLoader.disable()
+        self.assertFalse(RelationLoader.is_enabled())
+
+        posts = await Post.objects.sort('title')
+        await asyncio.gather(*[post.author for post in posts])
+
+        self.assertEqual(len(self.find_calls), 0)
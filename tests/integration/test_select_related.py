@@ -0,0 +1,97 @@
+from core.base import MongoModel
+from core.fields import StringField, ForeignKey, OneToOne
+from tests.base import BaseAsyncTestCase
+
+
+class Profile(MongoModel):
+    class Meta:
+        collection_name = 'select_related_profile'
+
+    position = StringField()
+
+
+class Author(MongoModel):
+    class Meta:
+        collection_name = 'select_related_author'
+
+    username = StringField()
+    profile = OneToOne(Profile, related_name='author', null=True)
+
+
+class Post(MongoModel):
+    class Meta:
+        collection_name = 'select_related_post'
+
+    title = StringField()
+    author = ForeignKey(Author, related_name='posts', null=True)
+
+
+class SelectRelatedTests(BaseAsyncTestCase):
+    async def setUp(self):
+        self.profile = await Profile.objects.create(position='editor')
+        self.author = await Author.objects.create(username='Frank', profile=self.profile)
+        self.post_1 = await Post.objects.create(title='News', author=self.author)
+        self.post_2 = await Post.objects.create(title='Weather', author=self.author)
+
+    async def tearDown(self):
+        await Post.objects.delete()
+        await Author.objects.delete()
+        await Profile.objects.delete()
+
+    async def test_select_related(self):
+        posts = await Post.objects.select_related('author').sort('title')
+
+        self.assertEqual(len(posts), 2)
+
+        for post in posts:
+            self.assertTrue(post.author.is_resolved)
+
+            author = await post.author
+            self.assertEqual(author._id, self.author._id)
+            self.assertEqual(author.username, 'Frank')
+
+    async def test_select_related_nested(self):
+        posts = await Post.objects.select_related('author__profile').filter(title='News')
+        author = await posts[0].author
+
+        self.assertTrue(author.profile.is_resolved)
+
+        profile = await author.profile
+        self.assertEqual(profile.position, 'editor')
+
+    async def test_select_related_get(self):
+        post = await Post.objects.select_related('author').get(title='Weather')
+
+        self.assertTrue(post.author.is_resolved)
+        self.assertEqual((await post.author).username, 'Frank')
+
+    async def test_select_related_get_conditions(self):
+        queryset = Post.objects.select_related('author').filter(title='News')
+        post = await queryset.get(_id=self.post_2.id)
+
+        # The same as without select_related: only the conditions of get() are applied
+        self.assertEqual(post.title, 'Weather')
+        self.assertEqual((await Post.objects.filter(title='News').get(_id=self.post_2.id)).title, 'Weather')
+
+        # The queryset is not changed
+        posts = await queryset
+        self.assertEqual([post.title for post in posts], ['News'])
+
+    async def test_select_related_only(self):
+        post = await Post.objects.select_related('author').only('title').get(title='News')
+
+        self.assertEqual(post.title, 'News')
+        self.assertEqual((await post.author).username, 'Frank')
+
+    async def test_select_related_iterator(self):
+        titles = []
+
+        async for post in Post.objects.select_related('author').sort('title').iterator(batch_size=1):
+            self.assertTrue(post.author.is_resolved)
+            titles.append(post.title)
+
+        self.assertEqual(titles, ['News', 'Weather'])
+
+    async def test_select_related_wrong_field(self):
+        with self.assertRaises(ValueError):
+            Post.objects.select_related('title')
@@ -0,0 +1,108 @@
+from unittest.mock import patch
+
+from bson import ObjectId
+
+from core.base import MongoModel
+from core.managers import OnDeleteManager
+from core.session import session
+from core.fields import StringField, IntegerField, ForeignKey
+from tests.base import BaseAsyncTestCase
+
+
+class Author(MongoModel):
+    class Meta:
+        collection_name = 'session_author'
+
+    username = StringField()
+    age = IntegerField()
+
+
+class Post(MongoModel):
+    class Meta:
+        collection_name = 'session_post'
+
+    title = StringField()
+    author = ForeignKey(Author)
+
+
+class SessionTests(BaseAsyncTestCase):
+    async def setUp(self):
+        self.author = await Author.objects.create(username='Ivan', age=30)
+        self.writes = []
+        self.spy(Author, 'bulk_write', record=lambda requests, **kwargs: ('Author', len(requests)), calls=self.writes)
+        self.spy(Post, 'bulk_write', record=lambda requests, **kwargs: ('Post', len(requests)), calls=self.writes)
+
+    async def tearDown(self):
+        await Post.objects.delete()
+        await Author.objects.delete()
+
+    async def test_session_flush(self):
+        async with session():
+            author = Author(username='Peter')
+            await author.save()
+
+            for index in range(3):
+                await Post(title='Post {}'.format(index), author=author).save()
+
+            self.author.age = 31
+            await self.author.save()
+
+            # Nothing is written until the exit
+            self.assertEqual(self.writes, [])
+            self.assertIsNone(author.id)
+
+        self.assertEqual(self.writes, [('Author', 2), ('Post', 3)])
+        self.assertTrue(author.id)
+        self.assertEqual(await Post.objects.filter(author=author).count(), 3)
+
+        author = await Author.objects.get(username='Ivan')
+        self.assertEqual(author.age, 31)
+
+    async def test_session_delete(self):
+        post = await Post.objects.create(title='News', author=self.author)
+
+        async with session():
+            post.title = 'Updated'
+            await post.save()
+            await post.delete()
+
+        self.assertEqual(self.writes, [('Post', 2)])
+        self.assertIsNone(post.id)
+        self.assertEqual(await Post.objects.count(), 0)
+
+    async def test_session_delete_backwards(self):
+        author = await Author.objects.create(username='Peter')
+        author_id = author.id
+        cascades = []
+
+        async def handle_backwards(manager, objects):
+            cascades.append(([obj.id for obj in objects], list(self.writes)))
+
+        with patch.object(Author, 'has_backwards', True), \
+                patch.object(OnDeleteManager, 'handle_backwards', handle_backwards):
+            # Nothing is handled, if the flush fails
+            with self.assertRaises(ValueError):
+                async with session():
+                    await author.delete()
+                    await Post(title='News', author=ObjectId()).save()
+
+            self.assertEqual(cascades, [])
+            self.assertEqual(author.id, author_id)
+
+            async with session():
+                await author.delete()
+
+        # The backward relations are handled after the document is deleted
+        self.assertEqual(cascades, [([author_id], [('Author', 1)])])
+        self.assertIsNone(author.id)
+
+    async def test_session_exception(self):
+        with self.assertRaises(RuntimeError):
+            async with session():
+                author = Author(username='Peter')
+                await author.save()
+                raise RuntimeError
+
+        self.assertEqual(self.writes, [])
+        self.assertIsNone(author.id)
+        self.assertEqual(await Author.objects.count(), 1)
@@ -0,0 +1,122 @@
+from core.base import MongoModel
+from core.fields import StringField, ListField, DictField, TrackedList, TrackedDict
+from tests.base import BaseAsyncTestCase
+
+
+class Feed(MongoModel):
+    class Meta:
+        collection_name = 'tracked_feed'
+
+    name = StringField()
+    events = ListField()
+    counters = DictField()
+
+
+class TrackedValuesTests(BaseAsyncTestCase):
+    async def setUp(self):
+        await Feed.objects.create(name='Feed', events=['a', 'b', 'c'], counters={'a': 1, 'b': 2})
+
+        self.updates = self.spy(Feed, 'update_one', record=lambda _id, update: update)
+
+    async def tearDown(self):
+        await Feed.objects.delete()
+
+    def get_feed(self):
+        return Feed.objects.get(name='Feed')
+
+    async def test_tracked_types(self):
+        feed = await self.get_feed()
+
+        self.assertIsInstance(feed.events, TrackedList)
+        self.assertIsInstance(feed.counters, TrackedDict)
+
+    async def test_list_push(self):
+        feed = await self.get_feed()
+        feed.events.append('d')
+        feed.events.extend(['e', 'f'])
+        await feed.save()
+
+        self.assertEqual(self.updates, [{'$push': {'events': {'$each': ['d', 'e', 'f']}}}])
+
+        feed = await self.get_feed()
+        self.assertEqual(feed.events, ['a', 'b', 'c', 'd', 'e', 'f'])
+
+    async def test_list_pull_and_pop(self):
+        feed = await self.get_feed()
+        feed.events.remove('b')
+        await feed.save()
+
+        feed.events.pop(0)
+        await feed.save()
+
+        self.assertEqual(self.updates, [{'$pullAll': {'events': ['b']}}, {'$pop': {'events': -1}}])
+
+        feed = await self.get_feed()
+        self.assertEqual(feed.events, ['c'])
+
+    async def test_list_set_item(self):
+        feed = await self.get_feed()
+        feed.events[1] = 'B'
+        await feed.save()
+
+        self.assertEqual(self.updates, [{'$set': {'events.1': 'B'}}])
+
+        feed = await self.get_feed()
+        self.assertEqual(feed.events, ['a', 'B', 'c'])
+
+    async def test_list_rewrite(self):
+        feed = await self.get_feed()
+        feed.events.append('d')
+        feed.events.remove('a')
+        await feed.save()
+
+        self.assertEqual(self.updates, [{'$set': {'events': ['b', 'c', 'd']}}])
+
+    async def test_dict_keys(self):
+        feed = await self.get_feed()
+        feed.counters['c'] = 3
+        del feed.counters['a']
+        await feed.save()
+
+        self.assertEqual(self.updates, [{'$set': {'counters.c': 3}, '$unset': {'counters.a': ''}}])
+
+        feed = await self.get_feed()
+        self.assertEqual(feed.counters, {'b': 2, 'c': 3})
+
+    async def test_changes_after_create(self):
+        feed = Feed(name='New', events=[], counters={})
+        await feed.save()
+
+        feed.events.append('a')
+        await feed.save()
+
+        self.assertEqual(self.updates, [{'$push': {'events': {'$each': ['a']}}}])
+
+    async def test_nested_changes(self):
+        await Feed.objects.create(name='Nested', events=[{'n': 1}], counters={'a': {'n': 1}})
+
+        feed = await Feed.objects.get(name='Nested')
+        feed.events[0]['n'] = 2
+        feed.counters['a']['n'] = 2
+        await feed.save()
+
+        # The changes inside of the items are saved with the whole value
+        self.assertEqual(self.updates, [{'$set': {'events': [{'n': 2}], 'counters': {'a': {'n': 2}}}}])
+
+        feed = await Feed.objects.get(name='Nested')
+        self.assertEqual(feed.events, [{'n': 2}])
+        self.assertEqual(feed.counters, {'a': {'n': 2}})
+
+    async def test_nested_changes_with_operators(self):
+        await Feed.objects.create(name='Nested', events=[{'n': 1}], counters={'a': {'n': 1}})
+
+        feed = await Feed.objects.get(name='Nested')
+        feed.events[0]['n'] = 2
+        feed.events.append({'n': 3})
+        feed.counters['a']['n'] = 2
+        feed.counters = feed.counters
+        await feed.save()
+
+        feed = await Feed.objects.get(name='Nested')
+        self.assertEqual(feed.events, [{'n': 2}, {'n': 3}])
+        self.assertEqual(feed.counters, {'a': {'n': 2}})
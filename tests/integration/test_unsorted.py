@@ -1,8 +1,11 @@
+import copy
 from datetime import datetime
 
+from bson import ObjectId
+
 from core.base import OnDeleteManager, MongoModel
 from core.dispatchers import MongoDispatcher
-from core.fields import StringField, ForeignKey
+from core.fields import StringField, ForeignKey, RelationProxy
 from tests.base import BaseAsyncTestCase
 from tests.models import Author, Post, Name
 
@@ -14,13 +17,13 @@ class IntegrationTests(BaseAsyncTestCase):
     async def test_auto_model_name(self):
         user = Author()
 
-        self.assertEqual(user._management.dispatcher.collection_name, 'author')
+        self.assertEqual(user.get_dispatcher().collection_name, 'author')
 
     async def test_model_instance(self):
         name = Name(name='Bob')
 
-        self.assertTrue(isinstance(name._management.dispatcher, MongoDispatcher))
-        self.assertEqual(name._management.dispatcher.collection_name, 'name_collection')
+        self.assertTrue(isinstance(name.get_dispatcher(), MongoDispatcher))
+        self.assertEqual(name.get_dispatcher().collection_name, 'name_collection')
         self.assertEqual(len(name._management.declared_fields), 1)
         self.assertTrue(isinstance(name._management.declared_fields.get('name'), StringField))
 
@@ -28,6 +31,31 @@ class IntegrationTests(BaseAsyncTestCase):
         # TODO Это не критично и переписывается при сохранении, но все-же лучше поправить!
         # self.assertEqual(name._declared_fields.get('name')._value, 'Bob')
 
+    async def test_declared_fields_storage(self):
+        user = Author(username='Frank', nickname='frank')
+
+        self.assertIn('username', Author.__slots__)
+        self.assertEqual(user.username, 'Frank')
+        self.assertFalse(hasattr(user, 'age'))
+        self.assertEqual(user.__dict__, {'nickname': 'frank'})
+
+        user_copy = copy.deepcopy(user)
+        self.assertEqual(user_copy.username, 'Frank')
+        self.assertEqual(user_copy.nickname, 'frank')
+        self.assertEqual(user_copy._get_undeclared_values(), {'nickname': 'frank'})
+
+    async def test_decode_document(self):
+        document = {'_id': ObjectId(), 'username': 'Frank', 'age': 30, 'nickname': 'frank'}
+        user = Author.get_decoder().decode(document)
+
+        self.assertEqual(user._id, document['_id'])
+        self.assertEqual(user.username, 'Frank')
+        self.assertEqual(user.age, 30)
+        self.assertEqual(user.nickname, 'frank')
+        self.assertEqual(user._get_undeclared_values(), {'nickname': 'frank'})
+        self.assertEqual(user._get_changes(), ([], []))
+        self.assertFalse(hasattr(user, 'billing'))
+
     async def test_save(self):
         name = Name(name='test')
         await name.save()
@@ -169,12 +197,29 @@ class IntegrationTests(BaseAsyncTestCase):
 
         author = await post.author
 
-        self.assertTrue(isinstance(post.author, ForeignKey))
+        self.assertTrue(isinstance(post.author, RelationProxy))
         self.assertEqual(author.username, 'Frank')
 
         await post.delete()
         await author.delete()
 
+    async def test_foreignkey_await_twice(self):
+        user = Author(username='Frank')
+        await user.save()
+
+        post = Post(title='News', author=user)
+        await post.save()
+
+        post = await Post.objects.get(title='News')
+        author = await post.author
+
+        self.assertIs(post.author, post.author)
+        self.assertIs(await post.author, author)
+        self.assertEqual(author.username, 'Frank')
+
+        await post.delete()
+        await user.delete()
+
     async def test_foreignkey_null(self):
         post = Post(title='News')
 